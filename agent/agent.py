@@ -2,10 +2,24 @@ from __future__ import annotations
 
 from livekit.agents import JobContext, cli, WorkerOptions
 from .helper.entrypoint_handler import handle_entrypoint
+from .helper.rag_connector import rag_service
+from .helper.logging_config import get_logger
+
+logger = get_logger(__name__)
 
 def prewarm_fnc(proc):
     """Prewarm function for session initialization"""
-    pass
+    # Knowledge base is loaded once per worker process and shared by all its jobs
+    try:
+        proc.userdata["rag_service"] = rag_service.load()
+    except Exception as e:
+        # Lookups will retry the load on first use
+        logger.error(f"❌ RAG index prewarm failed: {e}")
+    # Frequent queries (RAG_WARMUP_QUERIES_PATH) skip the embedding API from the first call
+    try:
+        rag_service.warm_up_embeddings()
+    except Exception as e:
+        logger.error(f"❌ Embedding cache warm-up failed: {e}")
 
 async def entrypoint(ctx: JobContext):
     """Main entrypoint for the agent - delegates to handler"""
@@ -9,12 +9,12 @@ from .ai_models import get_openai_llm, get_tts, get_stt_instance, get_vad_instan
 from .call_handlers import CallState, handle_outbound_sip_call, handle_inbound_call, get_disconnect_reason
 from .database_helpers import insert_call_start_async, insert_call_end_async
 from .session_helpers import (prewarm_session, create_agent_session, setup_background_audio, 
-                             setup_audio_recording, get_room_input_options)
+                             setup_audio_recording, get_room_input_options, setup_interruption_signal)
 from .transcript_manager import transcript_manager
 from .agent_class import EarkartAgent, create_agent
 from .entrypoint_handler import handle_entrypoint
 from .data_entities import UserData
-from .rag_connector import enrich_with_rag
+from .rag_connector import RagService, enrich_with_rag, rag_service
 
 __all__ = [
     # Config management
@@ -34,7 +34,7 @@ __all__ = [
     
     # Session helpers
     'prewarm_session', 'create_agent_session', 'setup_background_audio', 
-    'setup_audio_recording', 'get_room_input_options',
+    'setup_audio_recording', 'get_room_input_options', 'setup_interruption_signal',
     
     # Transcript management
     'transcript_manager',
@@ -49,5 +49,5 @@ __all__ = [
     'UserData',
 
     # RAG connector
-    'enrich_with_rag',
+    'RagService', 'enrich_with_rag', 'rag_service',
 ]
\ No newline at end of file
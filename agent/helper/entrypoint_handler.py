@@ -18,7 +18,7 @@ from .logging_config import setup_logging, get_logger
 from .call_handlers import CallState, handle_outbound_sip_call, handle_inbound_call, get_disconnect_reason
 from .database_helpers import insert_call_end_async
 from .session_helpers import (create_agent_session, setup_background_audio, 
-                             setup_audio_recording, get_room_input_options)
+                             setup_audio_recording, get_room_input_options, setup_interruption_signal)
 from .transcript_manager import transcript_manager
 from .agent_class import create_agent, EarkartAgent
 
@@ -193,6 +193,9 @@ async def handle_entrypoint(ctx: JobContext):
     await setup_event_handlers(ctx, call_state, agent, task_refs)
     await setup_cleanup_callback(ctx, call_state, task_refs)
 
+    # Let the telephony bridge flush caller-side playback on barge-in
+    setup_interruption_signal(ctx.room, session)
+
     # Setup transcript persistence if enabled
     if config["store_transcription"]['switch']:
         finish_queue = transcript_manager.setup_transcript_persistence(
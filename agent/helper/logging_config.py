@@ -5,21 +5,22 @@ Centralizes all logging setup and configuration.
 
 import logging
 
+from utils.structured_logging import setup_structured_logging
+
 def setup_logging():
     """Configure all loggers for the application"""
     
+    # Transcripts go through the queue-backed pipeline (formatting and writes off the event loop).
+    # The root logger stays with livekit-agents' CLI, which forwards job-process logs.
+    setup_structured_logging(loggers=["transcript"])
+    
     # Main agent logger
     logger = logging.getLogger("outbound-caller")
     logger.setLevel(logging.INFO)
     
-    # Transcript logger with custom formatting
+    # Transcript logger: bare message in text mode
     transcript_logger = logging.getLogger("transcript")
     transcript_logger.setLevel(logging.INFO)
-    transcript_handler = logging.StreamHandler()
-    transcript_formatter = logging.Formatter('%(message)s') 
-    transcript_handler.setFormatter(transcript_formatter)
-    transcript_logger.addHandler(transcript_handler)
-    transcript_logger.propagate = False
     
     # Reduce noise from third-party loggers
     noisy_loggers = [
@@ -1,39 +1,241 @@
+import asyncio
+import concurrent.futures
+import time
+import aiohttp
 from rag.warm_up_rag import embeddings_dimension as EMBEDDINGS_DIMENSION
-from livekit.plugins import openai, rag
-from livekit.plugins import rag
+from rag.embedding_cache import EMBEDDING_MODEL, RAG_WARMUP_QUERIES_PATH, EmbeddingCache, load_queries
+from rag.lexical_index import LexicalIndex, reciprocal_rank_fusion
+from rag.vector_index import backend_files, load_vector_index
+from livekit.plugins import openai
 import pickle
 import os
 from dotenv import load_dotenv
+from .logging_config import get_logger
 load_dotenv(dotenv_path="/app/.env.local")
 # load_dotenv()
 
-
+logger = get_logger(__name__)
 
 INDEX_PATH = os.getenv("VECTOR_INDEX_PATH", "/app/rag/vdb_data")
 file_name = os.getenv("VECTOR_FILE_NAME", "knowledge-base-earkart")
 DATA_PATH = os.getenv("VECTOR_DATA_PKL_PATH", f"/app/rag/rag_knowledge_base/{file_name}.pkl")
-with open(DATA_PATH, "rb") as f:
-    paragraphs_by_uuid = pickle.load(f)    
+# How often (at most) a lookup checks the index files for a rebuild
+RAG_RELOAD_CHECK_S = float(os.getenv("RAG_RELOAD_CHECK_S", 5.0))
+# vector (embedding + vector index), lexical (local BM25, no network) or hybrid (both, reciprocal-rank fused)
+RAG_RETRIEVAL_MODE = os.getenv("RAG_RETRIEVAL_MODE", "vector")
+RETRIEVAL_MODES = ("vector", "lexical", "hybrid")
+# Candidates each retriever contributes to hybrid fusion, per requested result
+HYBRID_CANDIDATES_PER_RESULT = 4
+# annoy (approximate), flat (exact NumPy scan) or flat_int8; see benchmarks/vector_index_bench.py
+RAG_VECTOR_BACKEND = os.getenv("RAG_VECTOR_BACKEND", "annoy")
+
+
+class RagService:
+    """
+    Process-resident knowledge base: the vector index (memory-mapped) and the paragraph
+    store are loaded once per worker and shared by every job in the process. When the
+    files change on disk (warm_up_rag rebuild) the new version is loaded in a thread and
+    swapped in; lookups keep using the old one until then.
+    """
+
+    def __init__(self, index_path: str, data_path: str, reload_check_s: float = RAG_RELOAD_CHECK_S,
+                 vector_backend: str = RAG_VECTOR_BACKEND):
+        self.index_path = index_path
+        self.data_path = data_path
+        self.vector_backend = vector_backend
+        self.reload_check_s = reload_check_s
+        # (vector_index, paragraphs_by_uuid, file signature, lexical_index), replaced as a whole on reload
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._reload_task = None
+        self.reloads = 0
+        self.timings = {}
+        # Query embeddings: in-process LRU plus optional SQLite store (RAG_EMBED_CACHE_*)
+        self.embedding_cache = EmbeddingCache(EMBEDDING_MODEL, EMBEDDINGS_DIMENSION)
+
+    def _signature(self):
+        """mtime/size of every file that makes up the knowledge base"""
+        files = backend_files(self.vector_backend, self.index_path) + [self.data_path]
+        signature = []
+        for path in files:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _read_snapshot(self):
+        signature = self._signature()
+        vector_index = load_vector_index(self.vector_backend, self.index_path)
+        with open(self.data_path, "rb") as f:
+            paragraphs_by_uuid = pickle.load(f)
+        # A rebuild writes the index and the paragraphs separately; don't swap in a half-written pair
+        missing = sum(1 for doc_id in vector_index.ids() if doc_id not in paragraphs_by_uuid)
+        if missing:
+            raise ValueError(f"{missing} of {vector_index.size} indexed paragraphs missing from {self.data_path}")
+        return vector_index, paragraphs_by_uuid, signature, LexicalIndex(paragraphs_by_uuid)
+
+    def load(self):
+        """Load the knowledge base (blocking); called from the worker's prewarm"""
+        start = time.perf_counter()
+        self._snapshot = self._read_snapshot()
+        self._checked_at = time.monotonic()
+        logger.info(f"📚 RAG index loaded ({self.vector_backend}): {self._snapshot[0].size} paragraphs "
+                    f"in {(time.perf_counter() - start) * 1000:.0f}ms from {self.index_path}")
+        return self
+
+    async def _reload(self):
+        try:
+            snapshot = await asyncio.to_thread(self._read_snapshot)
+        except Exception as e:
+            logger.error(f"❌ RAG index reload failed, keeping the loaded version: {e}")
+            return
+        self._snapshot = snapshot
+        self.reloads += 1
+        logger.info(f"🔄 RAG index hot-swapped: {snapshot[0].size} paragraphs")
+
+    def _check_for_update(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_check_s or (self._reload_task and not self._reload_task.done()):
+            return
+        self._checked_at = now
+        try:
+            changed = self._signature() != self._snapshot[2]
+        except OSError as e:
+            logger.error(f"❌ Cannot stat RAG index files: {e}")
+            return
+        if changed:
+            self._reload_task = asyncio.create_task(self._reload())
+
+    def _record(self, operation, elapsed_ms):
+        entry = self.timings.setdefault(operation, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry["last_ms"] = elapsed_ms
+
+    @staticmethod
+    async def _embed(texts, http_session=None):
+        results = await openai.create_embeddings(
+            input=texts,
+            model=EMBEDDING_MODEL,
+            dimensions=EMBEDDINGS_DIMENSION,
+            http_session=http_session,
+        )
+        return [result.embedding for result in results]
+
+    def warm_up_embeddings(self, path: str = RAG_WARMUP_QUERIES_PATH, timeout_s: float = 60.0):
+        """Blocking: cache embeddings for the frequent queries in `path` (disk store first, then the API)"""
+        if not path:
+            return 0
+
+        async def warm_up():
+            async with aiohttp.ClientSession() as http_session:
+                return await self.embedding_cache.warm_up(
+                    load_queries(path), lambda texts: self._embed(texts, http_session)
+                )
+
+        # Own thread and event loop: prewarm may run with or without a loop in this thread
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, warm_up()).result(timeout=timeout_s)
+
+    def vector_ids(self, vector, n: int = 5):
+        """Paragraph ids nearest to an embedding, from the loaded vector index"""
+        return [doc_id for doc_id, _ in self._snapshot[0].query(vector, n)]
+
+    def lexical_ids(self, query: str, n: int = 5):
+        """Paragraph ids ranked by BM25 for the query text (no network)"""
+        return [doc_id for doc_id, _ in self._snapshot[3].query(query, n)]
+
+    def query_vector(self, vector, top_k: int = 5):
+        """Top-k paragraphs for an embedding, from the loaded index"""
+        paragraphs_by_uuid = self._snapshot[1]
+        return [paragraphs_by_uuid[doc_id] for doc_id in self.vector_ids(vector, top_k)]
+
+    async def _embedding(self, query, timings):
+        start = time.perf_counter()
+        misses = self.embedding_cache.stats["misses"]
+        vector = await self.embedding_cache.get(query, self._embed)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._record("embedding", elapsed_ms)
+        timings.append(f"embedding {elapsed_ms:.0f}ms{' cached' if self.embedding_cache.stats['misses'] == misses else ''}")
+        return vector
+
+    def _timed(self, operation, timings, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._record(operation, elapsed_ms)
+        timings.append(f"{operation.split('_')[0]} {elapsed_ms:.2f}ms")
+        return result
+
+    async def search(self, query: str, top_k: int = 5, mode: str = None):
+        """Top-k paragraphs for a query; `mode` is vector, lexical or hybrid (default RAG_RETRIEVAL_MODE)"""
+        mode = mode or RAG_RETRIEVAL_MODE
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode {mode!r}; expected one of {', '.join(RETRIEVAL_MODES)}")
+        start = time.perf_counter()
+        if self._snapshot is None:
+            # Not prewarmed (e.g. run outside the agent worker): load once, off the event loop
+            await asyncio.to_thread(self.load)
+        else:
+            self._check_for_update()
+        paragraphs_by_uuid = self._snapshot[1]
+
+        timings = []
+        if mode == "lexical":
+            doc_ids = self._timed("lexical_query", timings, self.lexical_ids, query, top_k)
+        elif mode == "vector":
+            vector = await self._embedding(query, timings)
+            doc_ids = self._timed("index_query", timings, self.vector_ids, vector, top_k)
+        else:
+            candidates = max(top_k * HYBRID_CANDIDATES_PER_RESULT, 20)
+            lexical = self._timed("lexical_query", timings, self.lexical_ids, query, candidates)
+            try:
+                vector = await self._embedding(query, timings)
+                nearest = self._timed("index_query", timings, self.vector_ids, vector, candidates)
+            except Exception as e:
+                # Lexical results alone still answer the question
+                logger.error(f"❌ Embedding failed, hybrid lookup falling back to lexical: {e}")
+                nearest = []
+            doc_ids = reciprocal_rank_fusion([lexical, nearest], n=top_k)
+        paragraphs = [paragraphs_by_uuid[doc_id] for doc_id in doc_ids]
+
+        total_ms = (time.perf_counter() - start) * 1000
+        self._record("total", total_ms)
+        self._record(f"total_{mode}", total_ms)
+        logger.info(f"📚 RAG {mode} lookup {total_ms:.0f}ms ({', '.join(timings)})")
+        return paragraphs
+
+    def get_stats(self):
+        """Per-stage lookup latency and reload count"""
+        return {
+            "paragraphs": self._snapshot[0].size if self._snapshot else None,
+            "vector_backend": self.vector_backend,
+            "reloads": self.reloads,
+            "embedding_cache": self.embedding_cache.get_stats(),
+            "latency": {
+                operation: {
+                    "count": entry["count"],
+                    "avg_ms": round(entry["total_ms"] / entry["count"], 2),
+                    "max_ms": round(entry["max_ms"], 2),
+                    "last_ms": round(entry["last_ms"], 2),
+                }
+                for operation, entry in self.timings.items()
+            },
+        }
+
+
+# One per worker process, shared by every job it runs
+rag_service = RagService(INDEX_PATH, DATA_PATH)
+
 
 async def enrich_with_rag(
     user_msg,
-    top_k=5
+    top_k=5,
+    mode=None
 ) -> None:
     """
     Locate the last user message, use it to query the RAG model for
     the most relevant paragraph, add that to context, and generate a response.
+    mode: vector, lexical or hybrid (default RAG_RETRIEVAL_MODE)
     """
-    annoy_index = rag.annoy.AnnoyIndex.load(INDEX_PATH)
-    user_embedding = await openai.create_embeddings(
-        input=[user_msg],
-        model="text-embedding-3-small",
-        dimensions=EMBEDDINGS_DIMENSION,
-    )
-
-    results = annoy_index.query(user_embedding[0].embedding, n=top_k)
-    paragraphs = list()
-    for res in results:
-        paragraph = paragraphs_by_uuid[res.userdata]
-        paragraphs.append(paragraph)
-
-    return paragraphs
+    return await rag_service.search(user_msg, top_k, mode)
@@ -3,11 +3,14 @@ Session and agent setup helpers.
 Handles session configuration, background audio, and recording setup.
 """
 
+import asyncio
+import json
 import os
+import time
 from typing import Dict, Any
-from livekit import api
+from livekit import api, rtc
 from livekit.agents import (AudioConfig, BackgroundAudioPlayer, BuiltinAudioClip, 
-                           AgentSession, RoomInputOptions)
+                           AgentSession, RoomInputOptions, SpeechCreatedEvent)
 from livekit.plugins import noise_cancellation
 from livekit.plugins.turn_detector.english import EnglishModel
 from .ai_models import get_openai_llm, get_tts, get_stt_instance, get_vad_instance
@@ -16,6 +19,9 @@ from .data_entities import UserData
 
 logger = get_logger(__name__)
 
+# Data-channel topic the telephony bridge listens on for barge-in signals
+AGENT_EVENTS_TOPIC = os.getenv("AGENT_EVENTS_TOPIC", "agent-events")
+
 def prewarm_session(proc):
     """Prewarm function for session initialization"""
     proc.userdata["bg_audio_config"] = {
@@ -111,4 +117,25 @@ def get_room_input_options(mode: str) -> RoomInputOptions:
     else:  # Console mode
         return RoomInputOptions(
             noise_cancellation=noise_cancellation.BVC(),
-        )
\ No newline at end of file
+        )
+
+def setup_interruption_signal(room: rtc.Room, session: AgentSession):
+    """Notify the telephony bridge over the data channel when agent speech is interrupted"""
+    async def publish_interruption(speech_id: str, interrupted_at: float):
+        payload = json.dumps({
+            "type": "agent_interrupted",
+            "speech_id": speech_id,
+            "interrupted_at": interrupted_at,
+        })
+        try:
+            await room.local_participant.publish_data(payload, reliable=True, topic=AGENT_EVENTS_TOPIC)
+        except Exception as e:
+            logger.warning(f"Failed to publish interruption signal: {e}")
+
+    def on_speech_done(handle):
+        if handle.interrupted:
+            asyncio.create_task(publish_interruption(handle.id, time.time()))
+
+    @session.on("speech_created")
+    def on_speech_created(event: SpeechCreatedEvent):
+        event.speech_handle.add_done_callback(on_speech_done)
@@ -0,0 +1,4 @@
+"""
+Benchmarks for the telephony bridge and RAG hot paths.
+Run individual scripts with `python -m benchmarks.<name>` from the repository root.
+"""
@@ -0,0 +1,222 @@
+"""
+In-process stand-in for LiveKit used by the bridge load generator.
+Replaces the room, the server API client and agent audio subscription with
+fakes so `utils.plivo_ws` can run offline (e.g. in CI). The telephony audio
+source stays real, so capture cost and pacing are the bridge's own. Every
+frame it captures is echoed back by a fake agent participant as its audio track.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+
+from livekit import rtc
+
+from utils.telephony.livekit_client import LiveKitService
+
+AGENT_IDENTITY = "agent-echo"
+
+
+class _Participant:
+    def __init__(self, identity):
+        self.identity = identity
+        self.sid = f"PA_{identity}"
+        self.track_publications = {}
+
+
+class _RemoteAudioTrack:
+    """Agent audio track fed with echoed frames"""
+    kind = rtc.TrackKind.KIND_AUDIO
+
+    def __init__(self):
+        self.sid = "TR_agent_echo"
+        self.frames = asyncio.Queue()
+
+
+class _Publication:
+    kind = rtc.TrackKind.KIND_AUDIO
+
+    def __init__(self, sid, track=None):
+        self.sid = sid
+        self.track = track
+        self.subscribed = track is not None
+
+
+class FakeAudioStream:
+    """Replacement for `rtc.AudioStream` over a fake agent track, resampled to the requested rate"""
+
+    def __init__(self, track, sample_rate=48000, num_channels=1, **kwargs):
+        self._track = track
+        self._sample_rate = sample_rate
+        self._resamplers = {}
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            frame = await self._track.frames.get()
+            if frame is None:
+                raise StopAsyncIteration
+            if frame.sample_rate != self._sample_rate:
+                resampler = self._resamplers.get(frame.sample_rate)
+                if resampler is None:
+                    resampler = self._resamplers[frame.sample_rate] = rtc.AudioResampler(
+                        frame.sample_rate, self._sample_rate, num_channels=1,
+                        quality=rtc.AudioResamplerQuality.QUICK
+                    )
+                frames = resampler.push(frame)
+                if not frames:
+                    continue
+                frame = frames[0] if len(frames) == 1 else rtc.combine_audio_frames(frames)
+            return SimpleNamespace(frame=frame)
+
+    async def aclose(self):
+        pass
+
+
+class FakeRoom(rtc.EventEmitter):
+    """Replacement for `rtc.Room` that joins an echoing agent once it is dispatched"""
+
+    def __init__(self, livekit, loop=None):
+        super().__init__()
+        self._livekit = livekit
+        self.name = None
+        self._connected = False
+        self.remote_participants = {}
+        self.local_participant = SimpleNamespace(
+            identity="telephony",
+            publish_track=self._publish_track,
+            publish_data=self._publish_data
+        )
+        self.agent_track = None
+
+    def isconnected(self):
+        return self._connected
+
+    async def connect(self, url, token, options=None):
+        self.name = self._livekit.token_rooms.pop(token, token)
+        await asyncio.sleep(self._livekit.connect_delay)
+        self._connected = True
+        self._livekit.rooms[self.name] = self
+        self.emit("connected")
+        if self.name in self._livekit.dispatched:
+            self._livekit.schedule_agent(self)
+
+    async def disconnect(self):
+        if self.agent_track:
+            self.agent_track.frames.put_nowait(None)
+        self._connected = False
+        self._livekit.rooms.pop(self.name, None)
+        self.emit("disconnected")
+
+    async def _publish_track(self, track, options=None):
+        source = self._livekit.sources_by_track.pop(id(track), None)
+        if source is not None:
+            source._fake_sink = lambda frame: self._livekit.on_capture(self, frame)
+        self._livekit.published_at[self.name] = time.monotonic()
+        return _Publication(f"TR_{self.name}")
+
+    async def _publish_data(self, payload, **kwargs):
+        pass
+
+    def join_agent(self):
+        agent = _Participant(AGENT_IDENTITY)
+        self.agent_track = _RemoteAudioTrack()
+        publication = _Publication(self.agent_track.sid, self.agent_track)
+        agent.track_publications[publication.sid] = publication
+        self.remote_participants[agent.identity] = agent
+        self.emit("participant_connected", agent)
+        self.emit("track_subscribed", self.agent_track, publication, agent)
+
+
+class FakeLiveKit:
+    """Fake LiveKit deployment: server API, rooms, and capture/echo bookkeeping for the load generator"""
+
+    def __init__(self, connect_delay_ms: float = 50, agent_delay_ms: float = 200):
+        self.connect_delay = connect_delay_ms / 1000
+        self.agent_delay = agent_delay_ms / 1000
+        self.rooms = {}
+        self.dispatched = set()
+        self.token_rooms = {}
+        self.sources_by_track = {}
+        self.published_at = {}
+        # room -> [(monotonic time, seconds of caller audio captured so far)]
+        self.captures = defaultdict(list)
+        self._captured_seconds = defaultdict(float)
+        self.timings = {}
+
+    # --- LiveKitService interface ---
+
+    async def create_room(self, room_name, **kwargs):
+        return SimpleNamespace(name=room_name)
+
+    async def delete_room(self, room_name):
+        room = self.rooms.get(room_name)
+        if room:
+            await room.disconnect()
+
+    async def list_participants(self, room_name):
+        room = self.rooms.get(room_name)
+        return list(room.remote_participants.values()) if room else []
+
+    async def dispatch_agent(self, room_name, agent_name, metadata=""):
+        async with self.timed("dispatch_agent"):
+            self.dispatched.add(room_name)
+            room = self.rooms.get(room_name)
+            if room:
+                self.schedule_agent(room)
+            return SimpleNamespace(id=f"AD_{room_name}")
+
+    def create_token(self, identity, name, room_name):
+        token = f"token-{identity}"
+        self.token_rooms[token] = room_name
+        return token
+
+    # Same latency bookkeeping as the real client, so /health and logs keep working
+    timed = LiveKitService.timed
+    get_stats = LiveKitService.get_stats
+
+    async def aclose(self):
+        pass
+
+    # --- fake media plane ---
+
+    def schedule_agent(self, room):
+        asyncio.get_running_loop().call_later(self.agent_delay, room.join_agent)
+
+    def on_capture(self, room, frame):
+        """Record a frame the telephony source captured and echo it on the agent track"""
+        self._captured_seconds[room.name] += frame.samples_per_channel / frame.sample_rate
+        self.captures[room.name].append((time.monotonic(), self._captured_seconds[room.name]))
+        if room.agent_track:
+            # Pooled 8 kHz input frames are reused, so the echo gets its own copy
+            room.agent_track.frames.put_nowait(rtc.AudioFrame(
+                bytes(frame.data), frame.sample_rate, frame.num_channels, frame.samples_per_channel
+            ))
+
+    def install(self, bridge):
+        """Point a `utils.plivo_ws` module at this fake deployment"""
+        bridge.livekit_service = self
+        bridge.rtc.Room = lambda *args, **kwargs: FakeRoom(self)
+        bridge.rtc.AudioStream = FakeAudioStream
+
+        create_audio_track = bridge.rtc.LocalAudioTrack.create_audio_track
+
+        def create_tracked_audio_track(name, source):
+            track = create_audio_track(name, source)
+            self.sources_by_track[id(track)] = source
+            return track
+
+        bridge.rtc.LocalAudioTrack.create_audio_track = staticmethod(create_tracked_audio_track)
+
+        capture_frame = bridge.TelephonyAudioSource.capture_frame
+
+        async def capture_and_echo(source, frame):
+            await capture_frame(source, frame)
+            sink = getattr(source, "_fake_sink", None)
+            if sink:
+                sink(frame)
+
+        bridge.TelephonyAudioSource.capture_frame = capture_and_echo
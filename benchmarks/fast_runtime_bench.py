@@ -0,0 +1,135 @@
+"""
+Benchmark: bridge message path on the stdlib runtime vs the fast runtime (uvloop + orjson).
+A websocket server parses Plivo media messages with the bridge's provider
+adapter and answers every one with a playAudio message. Client streams in a
+separate process send as fast as the server keeps up, bounded by a window of
+unanswered messages. The run reports packets/sec through the server and the
+event-loop lag sampled on the server's loop.
+
+Usage: python -m benchmarks.fast_runtime_bench [--streams 20] [--seconds 5]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import time
+
+import numpy as np
+import websockets
+
+from utils.telephony import fast_runtime
+from utils.telephony.providers import PlivoJsonProtocol
+
+SAMPLES_PER_PACKET = 160  # 20 ms @ 8 kHz
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+
+def _media_message(sequence, payload):
+    return json.dumps({
+        "event": "media",
+        "sequenceNumber": sequence,
+        "streamId": "b9a1c7e2-5d3f-4a8b-9c6e-1f2a3b4c5d6e",
+        "media": {"track": "inbound", "timestamp": str(sequence * 20), "chunk": sequence, "payload": payload},
+    })
+
+
+async def _clients(port, streams, window, seconds):
+    """Client side (own process, stdlib loop): keep `window` messages in flight per stream"""
+    rng = np.random.default_rng(0)
+    payload = base64.b64encode(rng.integers(0, 256, SAMPLES_PER_PACKET, dtype=np.uint8).tobytes()).decode("ascii")
+    messages = [_media_message(i, payload) for i in range(1000)]
+    deadline = time.monotonic() + seconds
+
+    async def stream():
+        async with websockets.connect(f"ws://127.0.0.1:{port}", max_size=None) as websocket:
+            in_flight = asyncio.Semaphore(window)
+
+            async def receive():
+                async for _ in websocket:
+                    in_flight.release()
+
+            receiver = asyncio.create_task(receive())
+            sequence = 0
+            while time.monotonic() < deadline:
+                await in_flight.acquire()
+                await websocket.send(messages[sequence % len(messages)])
+                sequence += 1
+            receiver.cancel()
+
+    await asyncio.gather(*(stream() for _ in range(streams)), return_exceptions=True)
+
+
+def _run_clients(port, streams, window, seconds):
+    asyncio.run(_clients(port, streams, window, seconds))
+
+
+async def _scenario(args):
+    """Server side, on whichever runtime is enabled"""
+    protocol = PlivoJsonProtocol()
+    processed = 0
+
+    async def serve(websocket):
+        nonlocal processed
+        try:
+            async for message in websocket:
+                kind, item = protocol.parse(message)
+                processed += 1
+                await websocket.send(protocol.render_audio(item))
+        except websockets.ConnectionClosed:
+            pass
+
+    lags = []
+    loop = asyncio.get_running_loop()
+
+    async def monitor(interval=0.01):
+        while True:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            lags.append(max(0.0, time.perf_counter() - expected) * 1000)
+
+    async with websockets.serve(serve, "127.0.0.1", args.port, max_size=None):
+        clients = multiprocessing.get_context("spawn").Process(
+            target=_run_clients, args=(args.port, args.streams, args.window, args.seconds + 2.0)
+        )
+        clients.start()
+        monitor_task = asyncio.create_task(monitor())
+        await asyncio.sleep(1.0)  # warm-up
+        start_count, start = processed, time.perf_counter()
+        lags.clear()
+        await asyncio.sleep(args.seconds)
+        rate = (processed - start_count) / (time.perf_counter() - start)
+        measured_lags = list(lags)
+        monitor_task.cancel()
+        await loop.run_in_executor(None, clients.join)
+
+    return rate, _percentile(measured_lags, 50), _percentile(measured_lags, 99), fast_runtime.runtime_info()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=20, help="concurrent client streams")
+    parser.add_argument("--seconds", type=float, default=5.0, help="measured seconds per runtime")
+    parser.add_argument("--window", type=int, default=5, help="unanswered messages allowed per stream")
+    parser.add_argument("--port", type=int, default=18790)
+    args = parser.parse_args()
+
+    results = {}
+    for label, fast in (("stdlib (asyncio + json)", False), ("fast (uvloop + orjson)", True)):
+        fast_runtime.enable(fast)
+        rate, lag_p50, lag_p99, info = fast_runtime.run(_scenario(args))
+        results[label] = rate
+        print(f"{label:<26} {rate:>10,.0f} packets/sec  loop lag p50 {lag_p50:.2f}ms p99 {lag_p99:.2f}ms  "
+              f"({info['event_loop']} loop, {info['json']})")
+
+    baseline, fast = results.values()
+    print(f"Fast runtime: {fast / baseline:.2f}x packets/sec")
+
+
+if __name__ == "__main__":
+    main()
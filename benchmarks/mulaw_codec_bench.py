@@ -0,0 +1,84 @@
+"""
+Benchmark: μ-law codec lookup tables vs the legacy audioop path.
+Reports packets/sec on a single core for 20 ms (160-sample) Plivo packets.
+
+Usage: python -m benchmarks.mulaw_codec_bench [--packets 200000]
+"""
+
+import argparse
+import array
+import time
+
+import numpy as np
+from livekit import rtc
+
+from utils.telephony import mulaw_codec
+
+try:
+    import audioop
+except ImportError:  # Python 3.13+
+    audioop = None
+
+SAMPLES_PER_PACKET = 160  # 20 ms @ 8 kHz
+
+
+def _run(label, fn, packets):
+    start = time.process_time()
+    for _ in range(packets):
+        fn()
+    elapsed = time.process_time() - start
+    rate = packets / elapsed if elapsed else float("inf")
+    print(f"{label:<34} {rate:>12,.0f} packets/sec/core  ({elapsed * 1e6 / packets:.2f} µs/packet)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--packets", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    mulaw_packet = rng.integers(0, 256, SAMPLES_PER_PACKET, dtype=np.uint8).tobytes()
+    pcm_frame = rtc.AudioFrame.create(8000, 1, SAMPLES_PER_PACKET)
+    mulaw_codec.decode_into(mulaw_packet, mulaw_codec.frame_samples(pcm_frame))
+    mulaw_out = np.empty(SAMPLES_PER_PACKET, dtype=np.uint8)
+    reusable_frame = rtc.AudioFrame.create(8000, 1, SAMPLES_PER_PACKET)
+    reusable_view = mulaw_codec.frame_samples(reusable_frame)
+
+    def legacy_decode():
+        pcm = audioop.ulaw2lin(mulaw_packet, 2)
+        samples = array.array("h")
+        samples.frombytes(pcm)
+        frame = rtc.AudioFrame.create(8000, 1, len(samples))
+        frame.data[:len(samples)] = samples
+
+    def table_decode():
+        frame = rtc.AudioFrame.create(8000, 1, SAMPLES_PER_PACKET)
+        mulaw_codec.decode_into(mulaw_packet, mulaw_codec.frame_samples(frame))
+
+    def table_decode_reused():
+        mulaw_codec.decode_into(mulaw_packet, reusable_view)
+
+    def legacy_encode():
+        audioop.lin2ulaw(bytes(pcm_frame.data[:pcm_frame.samples_per_channel * 2]), 2)
+
+    def table_encode():
+        mulaw_codec.encode_into(mulaw_codec.frame_samples(pcm_frame), mulaw_out)
+
+    print(f"μ-law codec benchmark: {args.packets:,} packets of {SAMPLES_PER_PACKET} samples")
+    if audioop is not None:
+        legacy_in = _run("inbound  audioop+array+AudioFrame", legacy_decode, args.packets)
+    table_in = _run("inbound  table+AudioFrame", table_decode, args.packets)
+    _run("inbound  table, reused frame", table_decode_reused, args.packets)
+    if audioop is not None:
+        legacy_out = _run("outbound bytes()+audioop", legacy_encode, args.packets)
+    table_out = _run("outbound table encode_into", table_encode, args.packets)
+
+    if audioop is not None:
+        print(f"speedup: inbound {table_in / legacy_in:.2f}x, outbound {table_out / legacy_out:.2f}x")
+    else:
+        print("audioop unavailable on this interpreter - legacy path skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Synthetic Plivo load generator for the telephony bridge.
+Opens N simulated Plivo bidirectional streams against the bridge WebSocket
+server. Each stream sends a `start` event and then real-time paced μ-law
+`media` events (from a WAV file, or a synthetic voice-like signal), receives
+playAudio, and ends with `stop`. With --protocol binary the media is sent as
+raw μ-law websocket frames instead (the bridge's raw-binary provider). It reports per-call setup time,
+inbound -> LiveKit latency, event-loop lag, CPU and RSS.
+
+With --fake-livekit (the default when no --url is given) the bridge runs in
+this process against an echoing in-process LiveKit stand-in, so no LiveKit
+server, agent or network is needed. Against a running bridge (--url),
+latency and setup time are not observable. In that case pass --bridge-pid
+to sample the bridge process's CPU and RSS.
+
+Usage:
+  python -m benchmarks.plivo_load --calls 50 --duration 30
+  python -m benchmarks.plivo_load --calls 50 --duration 30 --protocol binary
+  python -m benchmarks.plivo_load --url ws://127.0.0.1:8765 --calls 20 --bridge-pid 1234
+"""
+
+import argparse
+import asyncio
+import base64
+import bisect
+import json
+import os
+import resource
+import statistics
+import time
+import uuid
+import wave
+
+import numpy as np
+
+PACKET_MS = 20
+SAMPLE_RATE = 8000
+PACKET_SAMPLES = SAMPLE_RATE * PACKET_MS // 1000
+
+
+def _percentiles(values, points=(50, 95, 99)):
+    if not values:
+        return {f"p{p}": None for p in points} | {"max": None}
+    ordered = sorted(values)
+    result = {f"p{p}": round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))], 2) for p in points}
+    result["max"] = round(ordered[-1], 2)
+    return result
+
+
+def load_packets(path, seconds):
+    """μ-law 20 ms packets covering `seconds`, looping the WAV (or a synthetic signal) as needed"""
+    from utils.telephony import mulaw_codec
+
+    if path:
+        with wave.open(path, "rb") as wav:
+            if wav.getsampwidth() != 2:
+                raise ValueError(f"{path}: expected 16-bit PCM")
+            rate, channels = wav.getframerate(), wav.getnchannels()
+            pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        if channels > 1:
+            pcm = pcm.reshape(-1, channels)[:, 0].copy()
+        if rate != SAMPLE_RATE:
+            from livekit import rtc
+            resampler = rtc.AudioResampler(rate, SAMPLE_RATE, num_channels=1)
+            frames = resampler.push(rtc.AudioFrame(pcm.tobytes(), rate, 1, len(pcm))) + resampler.flush()
+            pcm = np.concatenate([np.frombuffer(f.data, dtype=np.int16, count=f.samples_per_channel) for f in frames])
+    else:
+        # Syllable-rate modulated harmonics: speech-like level changes without shipping audio
+        t = np.arange(SAMPLE_RATE * 4) / SAMPLE_RATE
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+        voice = sum(np.sin(2 * np.pi * f * t) / n for n, f in enumerate((150, 300, 450, 900), 1))
+        pcm = (voice * envelope * 6000).astype(np.int16)
+
+    total = int(seconds * 1000 / PACKET_MS) * PACKET_SAMPLES
+    pcm = np.resize(pcm, total)
+    mulaw = mulaw_codec.lin2ulaw(pcm.tobytes())
+    return [
+        base64.b64encode(mulaw[i:i + PACKET_SAMPLES]).decode("ascii")
+        for i in range(0, len(mulaw), PACKET_SAMPLES)
+    ]
+
+
+class SimulatedCall:
+    """One Plivo bidirectional stream"""
+
+    def __init__(self, index, url, packets, protocol="plivo"):
+        self.room_name = f"load-{index}-{uuid.uuid4().hex[:8]}"
+        self.url = f"{url}/?room={self.room_name}&protocol={protocol}"
+        self.binary = protocol == "binary"
+        # Binary providers send the μ-law bytes themselves
+        self.packets = [base64.b64decode(p) for p in packets] if self.binary else packets
+        self.stream_id = str(uuid.uuid4())
+        self.call_id = str(uuid.uuid4())
+        self.connect_started = None
+        self.send_times = []
+        self.first_play_audio = None
+        self.play_audio_messages = 0
+        self.play_audio_bytes = 0
+        self.clear_audio_messages = 0
+        self.error = None
+
+    async def run(self):
+        import websockets
+
+        self.connect_started = time.monotonic()
+        try:
+            async with websockets.connect(self.url, max_size=None) as websocket:
+                receiver = asyncio.create_task(self._receive(websocket))
+                await websocket.send(json.dumps({
+                    "event": "start",
+                    "sequenceNumber": 0,
+                    "start": {
+                        "streamId": self.stream_id,
+                        "callId": self.call_id,
+                        "accountId": "LOADTEST",
+                        "tracks": ["inbound"],
+                        "mediaFormat": {"encoding": "audio/x-mulaw", "sampleRate": SAMPLE_RATE},
+                    },
+                }))
+                start = time.monotonic()
+                for chunk, payload in enumerate(self.packets):
+                    # Absolute schedule so send jitter doesn't accumulate into drift
+                    delay = start + chunk * PACKET_MS / 1000 - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    self.send_times.append(time.monotonic())
+                    if self.binary:
+                        await websocket.send(payload)
+                        continue
+                    await websocket.send(json.dumps({
+                        "event": "media",
+                        "sequenceNumber": chunk + 1,
+                        "streamId": self.stream_id,
+                        "media": {
+                            "track": "inbound",
+                            "timestamp": str(chunk * PACKET_MS),
+                            "chunk": chunk,
+                            "payload": payload,
+                        },
+                    }))
+                await websocket.send(json.dumps({"event": "stop", "streamId": self.stream_id}))
+                await asyncio.sleep(0.5)
+                receiver.cancel()
+        except Exception as e:
+            self.error = repr(e)
+
+    async def _receive(self, websocket):
+        async for message in websocket:
+            if isinstance(message, bytes):
+                if self.first_play_audio is None:
+                    self.first_play_audio = time.monotonic()
+                self.play_audio_messages += 1
+                self.play_audio_bytes += len(message)
+                continue
+            event = json.loads(message)
+            if event.get("event") == "playAudio":
+                if self.first_play_audio is None:
+                    self.first_play_audio = time.monotonic()
+                self.play_audio_messages += 1
+                self.play_audio_bytes += len(event["media"]["payload"]) * 3 // 4
+            elif event.get("event") == "clearAudio":
+                self.clear_audio_messages += 1
+
+    def inbound_latencies_ms(self, captures, published_at):
+        """Send -> capture latency per packet sent after the track was published"""
+        if not captures or published_at is None:
+            return []
+        capture_times = [t for t, _ in captures]
+        captured = [seconds for _, seconds in captures]
+        latencies = []
+        for chunk, sent_at in enumerate(self.send_times):
+            if sent_at < published_at:
+                continue
+            index = bisect.bisect_left(captured, (chunk + 1) * PACKET_MS / 1000 - 1e-6)
+            if index < len(captured):
+                latencies.append((capture_times[index] - sent_at) * 1000)
+        return latencies
+
+
+class ProcessSampler:
+    """CPU and RSS of this process, or of another process via /proc"""
+
+    def __init__(self, pid=None):
+        self.pid = pid
+        self.peak_rss_mb = 0.0
+        self._clock_ticks = os.sysconf("SC_CLK_TCK")
+        self._start_cpu = self._cpu_seconds()
+        self._start_wall = time.monotonic()
+
+    def _cpu_seconds(self):
+        if self.pid is None:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            return usage.ru_utime + usage.ru_stime
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self._clock_ticks
+
+    def rss_mb(self):
+        pid = self.pid or "self"
+        with open(f"/proc/{pid}/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+        self.peak_rss_mb = max(self.peak_rss_mb, rss)
+        return rss
+
+    def cpu_percent(self):
+        wall = time.monotonic() - self._start_wall
+        return (self._cpu_seconds() - self._start_cpu) / wall * 100 if wall else 0.0
+
+
+async def monitor(sampler, lags, interval=0.05):
+    """Record event-loop lag (sleep overshoot) and track peak RSS"""
+    while True:
+        expected = time.monotonic() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.monotonic() - expected) * 1000)
+        sampler.rss_mb()
+
+
+async def start_in_process_bridge(args):
+    """Run the bridge's WebSocket server in this process against the fake LiveKit"""
+    os.environ.setdefault("LIVEKIT_URL", "ws://fake-livekit")
+    os.environ.setdefault("LIVEKIT_API_KEY", "fake")
+    os.environ.setdefault("LIVEKIT_API_SECRET", "fake")
+    # Keep every packet so sent and captured audio line up one-to-one
+    os.environ.setdefault("EARLY_MEDIA_DROP_LEADING_SILENCE", "false")
+    # No database behind the fake deployment
+    os.environ.setdefault("TELEPHONY_CALL_METRICS_TO_DB", "false")
+    os.environ["BRIDGE_WEBSOCKET_PORT"] = str(args.port)
+
+    import logging
+    from benchmarks.fake_livekit import FakeLiveKit
+    from utils import plivo_ws
+
+    logging.getLogger("utils.plivo_ws").setLevel(logging.WARNING)
+    fake = FakeLiveKit(connect_delay_ms=args.connect_delay_ms, agent_delay_ms=args.agent_delay_ms)
+    fake.install(plivo_ws)
+    server = await plivo_ws.start_websocket_server()
+    return fake, plivo_ws, server
+
+
+async def run(args):
+    packets = load_packets(args.wav, args.duration)
+    fake = bridge = server = None
+    if args.url:
+        url = args.url.rstrip("/")
+    else:
+        fake, bridge, server = await start_in_process_bridge(args)
+        url = f"ws://127.0.0.1:{args.port}"
+
+    sampler = ProcessSampler(args.bridge_pid)
+    lags = []
+    monitor_task = asyncio.create_task(monitor(sampler, lags))
+
+    calls = [SimulatedCall(i, url, packets, args.protocol) for i in range(args.calls)]
+    tasks = []
+    for call in calls:
+        tasks.append(asyncio.create_task(call.run()))
+        await asyncio.sleep(args.ramp)
+    await asyncio.gather(*tasks)
+    if bridge:
+        # Let hangup teardown finish before measuring
+        await asyncio.sleep(1.0)
+
+    monitor_task.cancel()
+    cpu = sampler.cpu_percent()
+
+    per_call = []
+    all_latencies = []
+    for call in calls:
+        published_at = fake.published_at.get(call.room_name) if fake else None
+        latencies = call.inbound_latencies_ms(fake.captures.get(call.room_name), published_at) if fake else []
+        all_latencies.extend(latencies)
+        per_call.append({
+            "room": call.room_name,
+            "error": call.error,
+            "setup_ms": round((published_at - call.connect_started) * 1000, 1) if published_at else None,
+            "first_audio_ms": round((call.first_play_audio - call.connect_started) * 1000, 1) if call.first_play_audio else None,
+            "inbound_latency_ms": _percentiles(latencies),
+            "play_audio_messages": call.play_audio_messages,
+            "play_audio_seconds": round(call.play_audio_bytes / SAMPLE_RATE, 2),
+            "clear_audio_messages": call.clear_audio_messages,
+        })
+
+    setups = [c["setup_ms"] for c in per_call if c["setup_ms"] is not None]
+    first_audio = [c["first_audio_ms"] for c in per_call if c["first_audio_ms"] is not None]
+    summary = {
+        "calls": args.calls,
+        "failed_calls": sum(1 for c in per_call if c["error"]),
+        "duration_s": args.duration,
+        "mode": "remote" if args.url else "in-process fake LiveKit",
+        "protocol": args.protocol,
+        "setup_ms": _percentiles(setups),
+        "first_audio_ms": _percentiles(first_audio),
+        "inbound_latency_ms": _percentiles(all_latencies),
+        "event_loop_lag_ms": _percentiles(lags),
+        "cpu_percent": round(cpu, 1),
+        "cpu_percent_per_call": round(cpu / max(1, args.calls), 2),
+        "peak_rss_mb": round(sampler.peak_rss_mb, 1),
+        "measured_process": f"pid {args.bridge_pid}" if args.bridge_pid else "load generator" + ("" if args.url else " + bridge"),
+    }
+
+    if server:
+        server.close()
+        await server.wait_closed()
+    return summary, per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=10, help="concurrent simulated calls")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of caller audio per call")
+    parser.add_argument("--ramp", type=float, default=0.05, help="seconds between call starts")
+    parser.add_argument("--wav", help="16-bit PCM WAV to stream (looped); synthetic signal if omitted")
+    parser.add_argument("--url", help="bridge WebSocket URL; runs the bridge in-process with fake LiveKit if omitted")
+    parser.add_argument("--port", type=int, default=18765, help="port for the in-process bridge")
+    parser.add_argument("--bridge-pid", type=int, help="sample CPU/RSS of this process instead of the generator")
+    parser.add_argument("--connect-delay-ms", type=float, default=50, help="fake LiveKit room connect time")
+    parser.add_argument("--agent-delay-ms", type=float, default=200, help="fake agent join delay after dispatch")
+    parser.add_argument("--protocol", choices=("plivo", "binary"), default="plivo",
+                        help="provider wire protocol: Plivo JSON/base64 media or raw binary frames")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args()
+
+    summary, per_call = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps({"summary": summary, "calls": per_call}, indent=2))
+        return
+
+    print(f"Plivo load test: {summary['calls']} calls x {args.duration:.0f}s ({summary['mode']}, {summary['protocol']} protocol)")
+    for key in ("setup_ms", "first_audio_ms", "inbound_latency_ms", "event_loop_lag_ms"):
+        print(f"  {key:<20} {summary[key]}")
+    print(f"  {'cpu':<20} {summary['cpu_percent']}% ({summary['cpu_percent_per_call']}% per call, {summary['measured_process']})")
+    print(f"  {'peak_rss_mb':<20} {summary['peak_rss_mb']}")
+    print(f"  {'failed_calls':<20} {summary['failed_calls']}")
+    received = [c["play_audio_seconds"] for c in per_call]
+    if received:
+        print(f"  {'playAudio s/call':<20} min {min(received)}, mean {statistics.mean(received):.2f}")
+
+
+if __name__ == "__main__":
+    main()
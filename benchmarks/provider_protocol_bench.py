@@ -0,0 +1,67 @@
+"""
+Benchmark: per-packet cost of the provider wire protocols.
+Times inbound parsing (websocket message -> μ-law bytes) and outbound rendering
+(μ-law chunk -> websocket message) for 20 ms packets. Plivo packets go through
+JSON and base64; raw-binary packets skip both.
+
+Usage: python -m benchmarks.provider_protocol_bench [--packets 200000]
+"""
+
+import argparse
+import base64
+import json
+import time
+
+import numpy as np
+
+from utils.telephony.providers import PlivoJsonProtocol, RawBinaryProtocol
+
+SAMPLES_PER_PACKET = 160  # 20 ms @ 8 kHz
+
+
+def _run(label, fn, packets):
+    start = time.process_time()
+    for _ in range(packets):
+        fn()
+    elapsed = time.process_time() - start
+    rate = packets / elapsed if elapsed else float("inf")
+    print(f"{label:<34} {rate:>12,.0f} packets/sec/core  ({elapsed * 1e6 / packets:.2f} µs/packet)")
+    return elapsed / packets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--packets", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    mulaw_packet = rng.integers(0, 256, SAMPLES_PER_PACKET, dtype=np.uint8).tobytes()
+    plivo_message = json.dumps({
+        "event": "media",
+        "sequenceNumber": 1234,
+        "streamId": "b9a1c7e2-5d3f-4a8b-9c6e-1f2a3b4c5d6e",
+        "media": {
+            "track": "inbound",
+            "timestamp": "24680",
+            "chunk": 1234,
+            "payload": base64.b64encode(mulaw_packet).decode("ascii"),
+        },
+    })
+    plivo = PlivoJsonProtocol()
+    binary = RawBinaryProtocol()
+
+    print("Inbound (message -> μ-law):")
+    plivo_parse = _run("  plivo json + base64", lambda: plivo.parse(plivo_message), args.packets)
+    binary_parse = _run("  raw binary", lambda: binary.parse(mulaw_packet), args.packets)
+
+    print("Outbound (μ-law -> message):")
+    plivo_render = _run("  plivo playAudio envelope", lambda: plivo.render_audio(mulaw_packet), args.packets)
+    binary_render = _run("  raw binary", lambda: binary.render_audio(mulaw_packet), args.packets)
+
+    saved_us = (plivo_parse - binary_parse + plivo_render - binary_render) * 1e6
+    print(f"Binary saves {saved_us:.2f} µs per packet each way combined "
+          f"({saved_us * 50 / 1000:.3f} ms CPU per call-second at 50 packets/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: knowledge-base lookup with the index reloaded per query vs the process-resident RagService.
+Builds a synthetic Annoy index and paragraph store in a temp directory. It
+then times the index part of the `search_earkart_knowledge_base` tool both
+ways. The OpenAI embedding call is the same in both, so it is left out and
+random unit vectors stand in for query embeddings.
+
+Usage: python -m benchmarks.rag_lookup_bench [--paragraphs 500] [--queries 200]
+"""
+
+import argparse
+import os
+import pickle
+import tempfile
+import time
+import uuid
+
+import numpy as np
+from livekit.plugins import rag
+
+from agent.helper.rag_connector import EMBEDDINGS_DIMENSION, RagService
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _report(label, samples_ms):
+    print(f"{label:<34} p50 {_percentile(samples_ms, 50):8.3f}ms  p95 {_percentile(samples_ms, 95):8.3f}ms  "
+          f"mean {sum(samples_ms) / len(samples_ms):8.3f}ms")
+    return sum(samples_ms) / len(samples_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dimensions", type=int, default=EMBEDDINGS_DIMENSION)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = os.path.join(tmp, "vdb_data")
+        data_path = os.path.join(tmp, "paragraphs.pkl")
+        builder = rag.annoy.IndexBuilder(f=args.dimensions, metric="angular")
+        paragraphs_by_uuid = {}
+        for i in range(args.paragraphs):
+            p_uuid = uuid.uuid4()
+            paragraphs_by_uuid[p_uuid] = f"paragraph {i}"
+            builder.add_item(rng.standard_normal(args.dimensions).tolist(), p_uuid)
+        builder.build()
+        builder.save(index_path)
+        with open(data_path, "wb") as f:
+            pickle.dump(paragraphs_by_uuid, f)
+
+        queries = [rng.standard_normal(args.dimensions).tolist() for _ in range(args.queries)]
+
+        # Before: every tool call re-opened the index
+        per_query = []
+        for vector in queries:
+            start = time.perf_counter()
+            annoy_index = rag.annoy.AnnoyIndex.load(index_path)
+            results = annoy_index.query(vector, n=args.top_k)
+            [paragraphs_by_uuid[res.userdata] for res in results]
+            per_query.append((time.perf_counter() - start) * 1000)
+
+        # After: loaded once at prewarm, shared by every lookup
+        start = time.perf_counter()
+        service = RagService(index_path, data_path).load()
+        load_ms = (time.perf_counter() - start) * 1000
+        resident = []
+        for vector in queries:
+            start = time.perf_counter()
+            service.query_vector(vector, args.top_k)
+            resident.append((time.perf_counter() - start) * 1000)
+
+    print(f"{args.paragraphs} paragraphs x {args.dimensions} dims, {args.queries} queries, top {args.top_k}")
+    before = _report("load index per query (before)", per_query)
+    after = _report("resident RagService (after)", resident)
+    print(f"One-time prewarm load: {load_ms:.1f}ms; index time per lookup cut {before / after:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: lexical (BM25), vector (Annoy) and hybrid (RRF) knowledge-base retrieval.
+Loads the configured knowledge base (VECTOR_INDEX_PATH / VECTOR_DATA_PKL_PATH)
+into a RagService and runs a set of labelled queries through each mode. The
+default query set is Hindi/Hinglish/English questions about the EarKART
+knowledge base. Each query is labelled with the id of the paragraph that
+answers it. The run reports:
+- recall@k against those labels
+- overlap with the current Annoy top-k
+- retrieval latency per mode
+
+Query embeddings are fetched once up front through the embedding cache.
+Their API latency is reported separately, so the per-mode numbers compare
+the retrievers themselves.
+
+Usage: python -m benchmarks.rag_retrieval_bench [--queries queries.tsv] [--top-k 3] [--modes lexical,vector,hybrid]
+(queries.tsv: "<query>\\t<text that identifies the answering paragraph>" per line; vector/hybrid need OPENAI_API_KEY)
+"""
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+
+from agent.helper.rag_connector import rag_service
+
+# (query, substring of the paragraph that answers it)
+EARKART_QUERIES = [
+    ("discount kitna milega?", "faq.q2_discount"),
+    ("मुझे सिर्फ फ्री विजिट चाहिए", "faq.q3_free_visit"),
+    ("warranty hai to insurance ki kya zarurat", "faq.q4_insurance_vs_warranty"),
+    ("बीमा और वारंटी में क्या फर्क है", "faq.q4_insurance_vs_warranty"),
+    ("UV dehumidifier kit ka kya use hai rechargeable me", "faq.q5_uv_dehumidifier_kit"),
+    ("aapko mera number kahan se mila", "faq.q6_where_got_number"),
+    ("kaunsa brand accha hai", "faq.q7_which_brand_good"),
+    ("benefits likh ke bhej sakte ho?", "faq.q8_benefits_in_writing"),
+    ("company kitni purani hai", "faq.q9_company_age"),
+    ("आपका ऑफिस कहाँ है", "faq.q11_office_location"),
+    ("benefits kaise milenge", "faq.q12_benefits_receipt_process"),
+    ("mere paas pehle se hearing aid hai", "faq.q13_existing_user_offer"),
+    ("insurance me kya kya cover hota hai", "policy.insurance.coverage"),
+    ("chori ho gaya to claim kaise kare", "policy.insurance.claim_procedure"),
+    ("kitne clinics hai aapke", "location.clinic_network"),
+    ("walk in kar sakta hu bina appointment", "faq.q1_walkin_allowed"),
+]
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _load_queries(path):
+    queries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip() and "\t" in line:
+                query, label = line.rstrip("\n").split("\t", 1)
+                queries.append((query, label))
+    return queries
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", help="TSV of query<TAB>answer-paragraph substring (default: EarKART set)")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--modes", default="lexical,vector,hybrid")
+    parser.add_argument("--repeat", type=int, default=20, help="timed passes over the query set per mode")
+    args = parser.parse_args()
+
+    queries = _load_queries(args.queries) if args.queries else EARKART_QUERIES
+    modes = args.modes.split(",")
+    rag_service.load()
+    paragraphs_by_uuid = rag_service._snapshot[1]
+
+    gold = {}
+    for query, label in queries:
+        matches = {doc_id for doc_id, text in paragraphs_by_uuid.items() if label in text}
+        if not matches:
+            print(f"⚠️ No paragraph contains {label!r}; skipping {query!r}")
+            continue
+        gold[query] = matches
+
+    annoy_top = {}
+    if "vector" in modes or "hybrid" in modes:
+        async with aiohttp.ClientSession() as http_session:
+            await rag_service.embedding_cache.warm_up(
+                list(gold), lambda texts: rag_service._embed(texts, http_session)
+            )
+        stats = rag_service.embedding_cache.get_stats()
+        print(f"Embedding API: {stats['embed_requests']} requests, avg {stats['embed_avg_ms']}ms "
+              f"(paid per uncached query by vector and hybrid modes)")
+        for query in gold:
+            vector = await rag_service.embedding_cache.get(query, rag_service._embed)
+            annoy_top[query] = set(rag_service.vector_ids(vector, args.top_k))
+
+    print(f"{len(gold)} queries, top {args.top_k}, {len(paragraphs_by_uuid)} paragraphs")
+    for mode in modes:
+        hits = 0
+        overlap = 0
+        latencies = []
+        for query, answers in gold.items():
+            results = await rag_service.search(query, args.top_k, mode)
+            ids = {doc_id for doc_id, text in paragraphs_by_uuid.items() if text in results}
+            hits += bool(ids & answers)
+            if annoy_top:
+                overlap += len(ids & annoy_top[query]) / args.top_k
+        for _ in range(args.repeat):
+            for query in gold:
+                start = time.perf_counter()
+                await rag_service.search(query, args.top_k, mode)
+                latencies.append((time.perf_counter() - start) * 1000)
+        agreement = f"  overlap with Annoy top-{args.top_k} {overlap / len(gold):.0%}" if annoy_top else ""
+        print(f"{mode:<8} recall@{args.top_k} {hits / len(gold):.0%}  latency p50 {_percentile(latencies, 50):.3f}ms "
+              f"p95 {_percentile(latencies, 95):.3f}ms{agreement}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
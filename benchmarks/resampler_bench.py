@@ -0,0 +1,86 @@
+"""
+Benchmark: telephony track publish rate x resampler quality.
+For each combination, runs one call's worth of audio through both bridge
+directions (8 kHz caller -> publish rate, agent stream rate -> 8 kHz) and
+reports CPU per call (% of one core) and the latency each resampler adds
+by holding audio back before releasing it.
+
+Usage: python -m benchmarks.resampler_bench [--seconds 60]
+"""
+
+import argparse
+import time
+
+import numpy as np
+from livekit import rtc
+
+TELEPHONY_RATE = 8000
+RATES = (8000, 16000, 48000)
+FRAME_MS = 20  # Plivo packets and LiveKit AudioStream frames are both 20/10 ms; 20 ms is the common case
+
+
+def _frames(rate, seconds, rng):
+    """`seconds` of noise at `rate` as a list of 20 ms AudioFrames"""
+    samples = rate * FRAME_MS // 1000
+    count = seconds * 1000 // FRAME_MS
+    pcm = (rng.standard_normal(samples * count) * 3000).astype(np.int16)
+    return [rtc.AudioFrame(pcm[i * samples:(i + 1) * samples].tobytes(), rate, 1, samples) for i in range(count)]
+
+
+def _cpu_seconds(input_rate, output_rate, quality, frames):
+    """CPU time to resample `frames`; zero when the rates already match"""
+    if input_rate == output_rate:
+        return 0.0
+    resampler = rtc.AudioResampler(input_rate, output_rate, num_channels=1, quality=quality)
+    start = time.process_time()
+    for frame in frames:
+        resampler.push(frame)
+    resampler.flush()
+    return time.process_time() - start
+
+
+def _latency_ms(input_rate, output_rate, quality):
+    """
+    Worst-case audio held back by the resampler: input pushed minus output released.
+    Filter delay is compensated internally, so this buffering is the latency it adds.
+    """
+    if input_rate == output_rate:
+        return 0.0
+    resampler = rtc.AudioResampler(input_rate, output_rate, num_channels=1, quality=quality)
+    samples = input_rate * FRAME_MS // 1000
+    silence = rtc.AudioFrame(np.zeros(samples, dtype=np.int16).tobytes(), input_rate, 1, samples)
+    pushed = released = 0
+    held = 0.0
+    for _ in range(50):
+        pushed += samples
+        released += sum(frame.samples_per_channel for frame in resampler.push(silence))
+        held = max(held, pushed / input_rate - released / output_rate)
+    return held * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=int, default=60, help="simulated call length per direction")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames_by_rate = {rate: _frames(rate, args.seconds, rng) for rate in RATES}
+
+    print(f"Resampler benchmark: {args.seconds}s of audio per direction, {FRAME_MS} ms frames")
+    print(f"{'publish/stream':>14} {'quality':>10} {'in CPU%':>8} {'out CPU%':>9} {'call CPU%':>10} "
+          f"{'in +ms':>7} {'out +ms':>8}")
+    for rate in RATES:
+        for quality in rtc.AudioResamplerQuality:
+            cpu_in = _cpu_seconds(TELEPHONY_RATE, rate, quality, frames_by_rate[TELEPHONY_RATE])
+            cpu_out = _cpu_seconds(rate, TELEPHONY_RATE, quality, frames_by_rate[rate])
+            latency_in = _latency_ms(TELEPHONY_RATE, rate, quality)
+            latency_out = _latency_ms(rate, TELEPHONY_RATE, quality)
+            print(f"{rate:>14} {quality.value:>10} {cpu_in / args.seconds * 100:>8.3f} "
+                  f"{cpu_out / args.seconds * 100:>9.3f} {(cpu_in + cpu_out) / args.seconds * 100:>10.3f} "
+                  f"{latency_in:>7.2f} {latency_out:>8.2f}")
+            if rate == TELEPHONY_RATE:
+                break  # no resampling at the telephony rate, quality is irrelevant
+
+
+if __name__ == "__main__":
+    main()
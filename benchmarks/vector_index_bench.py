@@ -0,0 +1,96 @@
+"""
+Benchmark: vector-index backends (Annoy, NumPy flat float32, flat int8) across corpus sizes.
+For each size, builds every backend over the same random unit vectors. It
+then times queries and measures recall@k against exact search. The last
+line recommends the fastest backend whose recall stays above --min-recall,
+for use as RAG_VECTOR_BACKEND.
+
+Usage: python -m benchmarks.vector_index_bench [--sizes 100,300,1000,3000,10000] [--dimensions 1536]
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+from livekit.plugins import rag
+
+from rag.vector_index import AnnoyVectorIndex, FlatVectorIndex, QuantizedFlatVectorIndex
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _build(size, dimensions, rng, tmp):
+    vectors = rng.standard_normal((size, dimensions)).astype(np.float32)
+    items = list(zip(range(size), vectors))
+
+    start = time.perf_counter()
+    builder = rag.annoy.IndexBuilder(f=dimensions, metric="angular")
+    for i, vector in items:
+        builder.add_item(vector.tolist(), i)
+    builder.build()
+    builder.save(tmp)
+    build_ms = {"annoy": (time.perf_counter() - start) * 1000}
+
+    start = time.perf_counter()
+    flat = FlatVectorIndex.build(items)
+    flat.save(tmp)
+    build_ms["flat"] = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    QuantizedFlatVectorIndex.build(items).save(tmp)
+    build_ms["flat_int8"] = (time.perf_counter() - start) * 1000
+
+    # Load the way the agent does: Annoy mmap, flat matrices memory-mapped from .npy
+    backends = {
+        "annoy": AnnoyVectorIndex.load(tmp),
+        "flat": FlatVectorIndex.load(tmp),
+        "flat_int8": QuantizedFlatVectorIndex.load(tmp),
+    }
+    return backends, build_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,300,1000,3000,10000")
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--min-recall", type=float, default=0.95)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    recommendations = []
+    for size in (int(value) for value in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            backends, build_ms = _build(size, args.dimensions, rng, tmp)
+            queries = rng.standard_normal((args.queries, args.dimensions)).astype(np.float32)
+            exact = [{doc_id for doc_id, _ in backends["flat"].query(q, args.top_k)} for q in queries]
+
+            print(f"{size} vectors x {args.dimensions} dims, top {args.top_k}:")
+            results = {}
+            for name, index in backends.items():
+                latencies = []
+                found = 0
+                for query, truth in zip(queries, exact):
+                    vector = query.tolist() if name == "annoy" else query
+                    start = time.perf_counter()
+                    hits = index.query(vector, args.top_k)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    found += len({doc_id for doc_id, _ in hits} & truth)
+                recall = found / (args.top_k * len(queries))
+                results[name] = (_percentile(latencies, 50), recall)
+                print(f"  {name:<10} p50 {_percentile(latencies, 50):7.3f}ms  p95 {_percentile(latencies, 95):7.3f}ms  "
+                      f"recall@{args.top_k} {recall:6.1%}  build {build_ms[name]:8.1f}ms")
+            eligible = {name: latency for name, (latency, recall) in results.items() if recall >= args.min_recall}
+            best = min(eligible, key=eligible.get) if eligible else "flat"
+            recommendations.append((size, best))
+
+    print("Fastest backend with recall >= {:.0%}: {}".format(
+        args.min_recall, ", ".join(f"{size} -> {best}" for size, best in recommendations)))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ import asyncio
 import logging
 from typing import Optional
 import time
-from .db_test.db import insert_call_start, insert_call_end
+from .db_test.db import insert_call_start, insert_call_end, update_call_metadata
 
 logger = logging.getLogger("db-manager")
 
@@ -86,4 +86,9 @@ async def insert_call_start_optimized(*args, **kwargs):
 async def insert_call_end_optimized(room_name: str, status: str):
     """Optimized call end insertion with queuing"""
     await db_manager.start_workers()
-    return await db_manager.queue_operation(insert_call_end, room_name, status)
\ No newline at end of file
+    return await db_manager.queue_operation(insert_call_end, room_name, status)
+
+async def update_call_metadata_optimized(room_name: str, updates: dict):
+    """Optimized call metadata merge with queuing"""
+    await db_manager.start_workers()
+    return await db_manager.queue_operation(update_call_metadata, room_name, updates)
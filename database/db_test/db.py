@@ -489,6 +489,33 @@ def update_call_quality(room_name: str, quality_data: dict):
         logger.error(f"Failed to update call quality: {e}")
         return False
 
+def update_call_metadata(room_name: str, updates: dict):
+    """Merge keys into the call's metadata JSON using SQLAlchemy ORM with retry logic."""
+    
+    def _update_metadata():
+        from . import models
+        
+        db = SessionLocal()
+        try:
+            call = db.query(models.Call).filter(models.Call.call_id == room_name).first()
+            if not call:
+                logger.error(f"No call found with call_id '{room_name}'.")
+                return False
+            
+            # Assign a new dict so the JSON column is flagged as modified
+            call.call_metadata = {**(call.call_metadata or {}), **updates}
+            db.commit()
+            logger.info(f"Updated call metadata for room '{room_name}'.")
+            return True
+        finally:
+            db.close()
+    
+    try:
+        return execute_with_retry(_update_metadata)
+    except Exception as e:
+        logger.error(f"Failed to update call metadata: {e}")
+        return False
+
 def get_all_calls(limit: int = 100, offset: int = 0):
     """Get all calls with pagination using SQLAlchemy ORM with retry logic."""
     
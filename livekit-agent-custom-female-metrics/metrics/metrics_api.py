@@ -1,14 +1,22 @@
+import os
 import json
 import asyncio
+import importlib.util
 from typing import Dict, Any, List, Optional
 from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from .metrics_config import MetricsConfig
 from .metrics_collector import MetricsCollector
 
-app = FastAPI(title="LiveKit Agent Metrics API", version="1.0.0")
+# Opt-in fast runtime: uvloop event loop and orjson responses, each only if installed
+FAST_RUNTIME = os.environ.get("METRICS_API_FAST_RUNTIME", "false").lower() == "true"
+HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+HAS_UVLOOP = importlib.util.find_spec("uvloop") is not None
+JSONResponseClass = ORJSONResponse if FAST_RUNTIME and HAS_ORJSON else JSONResponse
+
+app = FastAPI(title="LiveKit Agent Metrics API", version="1.0.0", default_response_class=JSONResponseClass)
 
 # Add CORS middleware
 app.add_middleware(
@@ -56,7 +64,7 @@ async def get_call_metrics(call_id: str):
     
     try:
         metrics = await metrics_collector.get_call_metrics(call_id)
-        return JSONResponse(content=metrics)
+        return JSONResponseClass(content=metrics)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -68,7 +76,7 @@ async def get_call_summary(call_id: str):
     
     try:
         summary = await metrics_collector.get_call_summary(call_id)
-        return JSONResponse(content=summary)
+        return JSONResponseClass(content=summary)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -92,7 +100,7 @@ async def get_call_metrics_by_type(
         if limit:
             metrics = metrics[:limit]
         
-        return JSONResponse(content={"metrics": metrics, "count": len(metrics)})
+        return JSONResponseClass(content={"metrics": metrics, "count": len(metrics)})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -171,7 +179,7 @@ async def get_performance_analytics(
                     "p95_delay": sorted(delays)[int(len(delays) * 0.95)] if len(delays) > 1 else delays[0],
                 }
         
-        return JSONResponse(content=analytics)
+        return JSONResponseClass(content=analytics)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -232,4 +240,6 @@ if __name__ == "__main__":
     print("  - GET /metrics/analytics/performance")
     print("  - POST /metrics/test")
     
-    uvicorn.run(app, host="0.0.0.0", port=1236)
\ No newline at end of file
+    loop = "uvloop" if FAST_RUNTIME and HAS_UVLOOP else "asyncio"
+    print(f"⚡ Runtime: {loop} event loop, {'orjson' if JSONResponseClass is ORJSONResponse else 'json'} responses")
+    uvicorn.run(app, host="0.0.0.0", port=1236, loop=loop)
\ No newline at end of file
@@ -0,0 +1,299 @@
+"""
+Two-level cache for query embeddings: an in-process LRU in front of an optional
+SQLite store on disk. Entries are keyed by the normalized query text plus
+the embedding model and dimensions. A repeated question ("price?", "Price")
+therefore skips the embedding API round trip. The store survives restarts
+and is shared by every worker on the host. Frequent queries can be
+precomputed with:
+
+    python -m rag.embedding_cache queries.txt
+
+(one query per line; needs OPENAI_API_KEY and RAG_EMBED_CACHE_DB).
+"""
+
+import array
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = os.getenv("RAG_EMBEDDING_MODEL", "text-embedding-3-small")
+RAG_EMBED_CACHE_SIZE = int(os.getenv("RAG_EMBED_CACHE_SIZE", 2048))
+RAG_EMBED_CACHE_TTL_S = float(os.getenv("RAG_EMBED_CACHE_TTL_S", 30 * 24 * 3600))
+# SQLite file for the persistent level; empty disables it
+RAG_EMBED_CACHE_DB = os.getenv("RAG_EMBED_CACHE_DB", "")
+# Frequent queries (one per line) loaded into the cache at worker prewarm
+RAG_WARMUP_QUERIES_PATH = os.getenv("RAG_WARMUP_QUERIES_PATH", "")
+
+_PUNCTUATION = re.compile(r"[\s?!.,;:।॥\"'`()\[\]{}]+")
+
+
+def normalize_query(text: str) -> str:
+    """Case, Unicode form, whitespace and punctuation-insensitive form of a query"""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _PUNCTUATION.sub(" ", text).strip()
+
+
+def load_queries(path: str):
+    """Non-empty lines of a frequent-queries file"""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+class EmbeddingCache:
+    """In-process LRU over an optional SQLite store, with TTL and hit/miss counters"""
+
+    def __init__(self, model: str = EMBEDDING_MODEL, dimensions: int = 1536, max_entries: int = RAG_EMBED_CACHE_SIZE,
+                 ttl_s: float = RAG_EMBED_CACHE_TTL_S, db_path: str = RAG_EMBED_CACHE_DB):
+        """
+        max_entries: LRU capacity (the disk store is bounded only by TTL)
+        ttl_s: age after which an entry is re-embedded (0 = never expires)
+        db_path: SQLite file for the persistent level, or None/"" for memory only
+        """
+        self.model = model
+        self.dimensions = dimensions
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.db_path = db_path or None
+
+        # key -> (vector, created_at), most recently used last
+        self._memory = OrderedDict()
+        # key -> future of an embedding request already in flight
+        self._pending = {}
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._writes = set()
+
+        # Statistics
+        self.stats = {
+            "memory_hits": 0, "disk_hits": 0, "coalesced": 0, "misses": 0, "expired": 0, "evictions": 0, "errors": 0
+        }
+        self.embed_ms = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+
+        if self.db_path:
+            self._open_db()
+
+    def _open_db(self):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, model TEXT, dimensions INTEGER, query TEXT, vector BLOB, created_at REAL)"
+            )
+            if self.ttl_s:
+                self._db.execute("DELETE FROM embeddings WHERE created_at < ?", (time.time() - self.ttl_s,))
+        except sqlite3.Error as e:
+            logger.error(f"❌ Embedding cache store {self.db_path} unavailable, using memory only: {e}")
+            self._db = None
+
+    def key(self, text: str) -> str:
+        normalized = normalize_query(text)
+        return hashlib.sha1(f"{self.model}|{self.dimensions}|{normalized}".encode("utf-8")).hexdigest()
+
+    def _fresh(self, created_at):
+        return not self.ttl_s or time.time() - created_at < self.ttl_s
+
+    def _remember(self, key, vector, created_at):
+        self._memory[key] = (vector, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _disk_get(self, keys):
+        with self._db_lock:
+            placeholders = ",".join("?" * len(keys))
+            rows = self._db.execute(
+                f"SELECT key, vector, created_at FROM embeddings WHERE key IN ({placeholders})", keys
+            ).fetchall()
+        return {key: (array.array("f", blob).tolist(), created_at) for key, blob, created_at in rows}
+
+    def _disk_put(self, entries):
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, dimensions, query, vector, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(key, self.model, self.dimensions, query, array.array("f", vector).tobytes(), created_at)
+                 for key, query, vector, created_at in entries],
+            )
+
+    def _lookup_memory(self, key):
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        if not self._fresh(entry[1]):
+            del self._memory[key]
+            self.stats["expired"] += 1
+            return None
+        self._memory.move_to_end(key)
+        return entry[0]
+
+    async def _lookup_disk(self, keys):
+        """Fresh disk entries for `keys`, promoted into the LRU"""
+        if self._db is None or not keys:
+            return {}
+        try:
+            rows = await asyncio.to_thread(self._disk_get, keys)
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            logger.error(f"❌ Embedding cache read failed: {e}")
+            return {}
+        found = {}
+        for key, (vector, created_at) in rows.items():
+            if self._fresh(created_at):
+                self._remember(key, vector, created_at)
+                found[key] = vector
+            else:
+                self.stats["expired"] += 1
+        return found
+
+    def _store(self, entries):
+        """Add to the LRU now; returns the disk write to await, or None"""
+        now = time.time()
+        for key, _, vector in entries:
+            self._remember(key, vector, now)
+        if self._db is not None:
+            return self._persist([(key, query, vector, now) for key, query, vector in entries])
+        return None
+
+    async def _persist(self, rows):
+        try:
+            await asyncio.to_thread(self._disk_put, rows)
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            logger.error(f"❌ Embedding cache write failed: {e}")
+
+    async def _embed(self, queries, embed_fn):
+        start = time.perf_counter()
+        vectors = await embed_fn(queries)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.embed_ms["count"] += 1
+        self.embed_ms["total_ms"] += elapsed_ms
+        self.embed_ms["max_ms"] = max(self.embed_ms["max_ms"], elapsed_ms)
+        return vectors
+
+    async def _fetch(self, key, query, embed_fn):
+        """Disk lookup, then the embedding API; runs as its own task so no single caller owns it"""
+        vector = (await self._lookup_disk([key])).get(key)
+        if vector is not None:
+            self.stats["disk_hits"] += 1
+            return vector
+        self.stats["misses"] += 1
+        vector = (await self._embed([query], embed_fn))[0]
+        # The disk write happens after the caller has its vector
+        persist = self._store([(key, query, vector)])
+        if persist is not None:
+            write = asyncio.create_task(persist)
+            self._writes.add(write)
+            write.add_done_callback(self._writes.discard)
+        return vector
+
+    def _fetch_done(self, key, task):
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        # Every caller may have been cancelled; don't leave an unretrieved exception behind
+        if not task.cancelled():
+            task.exception()
+
+    async def get(self, query: str, embed_fn):
+        """
+        Embedding for one query, from the cache or `embed_fn` (async, list of texts -> list of vectors).
+        Concurrent misses for the same query share one request; cancelling one caller doesn't fail the others.
+        """
+        key = self.key(query)
+        vector = self._lookup_memory(key)
+        if vector is not None:
+            self.stats["memory_hits"] += 1
+            return vector
+
+        task = self._pending.get(key)
+        coalesced = task is not None
+        if not coalesced:
+            task = self._pending[key] = asyncio.create_task(self._fetch(key, query, embed_fn))
+            task.add_done_callback(lambda done: self._fetch_done(key, done))
+        vector = await asyncio.shield(task)
+        if coalesced:
+            # Counted once the shared request has succeeded, so failures never show up as hits
+            self.stats["coalesced"] += 1
+        return vector
+
+    async def warm_up(self, queries, embed_fn, batch_size: int = 64):
+        """Make sure every query is cached: load from disk, embed the rest in batches. Returns the number embedded."""
+        keyed = {}
+        for query in queries:
+            keyed.setdefault(self.key(query), query)
+        missing = [key for key in keyed if self._lookup_memory(key) is None]
+        for start in range(0, len(missing), 500):
+            found = await self._lookup_disk(missing[start:start + 500])
+            missing = [key for key in missing if key not in found]
+
+        embedded = 0
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            vectors = await self._embed([keyed[key] for key in batch], embed_fn)
+            persist = self._store([(key, keyed[key], vector) for key, vector in zip(batch, vectors)])
+            if persist is not None:
+                await persist
+            embedded += len(batch)
+        logger.info(f"🔥 Embedding cache warm-up: {len(keyed)} queries, {embedded} embedded, "
+                    f"{len(keyed) - embedded} already cached")
+        return embedded
+
+    def get_stats(self):
+        """Hit/miss counters, hit rate and embedding-request latency"""
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["coalesced"]
+        lookups = hits + self.stats["misses"]
+        count = self.embed_ms["count"]
+        return {
+            **self.stats,
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+            "memory_entries": len(self._memory),
+            "persistent": self._db is not None,
+            "embed_requests": count,
+            "embed_avg_ms": round(self.embed_ms["total_ms"] / count, 1) if count else None,
+            "embed_max_ms": round(self.embed_ms["max_ms"], 1),
+        }
+
+    def close(self):
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+
+
+async def _precompute(path):
+    import aiohttp
+    from livekit.plugins import openai
+    from rag.warm_up_rag import embeddings_dimension
+
+    async with aiohttp.ClientSession() as http_session:
+        async def embed(texts):
+            results = await openai.create_embeddings(
+                input=texts, model=EMBEDDING_MODEL, dimensions=embeddings_dimension, http_session=http_session
+            )
+            return [result.embedding for result in results]
+
+        cache = EmbeddingCache(dimensions=embeddings_dimension)
+        if cache._db is None:
+            raise SystemExit("Set RAG_EMBED_CACHE_DB to the cache file the agent workers use")
+        await cache.warm_up(load_queries(path), embed)
+        print(cache.get_stats())
+        cache.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_precompute(sys.argv[1] if len(sys.argv) > 1 else RAG_WARMUP_QUERIES_PATH))
@@ -0,0 +1,238 @@
+"""
+Local BM25 index over the knowledge-base paragraphs, so lookups can run with
+no embedding API call. The knowledge bases are written in English, but
+callers ask in Hindi, Hinglish or English. The tokenizer therefore maps all
+three onto one form:
+- Devanagari is transliterated to Latin.
+- Latin tokens are reduced to a rough phonetic key (so "क्लिनिक", "clinik"
+  and "clinic" all become "klinik").
+- Common Hindi/Hinglish words are mapped to the English terms the
+  knowledge base uses ("कीमत"/"keemat" -> price). The map can be extended
+  with RAG_LEXICAL_SYNONYMS_PATH (JSON: {"word": "english term", ...}).
+"""
+
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import unicodedata
+from collections import Counter, OrderedDict
+
+logger = logging.getLogger(__name__)
+
+RAG_LEXICAL_SYNONYMS_PATH = os.getenv("RAG_LEXICAL_SYNONYMS_PATH", "")
+# Words whose terms are memoised; callers' queries bring an open-ended vocabulary, so this is bounded
+RAG_LEXICAL_CACHE_SIZE = int(os.getenv("RAG_LEXICAL_CACHE_SIZE", 50000))
+
+_CONSONANTS = {
+    "क": "k", "ख": "kh", "ग": "g", "घ": "gh", "ङ": "n", "च": "ch", "छ": "chh", "ज": "j", "झ": "jh", "ञ": "n",
+    "ट": "t", "ठ": "th", "ड": "d", "ढ": "dh", "ण": "n", "त": "t", "थ": "th", "द": "d", "ध": "dh", "न": "n",
+    "प": "p", "फ": "ph", "ब": "b", "भ": "bh", "म": "m", "य": "y", "र": "r", "ल": "l", "व": "v", "श": "sh",
+    "ष": "sh", "स": "s", "ह": "h", "क़": "k", "ख़": "kh", "ग़": "g", "ज़": "z", "ड़": "r", "ढ़": "rh", "फ़": "f",
+    "य़": "y",
+}
+_VOWELS = {
+    "अ": "a", "आ": "aa", "इ": "i", "ई": "ii", "उ": "u", "ऊ": "uu", "ऋ": "ri", "ए": "e", "ऐ": "ai", "ओ": "o",
+    "औ": "au", "ऑ": "o", "ऍ": "e",
+}
+_MATRAS = {
+    "ा": "aa", "ि": "i", "ी": "ii", "ु": "u", "ू": "uu", "ृ": "ri", "े": "e", "ै": "ai", "ो": "o", "ौ": "au",
+    "ॉ": "o", "ॅ": "e",
+}
+_NASALS = {"ं": "n", "ँ": "n", "ः": "h"}
+_VIRAMA = "्"
+_NUKTA = "़"
+
+# Latin spelling variants -> one key; applied in order
+_PHONETIC_RULES = [
+    (re.compile(r"ph"), "f"), (re.compile(r"ck"), "k"), (re.compile(r"c(?=[eiy])"), "s"), (re.compile(r"c"), "k"),
+    (re.compile(r"q"), "k"), (re.compile(r"x"), "ks"), (re.compile(r"w"), "v"), (re.compile(r"z"), "j"),
+    (re.compile(r"ee|ii"), "i"), (re.compile(r"oo|uu"), "u"), (re.compile(r"y$"), "i"),
+    (re.compile(r"([kgtdbcsj])h"), r"\1"), (re.compile(r"(.)\1+"), r"\1"),
+]
+
+_TOKEN = re.compile(r"[0-9a-zऀ-ॣ०-ॿ]+")
+
+_STOPWORDS = {
+    # English
+    "a", "an", "the", "is", "are", "was", "be", "to", "of", "in", "on", "for", "and", "or", "it", "this", "that",
+    "i", "you", "me", "my", "we", "our", "your", "do", "does", "can", "will", "what", "which", "with", "at", "by",
+    "any", "if", "so", "as", "from", "about", "please", "tell",
+    # Hinglish
+    "hai", "hain", "ka", "ki", "ke", "ko", "se", "me", "mein", "main", "mai", "kya", "ye", "yeh", "vo", "woh",
+    "aur", "bhi", "to", "toh", "ho", "hu", "hoon", "tha", "thi", "par", "pe", "aap", "ap", "mujhe", "muje",
+    "hum", "ji", "na", "nahi", "batao", "bataiye", "bata", "sakte", "sakta", "kar", "karo", "kare", "raha",
+    # Hindi
+    "है", "हैं", "का", "की", "के", "को", "से", "में", "मैं", "क्या", "यह", "ये", "वो", "वह", "और", "भी", "तो",
+    "हो", "हूँ", "हूं", "था", "थी", "पर", "आप", "मुझे", "हम", "जी", "ना", "नहीं", "बताओ", "बताइए", "बता",
+    "सकते", "सकता", "कर", "करो", "करें", "रहा",
+}
+
+# Hindi/Hinglish -> the English terms the knowledge bases use
+_SYNONYMS = {
+    "कीमत": "price", "keemat": "price", "kimat": "price", "दाम": "price", "daam": "price", "dam": "price",
+    "कितना": "price", "kitna": "price", "kitne": "price", "कितने": "price", "प्राइस": "price", "rate": "price",
+    "cost": "price", "charges": "price", "charge": "price", "paisa": "price", "paise": "price", "पैसे": "price",
+    "छूट": "discount", "chhoot": "discount", "chhut": "discount", "डिस्काउंट": "discount",
+    "बीमा": "insurance", "bima": "insurance", "beema": "insurance", "इंश्योरेंस": "insurance",
+    "गारंटी": "warranty", "guarantee": "warranty", "gaurantee": "warranty",
+    "पता": "location", "pata": "location", "कहाँ": "location", "कहां": "location", "kahan": "location",
+    "kaha": "location", "जगह": "location", "jagah": "location", "address": "location", "एड्रेस": "location",
+    "घर": "home", "ghar": "home", "मुफ्त": "free", "muft": "free", "फ्री": "free",
+    "मशीन": "hearing aid", "machine": "hearing aid", "सुनने": "hearing", "sunne": "hearing",
+    "बुकिंग": "appointment", "booking": "appointment", "book": "appointment", "अपॉइंटमेंट": "appointment",
+    "बैटरी": "battery", "डॉक्टर": "doctor", "ट्रायल": "trial", "टेस्ट": "test", "जांच": "test", "janch": "test",
+    "शहर": "city", "shahar": "city", "समय": "time", "samay": "time", "टाइम": "time",
+}
+
+
+def transliterate(token: str) -> str:
+    """Devanagari word -> rough Latin spelling (schwa dropped at the end of the word)"""
+    out = []
+    chars = list(token)
+    i = 0
+    while i < len(chars):
+        char = chars[i]
+        if i + 1 < len(chars) and chars[i + 1] == _NUKTA:
+            char += _NUKTA
+            i += 1
+        if char in _CONSONANTS:
+            out.append(_CONSONANTS[char])
+            following = chars[i + 1] if i + 1 < len(chars) else ""
+            # Inherent vowel unless a matra or virama follows, or the word ends
+            if following not in _MATRAS and following != _VIRAMA and following:
+                out.append("a")
+        elif char in _MATRAS:
+            out.append(_MATRAS[char])
+        elif char in _VOWELS:
+            out.append(_VOWELS[char])
+        elif char in _NASALS:
+            out.append(_NASALS[char])
+        elif char.isascii():
+            out.append(char)
+        i += 1
+    return "".join(out)
+
+
+def phonetic_key(word: str) -> str:
+    """Collapse Latin spelling variants (keemat/kimat, clinic/klinik, warranty/varanti, home/hom)"""
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    for pattern, replacement in _PHONETIC_RULES:
+        word = pattern.sub(replacement, word)
+    # Silent final e (home/होम -> hom)
+    if len(word) > 3 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+
+def _raw_tokens(text: str):
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _TOKEN.findall(text)
+
+
+class Tokenizer:
+    """Hindi/Hinglish/English text -> index terms"""
+
+    def __init__(self, synonyms=None, cache_size: int = RAG_LEXICAL_CACHE_SIZE):
+        """cache_size: words whose terms are kept; the least recently used is dropped beyond that"""
+        self.synonyms = dict(_SYNONYMS)
+        self.synonyms.update(synonyms or {})
+        self.cache_size = cache_size
+        # word -> terms, most recently used last
+        self._cache = OrderedDict()
+
+    @classmethod
+    def from_env(cls):
+        synonyms = {}
+        if RAG_LEXICAL_SYNONYMS_PATH:
+            try:
+                with open(RAG_LEXICAL_SYNONYMS_PATH, encoding="utf-8") as f:
+                    synonyms = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.error(f"❌ Could not load lexical synonyms from {RAG_LEXICAL_SYNONYMS_PATH}: {e}")
+        return cls(synonyms)
+
+    def _terms(self, word):
+        terms = self._cache.get(word)
+        if terms is not None:
+            self._cache.move_to_end(word)
+        else:
+            expanded = self.synonyms.get(word)
+            words = _raw_tokens(expanded) if expanded else [word]
+            terms = []
+            for part in words:
+                if part in _STOPWORDS:
+                    continue
+                latin = part if part.isascii() else transliterate(part)
+                if latin:
+                    terms.append(phonetic_key(latin))
+            self._cache[word] = terms
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return terms
+
+    def __call__(self, text: str):
+        terms = []
+        for word in _raw_tokens(text):
+            terms.extend(self._terms(word))
+        return terms
+
+
+class LexicalIndex:
+    """Okapi BM25 over an in-memory inverted index"""
+
+    def __init__(self, documents: dict, tokenizer: Tokenizer = None, k1: float = 1.5, b: float = 0.75):
+        """documents: {doc_id: text}, e.g. warm_up_rag's paragraphs_by_uuid"""
+        self.tokenizer = tokenizer or Tokenizer.from_env()
+        self.doc_ids = list(documents)
+        self.k1 = k1
+        self.b = b
+
+        lengths = []
+        # term -> [(doc index, term frequency)]
+        postings = {}
+        for index, doc_id in enumerate(self.doc_ids):
+            terms = self.tokenizer(documents[doc_id])
+            lengths.append(len(terms))
+            for term, count in Counter(terms).items():
+                postings.setdefault(term, []).append((index, count))
+
+        count = len(self.doc_ids)
+        average = sum(lengths) / count if count else 0.0
+        # Length normalisation per document, folded once here instead of per query
+        self._norms = [k1 * (1 - b + b * length / average) if average else k1 for length in lengths]
+        self._postings = {}
+        for term, entries in postings.items():
+            idf = math.log(1 + (count - len(entries) + 0.5) / (len(entries) + 0.5))
+            self._postings[term] = (idf, entries)
+
+    @property
+    def size(self) -> int:
+        return len(self.doc_ids)
+
+    def query(self, text: str, n: int = 5):
+        """[(doc_id, score)] for the top `n` documents with any matching term, best first"""
+        scores = {}
+        norms = self._norms
+        k1 = self.k1
+        for term in set(self.tokenizer(text)):
+            entry = self._postings.get(term)
+            if entry is None:
+                continue
+            idf, entries = entry
+            for index, tf in entries:
+                scores[index] = scores.get(index, 0.0) + idf * tf * (k1 + 1) / (tf + norms[index])
+        best = heapq.nlargest(n, scores.items(), key=lambda item: item[1])
+        return [(self.doc_ids[index], score) for index, score in best]
+
+
+def reciprocal_rank_fusion(rankings, n: int = 5, k: int = 60):
+    """Merge ranked id lists: score = sum of 1 / (k + rank) over the lists each id appears in"""
+    scores = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return [doc_id for doc_id, _ in heapq.nlargest(n, scores.items(), key=lambda item: item[1])]
@@ -0,0 +1,325 @@
+"""
+Pluggable nearest-neighbour backends for the knowledge-base embeddings.
+- annoy: the livekit-plugins-rag Annoy index (approximate trees). This is
+  the original backend.
+- flat: exact cosine search, one matrix-vector product over a float32
+  matrix memory-mapped from `flat_vectors.npy`. Row norms are precomputed
+  in `flat_norms.npy`.
+- flat_int8: the same search over an int8 copy of the matrix, with one
+  scale per row. It uses a quarter of the memory, for corpora where the
+  float32 matrix would be too large; it is not faster.
+
+For a few hundred paragraphs the flat scan is exact and needs no tree build.
+benchmarks/vector_index_bench.py shows which backend is fastest at a given
+corpus size. When the flat files are missing, the flat backends are built in
+memory from the Annoy index. They are written to disk by warm_up_rag or by:
+
+    python -m rag.vector_index <index_path>
+
+Running agents memory-map these files, so they are never rewritten in place.
+Each build goes into a new version directory under the index path
+(`v-<time_ns>-<pid>`), and the one-line `CURRENT` file is then switched to it
+with a single `os.replace`. A reader sees either the old or the new set of
+files, never a mix. Older versions are deleted; on Linux a mapping of a deleted
+file stays valid. An index path without `CURRENT` (the original layout) is read
+directly.
+"""
+
+import os
+import pickle
+import shutil
+import sys
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+FLAT_VECTORS_FILE = "flat_vectors.npy"
+FLAT_NORMS_FILE = "flat_norms.npy"
+FLAT_IDS_FILE = "flat_ids.pkl"
+FLAT_INT8_FILE = "flat_vectors_int8.npy"
+FLAT_SCALES_FILE = "flat_scales.npy"
+CURRENT_FILE = "CURRENT"
+VERSION_PREFIX = "v-"
+
+
+def _atomic_write(path: str, write):
+    """Call `write(file)` on a temp file next to `path`, then move it over `path` in one step"""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _save_array(path: str, array):
+    _atomic_write(path, lambda f: np.save(f, array))
+
+
+def _save_pickle(path: str, value):
+    _atomic_write(path, lambda f: pickle.dump(value, f))
+
+
+def resolve_index_dir(path: str) -> str:
+    """Directory holding the live index files: the version named in `path/CURRENT`, else `path` itself"""
+    try:
+        with open(os.path.join(path, CURRENT_FILE), encoding="utf-8") as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return path
+    return os.path.join(path, version)
+
+
+def new_index_version(path: str) -> str:
+    """Empty, unpublished version directory under `path` to write a complete index into"""
+    version_dir = os.path.join(path, f"{VERSION_PREFIX}{time.time_ns()}-{os.getpid()}")
+    os.makedirs(version_dir)
+    return version_dir
+
+
+def publish_index_version(path: str, version_dir: str, keep: int = 2):
+    """
+    Switch `path/CURRENT` to `version_dir` in one rename, then delete all but the newest `keep`
+    versions (the previous one stays for readers that resolved CURRENT just before the switch).
+    """
+    version = os.path.basename(version_dir)
+    _atomic_write(os.path.join(path, CURRENT_FILE), lambda f: f.write(version.encode("utf-8")))
+    versions = sorted(
+        (name for name in os.listdir(path) if name.startswith(VERSION_PREFIX) and name != version),
+        key=lambda name: int(name[len(VERSION_PREFIX):].split("-")[0]),
+    )
+    for name in versions[:max(0, len(versions) - (keep - 1))]:
+        shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+
+class VectorIndex(ABC):
+    """Interface: nearest paragraphs to a query embedding"""
+
+    name = "base"
+
+    @classmethod
+    @abstractmethod
+    def file_names(cls):
+        """Files under the index directory that make up this backend"""
+
+    @classmethod
+    @abstractmethod
+    def load(cls, path: str) -> "VectorIndex":
+        """Open the backend's files under `path`"""
+
+    @property
+    @abstractmethod
+    def size(self) -> int:
+        """Number of indexed vectors"""
+
+    @abstractmethod
+    def ids(self):
+        """Paragraph ids (userdata) of every indexed vector"""
+
+    @abstractmethod
+    def query(self, vector, n: int = 5):
+        """[(paragraph id, cosine similarity)] for the `n` nearest vectors, best first"""
+
+
+class AnnoyVectorIndex(VectorIndex):
+    """Approximate search over the Annoy index written by rag/warm_up_rag.py"""
+
+    name = "annoy"
+
+    def __init__(self, index):
+        self._index = index
+
+    @classmethod
+    def load(cls, path: str) -> "AnnoyVectorIndex":
+        from livekit.plugins import rag as livekit_rag
+
+        return cls(livekit_rag.annoy.AnnoyIndex.load(path))
+
+    @classmethod
+    def file_names(cls):
+        from livekit.plugins import rag as livekit_rag
+
+        return (livekit_rag.annoy.ANNOY_FILE, livekit_rag.annoy.METADATA_FILE)
+
+    @property
+    def size(self) -> int:
+        return self._index.size
+
+    def items(self):
+        """(paragraph id, vector) for every item, e.g. to build a flat index"""
+        for item in self._index.items():
+            yield item.userdata, item.vector
+
+    def ids(self):
+        return [userdata for userdata, _ in self.items()]
+
+    def query(self, vector, n: int = 5):
+        # Annoy's angular distance is sqrt(2 - 2 cos)
+        return [(res.userdata, 1.0 - res.distance * res.distance / 2) for res in self._index.query(vector, n=n)]
+
+
+class FlatVectorIndex(VectorIndex):
+    """Exact cosine search: one matrix-vector product over all paragraphs"""
+
+    name = "flat"
+
+    def __init__(self, matrix, norms, ids):
+        self.matrix = matrix
+        self.norms = norms
+        self._ids = list(ids)
+
+    @classmethod
+    def build(cls, items):
+        """From (paragraph id, vector) pairs"""
+        ids, vectors = zip(*items)
+        matrix = np.asarray(vectors, dtype=np.float32)
+        return cls(matrix, np.linalg.norm(matrix, axis=1).astype(np.float32), ids)
+
+    @classmethod
+    def file_names(cls):
+        return (FLAT_VECTORS_FILE, FLAT_NORMS_FILE, FLAT_IDS_FILE)
+
+    @classmethod
+    def load(cls, path: str) -> "FlatVectorIndex":
+        with open(os.path.join(path, FLAT_IDS_FILE), "rb") as f:
+            ids = pickle.load(f)
+        matrix = np.load(os.path.join(path, FLAT_VECTORS_FILE), mmap_mode="r")
+        norms = np.load(os.path.join(path, FLAT_NORMS_FILE))
+        return cls(matrix, norms, ids)
+
+    def save(self, path: str):
+        """Write the files into `path`, each replaced atomically; use a new version directory for a consistent set"""
+        os.makedirs(path, exist_ok=True)
+        _save_array(os.path.join(path, FLAT_VECTORS_FILE), np.asarray(self.matrix, dtype=np.float32))
+        _save_array(os.path.join(path, FLAT_NORMS_FILE), self.norms)
+        _save_pickle(os.path.join(path, FLAT_IDS_FILE), self._ids)
+
+    @property
+    def size(self) -> int:
+        return len(self._ids)
+
+    def ids(self):
+        return list(self._ids)
+
+    def _scores(self, query):
+        return self.matrix @ query
+
+    def query(self, vector, n: int = 5):
+        query = np.asarray(vector, dtype=np.float32)
+        query_norm = float(np.linalg.norm(query)) or 1.0
+        scores = self._scores(query) / (self.norms * query_norm)
+        n = min(n, len(self._ids))
+        if n <= 0:
+            return []
+        if n < len(self._ids):
+            top = np.argpartition(-scores, n - 1)[:n]
+            top = top[np.argsort(-scores[top])]
+        else:
+            top = np.argsort(-scores)
+        return [(self._ids[i], float(scores[i])) for i in top]
+
+
+class QuantizedFlatVectorIndex(FlatVectorIndex):
+    """
+    Flat search over int8 rows (one float32 scale per row): a quarter of the memory.
+    NumPy has no int8 matrix-vector kernel, so each query widens the rows and is slower than float32.
+    """
+
+    name = "flat_int8"
+
+    def __init__(self, matrix, scales, norms, ids):
+        super().__init__(matrix, norms, ids)
+        self.scales = scales
+
+    @classmethod
+    def build(cls, items):
+        flat = FlatVectorIndex.build(items)
+        return cls.quantize(flat.matrix, flat.ids())
+
+    @classmethod
+    def quantize(cls, matrix, ids):
+        matrix = np.asarray(matrix, dtype=np.float32)
+        scales = (np.abs(matrix).max(axis=1) / 127.0).astype(np.float32)
+        scales[scales == 0] = 1.0
+        quantized = np.round(matrix / scales[:, None]).astype(np.int8)
+        # Norms of the dequantized rows, so cosine stays consistent with what is scored
+        norms = (np.linalg.norm(quantized.astype(np.float32), axis=1) * scales).astype(np.float32)
+        return cls(quantized, scales, norms, ids)
+
+    @classmethod
+    def file_names(cls):
+        return (FLAT_INT8_FILE, FLAT_SCALES_FILE, FLAT_NORMS_FILE, FLAT_IDS_FILE)
+
+    @classmethod
+    def load(cls, path: str) -> "QuantizedFlatVectorIndex":
+        with open(os.path.join(path, FLAT_IDS_FILE), "rb") as f:
+            ids = pickle.load(f)
+        matrix = np.load(os.path.join(path, FLAT_INT8_FILE), mmap_mode="r")
+        scales = np.load(os.path.join(path, FLAT_SCALES_FILE))
+        # flat_norms.npy holds the float32 norms; recompute for the quantized rows
+        norms = (np.linalg.norm(np.asarray(matrix, dtype=np.float32), axis=1) * scales).astype(np.float32)
+        return cls(matrix, scales, norms, ids)
+
+    def save(self, path: str):
+        """Write the files into `path`, each replaced atomically; use a new version directory for a consistent set"""
+        os.makedirs(path, exist_ok=True)
+        _save_array(os.path.join(path, FLAT_INT8_FILE), np.asarray(self.matrix, dtype=np.int8))
+        _save_array(os.path.join(path, FLAT_SCALES_FILE), self.scales)
+        _save_pickle(os.path.join(path, FLAT_IDS_FILE), self._ids)
+
+    def _scores(self, query):
+        # Per-row scale applied after the product: (int8_row . q) * scale
+        return (self.matrix @ query) * self.scales
+
+
+VECTOR_BACKENDS = {
+    AnnoyVectorIndex.name: AnnoyVectorIndex,
+    FlatVectorIndex.name: FlatVectorIndex,
+    QuantizedFlatVectorIndex.name: QuantizedFlatVectorIndex,
+}
+
+
+def backend_files(backend: str, path: str):
+    """Paths whose change means the index must be reloaded (under the current version directory)"""
+    path = resolve_index_dir(path)
+    files = AnnoyVectorIndex.file_names()
+    if backend != AnnoyVectorIndex.name:
+        files += VECTOR_BACKENDS[backend].file_names()
+    return [os.path.join(path, name) for name in files if os.path.exists(os.path.join(path, name))]
+
+
+def load_vector_index(backend: str, path: str) -> VectorIndex:
+    """Load the `backend` index from `path`, building flat ones from the Annoy index when their files are missing"""
+    if backend not in VECTOR_BACKENDS:
+        raise ValueError(f"Unknown vector backend {backend!r}; expected one of {', '.join(VECTOR_BACKENDS)}")
+    index_class = VECTOR_BACKENDS[backend]
+    path = resolve_index_dir(path)
+    if index_class is AnnoyVectorIndex:
+        return AnnoyVectorIndex.load(path)
+    if all(os.path.exists(os.path.join(path, name)) for name in index_class.file_names()):
+        return index_class.load(path)
+    return index_class.build(list(AnnoyVectorIndex.load(path).items()))
+
+
+def export_flat(path: str):
+    """Publish a new version of the index at `path` with flat and int8 files next to its Annoy index"""
+    current_dir = resolve_index_dir(path)
+    items = list(AnnoyVectorIndex.load(current_dir).items())
+    version_dir = new_index_version(path)
+    for name in AnnoyVectorIndex.file_names():
+        # Copied, not linked: a pre-versioning builder would still rewrite the originals in place
+        shutil.copy2(os.path.join(current_dir, name), os.path.join(version_dir, name))
+    flat = FlatVectorIndex.build(items)
+    flat.save(version_dir)
+    QuantizedFlatVectorIndex.quantize(flat.matrix, flat.ids()).save(version_dir)
+    publish_index_version(path, version_dir)
+    return flat.size
+
+
+if __name__ == "__main__":
+    index_path = sys.argv[1] if len(sys.argv) > 1 else os.getenv("VECTOR_INDEX_PATH", "/app/rag/vdb_data")
+    print(f"Wrote flat indexes for {export_flat(index_path)} vectors to {index_path}")
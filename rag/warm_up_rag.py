@@ -1,5 +1,10 @@
+import argparse
 import asyncio
+import hashlib
+import json
+import os
 import pickle
+import time
 import uuid
 
 import aiohttp
@@ -7,54 +12,178 @@ from dotenv import load_dotenv
 from livekit.agents import tokenize
 from livekit.plugins import openai, rag
 from tqdm import tqdm
-import os
 
 load_dotenv(dotenv_path="/app/.env.local")
 load_dotenv()
 
 file_name = os.getenv("VECTOR_FILE_NAME", "knowledge-base-earkart")
 embeddings_dimension = int(os.getenv("EMBEDDINGS_DIMENSION", 1536))
+# One knowledge-base file, or several separated by commas
 raw_data_path = os.getenv("VECTOR_RAW_DATA_PATH", f"/app/rag/rag_knowledge_base/{file_name}.txt")
 index_path = os.getenv("VECTOR_INDEX_PATH", "/app/rag/vdb_data")
 pkl_path = os.getenv("VECTOR_DATA_PKL_PATH", f"/app/rag/rag_knowledge_base/{file_name}.pkl")
-raw_data = open(raw_data_path, "r", encoding="utf-8").read()
+embedding_model = os.getenv("RAG_EMBEDDING_MODEL", "text-embedding-3-small")
+# Paragraphs per embeddings request, and requests in flight at once
+embed_batch_size = int(os.getenv("RAG_BUILD_BATCH_SIZE", 64))
+embed_concurrency = int(os.getenv("RAG_BUILD_CONCURRENCY", 4))
+embed_max_attempts = int(os.getenv("RAG_BUILD_MAX_ATTEMPTS", 5))
+# Model and dimensions the vectors were built with, saved next to the index files
+BUILD_INFO_FILE = "build_info.json"
 
 # from this blog https://openai.com/index/new-embedding-models-and-api-updates/
 # 512 seems to provide good MTEB score with text-embedding-3-small
 
-async def _create_embeddings(
-    input: str, http_session: aiohttp.ClientSession
-) -> openai.EmbeddingData:
-    results = await openai.create_embeddings(
-        input=[input],
-        model="text-embedding-3-small",
-        dimensions=embeddings_dimension,
-        http_session=http_session,
-    )
-    return results[0]
-
-
-async def main() -> None:
-    async with aiohttp.ClientSession() as http_session:
-        idx_builder = rag.annoy.IndexBuilder(f=embeddings_dimension, metric="angular")
-
-        paragraphs_by_uuid = {}
+
+def paragraph_id(paragraph: str) -> uuid.UUID:
+    """Deterministic id from the paragraph's content, so rebuilds keep ids for unchanged text"""
+    return uuid.UUID(hashlib.sha256(paragraph.encode("utf-8")).hexdigest()[:32])
+
+
+def read_paragraphs(paths):
+    """Paragraphs of every knowledge-base file, de-duplicated by content, in file order"""
+    paragraphs_by_uuid = {}
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            raw_data = f.read()
         for p in tokenize.basic.tokenize_paragraphs(raw_data):
-            p_uuid = uuid.uuid4()
-            paragraphs_by_uuid[p_uuid] = p
+            paragraphs_by_uuid.setdefault(paragraph_id(p), p)
+    return paragraphs_by_uuid
+
+
+def build_info():
+    return {"model": embedding_model, "dimensions": embeddings_dimension}
+
+
+def load_previous_vectors():
+    """{paragraph id: vector} from the index currently on disk, for paragraphs whose text is unchanged"""
+    from rag.vector_index import load_vector_index, resolve_index_dir
+
+    try:
+        with open(os.path.join(resolve_index_dir(index_path), BUILD_INFO_FILE), encoding="utf-8") as f:
+            previous_info = json.load(f)
+        with open(pkl_path, "rb") as f:
+            previous_paragraphs = pickle.load(f)
+        previous_index = load_vector_index("flat", index_path)
+    except Exception as e:
+        print(f"No previous index to reuse ({e}); embedding everything.")
+        return {}
+    # Same dimensions is not enough: vectors from another model are not comparable with its queries
+    if previous_info != build_info() or previous_index.matrix.shape[1] != embeddings_dimension:
+        print(f"Previous index was built with {previous_info}, not {build_info()}; embedding everything.")
+        return {}
+
+    return {
+        p_uuid: previous_index.matrix[row].tolist()
+        for row, p_uuid in enumerate(previous_index.ids())
+        if p_uuid in previous_paragraphs
+    }
+
+
+async def _create_embeddings(
+    inputs: list, http_session: aiohttp.ClientSession
+) -> list:
+    """One batched embeddings request, retried with exponential backoff"""
+    for attempt in range(1, embed_max_attempts + 1):
+        try:
+            results = await openai.create_embeddings(
+                input=inputs,
+                model=embedding_model,
+                dimensions=embeddings_dimension,
+                http_session=http_session,
+            )
+            return [result.embedding for result in sorted(results, key=lambda result: result.index)]
+        except Exception as e:
+            if attempt == embed_max_attempts:
+                raise
+            delay = 2 ** (attempt - 1)
+            print(f"Embedding batch of {len(inputs)} failed ({e}); retry {attempt}/{embed_max_attempts - 1} in {delay}s")
+            await asyncio.sleep(delay)
+
+
+async def embed_paragraphs(paragraphs_by_uuid: dict, http_session: aiohttp.ClientSession) -> dict:
+    """{paragraph id: vector}, batched requests with bounded concurrency"""
+    ids = list(paragraphs_by_uuid)
+    batches = [ids[i:i + embed_batch_size] for i in range(0, len(ids), embed_batch_size)]
+    semaphore = asyncio.Semaphore(embed_concurrency)
+    vectors = {}
+
+    with tqdm(total=len(ids), unit="paragraph") as progress:
+        async def embed_batch(batch):
+            async with semaphore:
+                embeddings = await _create_embeddings([paragraphs_by_uuid[p_uuid] for p_uuid in batch], http_session)
+            vectors.update(zip(batch, embeddings))
+            progress.update(len(batch))
+
+        await asyncio.gather(*(embed_batch(batch) for batch in batches))
+    return vectors
+
+
+def save_index(paragraphs_by_uuid: dict, vectors: dict):
+    """
+    Annoy index, flat NumPy indexes and build info go into a new version directory, published in one
+    step after the paragraph store: running agents memory-map the files, so none is rewritten in place.
+    """
+    from rag.vector_index import FlatVectorIndex, QuantizedFlatVectorIndex, new_index_version, publish_index_version
+
+    version_dir = new_index_version(index_path)
+    idx_builder = rag.annoy.IndexBuilder(f=embeddings_dimension, metric="angular")
+    items = [(p_uuid, vectors[p_uuid]) for p_uuid in paragraphs_by_uuid]
+    for p_uuid, vector in items:
+        idx_builder.add_item(vector, p_uuid)
+    idx_builder.build()
+    idx_builder.save(version_dir)
+
+    flat = FlatVectorIndex.build(items)
+    flat.save(version_dir)
+    QuantizedFlatVectorIndex.quantize(flat.matrix, flat.ids()).save(version_dir)
+    with open(os.path.join(version_dir, BUILD_INFO_FILE), "w", encoding="utf-8") as f:
+        json.dump(build_info(), f)
+
+    # save data with pickle (atomically, and before publishing the index, so no reader pairs the new
+    # index with the old store; RagService rejects the old index if its paragraphs are gone from the new one)
+    tmp_path = f"{pkl_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(paragraphs_by_uuid, f)
+    os.replace(tmp_path, pkl_path)
+
+    publish_index_version(index_path, version_dir)
+
+
+async def main(paths=None, reuse=True) -> None:
+    paths = paths or [path.strip() for path in raw_data_path.split(",") if path.strip()]
+    start = time.perf_counter()
+    paragraphs_by_uuid = read_paragraphs(paths)
+    if not paragraphs_by_uuid:
+        # Nothing to index: stop before a version directory is created or the current index is replaced
+        raise ValueError(f"No paragraphs found in {', '.join(paths)}; refusing to build an empty index")
+
+    previous = load_previous_vectors() if reuse else {}
+    vectors = {p_uuid: previous[p_uuid] for p_uuid in paragraphs_by_uuid if p_uuid in previous}
+    to_embed = {p_uuid: p for p_uuid, p in paragraphs_by_uuid.items() if p_uuid not in vectors}
 
-        for p_uuid, paragraph in tqdm(paragraphs_by_uuid.items()):
-            resp = await _create_embeddings(paragraph, http_session)
-            idx_builder.add_item(resp.embedding, p_uuid)
+    embed_start = time.perf_counter()
+    if to_embed:
+        async with aiohttp.ClientSession() as http_session:
+            vectors.update(await embed_paragraphs(to_embed, http_session))
+    embed_s = time.perf_counter() - embed_start
 
-        idx_builder.build()
-        idx_builder.save(index_path)
-        print("saved index in VDB.")
+    save_index(paragraphs_by_uuid, vectors)
+    print("saved index in VDB.")
 
-        # save data with pickle
-        with open(pkl_path, "wb") as f:
-            pickle.dump(paragraphs_by_uuid, f)
+    total_s = time.perf_counter() - start
+    requests = -(-len(to_embed) // embed_batch_size)
+    print(f"{len(paths)} files, {len(paragraphs_by_uuid)} paragraphs: {len(vectors) - len(to_embed)} reused, "
+          f"{len(to_embed)} embedded in {requests} requests")
+    if to_embed:
+        print(f"Embedding: {embed_s:.1f}s ({len(to_embed) / embed_s:.1f} paragraphs/s, "
+              f"batch {embed_batch_size}, concurrency {embed_concurrency})")
+    print(f"Build: {total_s:.1f}s total ({len(paragraphs_by_uuid) / total_s:.1f} paragraphs/s)")
 
 
+# Run from the repo root: python -m rag.warm_up_rag [files...]
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Build the knowledge-base vector index")
+    parser.add_argument("files", nargs="*", help="knowledge-base text files (default: VECTOR_RAW_DATA_PATH)")
+    parser.add_argument("--no-reuse", action="store_true", help="re-embed every paragraph")
+    args = parser.parse_args()
+    asyncio.run(main(args.files, reuse=not args.no_reuse))
@@ -1,37 +1,149 @@
+import argparse
 import asyncio
+import multiprocessing
+import signal
+import sys
 import websockets
 import json
 import logging
 import uuid
 import os
 import requests
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse, parse_qs, quote
+import aiohttp
 from aiohttp import web
 import base64
-from livekit import rtc, api
-import subprocess
+from livekit import rtc
 import time
 import struct
-import audioop
 import numpy as np
 
+if not __package__:
+    # Started as `python utils/plivo_ws.py` rather than `python -m utils.plivo_ws`:
+    # put the repo root on the path so the utils package below imports either way
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.telephony import fast_runtime, mulaw_codec
+from utils.telephony.frame_pool import AudioFramePool
+from utils.telephony.packetizer import OutboundPacketizer
+from utils.telephony.providers import get_provider_protocol
+from utils.telephony.backpressure import AUDIO, BridgeQueue
+from utils.telephony.comfort_noise import ComfortNoise
+from utils.telephony.early_media import EarlyMediaBuffer
+from utils.telephony.livekit_client import LiveKitService
+from utils.telephony.room_pool import RoomPool, WarmRoom
+from utils.telephony.load_monitor import LoadMonitor
+from utils.telephony.admission import AdmissionController, UnixSocketAdmission
+from utils.telephony.call_metrics import CallMetrics, MetricsAggregate
+from utils.telephony.call_registry import InMemoryCallRegistry, UnixSocketCallRegistry, serve_registry
+from utils.structured_logging import LazyJson, setup_structured_logging
+
 # Environment variables
 LIVEKIT_URL = os.environ.get("LIVEKIT_URL", "wss://setupforretell-hk7yl5xf.livekit.cloud")
 LIVEKIT_API_KEY = os.environ.get("LIVEKIT_API_KEY", "APIoLr2sRCRJWY5")
 LIVEKIT_API_SECRET = os.environ.get("LIVEKIT_API_SECRET", "yE3wUkoQxjWjhteMAed9ubm5mYg3iOfPT6qBQfffzgJC")
 PARTICIPANT_NAME = "Telephony Caller"
 TELEPHONY_SAMPLE_RATE = 8000
-LIVEKIT_SAMPLE_RATE = 48000
+# Rate of the published telephony track and of the agent audio we subscribe to.
+# 8000 skips resampling in both directions; 16000 matches most STT models natively.
+SUPPORTED_LIVEKIT_SAMPLE_RATES = (8000, 16000, 48000)
+LIVEKIT_SAMPLE_RATE = int(os.environ.get("TELEPHONY_PUBLISH_SAMPLE_RATE", 48000))
+AGENT_STREAM_SAMPLE_RATE = int(os.environ.get("TELEPHONY_AGENT_STREAM_SAMPLE_RATE", LIVEKIT_SAMPLE_RATE))
+for _rate in (LIVEKIT_SAMPLE_RATE, AGENT_STREAM_SAMPLE_RATE):
+    if _rate not in SUPPORTED_LIVEKIT_SAMPLE_RATES:
+        raise ValueError(f"Unsupported LiveKit sample rate {_rate}, expected one of {SUPPORTED_LIVEKIT_SAMPLE_RATES}")
+# quick | low | medium | high | very_high
+RESAMPLER_QUALITY = rtc.AudioResamplerQuality(os.environ.get("TELEPHONY_RESAMPLER_QUALITY", "high"))
 CALLBACK_WS_URL = os.environ.get("CALLBACK_WS_URL", "ws://0.0.0.0:8765")
+TELEPHONY_PACKET_SAMPLES = 160  # 20 ms @ 8 kHz, Plivo's default packetization
+FRAME_POOL_SIZE = int(os.environ.get("TELEPHONY_FRAME_POOL_SIZE", 4))
+OUTBOUND_CHUNK_MS = int(os.environ.get("TELEPHONY_OUTBOUND_CHUNK_MS", 20))  # 20/40/100
+OUTBOUND_MAX_LEAD_MS = int(os.environ.get("TELEPHONY_OUTBOUND_MAX_LEAD_MS", 60))
+OUTBOUND_QUEUE_MAX_MS = int(os.environ.get("TELEPHONY_OUTBOUND_QUEUE_MAX_MS", 2000))
+OUTBOUND_AUDIO_DROP_POLICY = os.environ.get("TELEPHONY_OUTBOUND_AUDIO_DROP_POLICY", "drop_oldest")
+INBOUND_QUEUE_MAX_MS = int(os.environ.get("TELEPHONY_INBOUND_QUEUE_MAX_MS", 200))
+INBOUND_AUDIO_DROP_POLICY = os.environ.get("TELEPHONY_INBOUND_AUDIO_DROP_POLICY", "drop_oldest")
+COMFORT_NOISE_ENABLED = os.environ.get("TELEPHONY_COMFORT_NOISE", "false").lower() == "true"
+COMFORT_NOISE_LEVEL_DBFS = float(os.environ.get("TELEPHONY_COMFORT_NOISE_DBFS", -60))
+COMFORT_NOISE_IN_SILENCE = os.environ.get("TELEPHONY_COMFORT_NOISE_IN_SILENCE", "false").lower() == "true"
+AGENT_EVENTS_TOPIC = os.environ.get("AGENT_EVENTS_TOPIC", "agent-events")
+EARLY_MEDIA_BUFFER_MS = int(os.environ.get("EARLY_MEDIA_BUFFER_MS", 3000))  # 0 disables
+EARLY_MEDIA_DROP_LEADING_SILENCE = os.environ.get("EARLY_MEDIA_DROP_LEADING_SILENCE", "true").lower() == "true"
+EARLY_MEDIA_SILENCE_THRESHOLD = int(os.environ.get("EARLY_MEDIA_SILENCE_THRESHOLD", 300))
+LIVEKIT_API_POOL_SIZE = int(os.environ.get("LIVEKIT_API_POOL_SIZE", 100))
+ROOM_POOL_MIN = int(os.environ.get("ROOM_POOL_MIN", 0))
+ROOM_POOL_MAX = int(os.environ.get("ROOM_POOL_MAX", 0))  # 0 disables pre-warmed rooms
+ROOM_POOL_MAX_IDLE_S = float(os.environ.get("ROOM_POOL_MAX_IDLE_S", 300))
+# Only enable for agents that wait for caller audio before greeting
+ROOM_POOL_DISPATCH_AGENT = os.environ.get("ROOM_POOL_DISPATCH_AGENT", "false").lower() == "true"
+WEBSOCKET_PORT = int(os.environ.get("BRIDGE_WEBSOCKET_PORT", 8765))
+HTTP_PORT = int(os.environ.get("BRIDGE_HTTP_PORT", 8080))
+BRIDGE_WORKERS = int(os.environ.get("BRIDGE_WORKERS", 1))
+BRIDGE_RUN_DIR = os.environ.get("BRIDGE_RUN_DIR", "/tmp/plivo-bridge")
+# Drain deadline: calls still up this long after SIGTERM or POST /admin/drain are torn down
+WORKER_DRAIN_TIMEOUT_S = float(os.environ.get("WORKER_DRAIN_TIMEOUT_S", 300))
+# Shared secret for /admin endpoints (X-Admin-Token header); unset leaves them open
+BRIDGE_ADMIN_TOKEN = os.environ.get("BRIDGE_ADMIN_TOKEN")
+FORWARDED_HEADER = "X-Bridge-Forwarded-By"
+TEARDOWN_DELETE_ROOM = os.environ.get("TEARDOWN_DELETE_ROOM", "true").lower() == "true"
+# Plivo stream-status values after which the stream carries no more audio
+STREAM_TERMINAL_STATUSES = {"stopped", "stopstream", "failed", "timeout", "streamtimeout", "error"}
+# Wire protocol for streams that don't pick one with ?protocol= (plivo | binary)
+DEFAULT_PROVIDER_PROTOCOL = os.environ.get("TELEPHONY_PROVIDER_PROTOCOL", "plivo")
+# Load shedding: stop accepting calls above these thresholds, resume once lag stays low for the hold period
+LOAD_MONITOR_INTERVAL_MS = float(os.environ.get("LOAD_MONITOR_INTERVAL_MS", 100))
+LOAD_SHED_LAG_MS = float(os.environ.get("LOAD_SHED_LAG_MS", 150))
+LOAD_RECOVER_LAG_MS = float(os.environ.get("LOAD_RECOVER_LAG_MS", 50))
+LOAD_RECOVER_HOLD_S = float(os.environ.get("LOAD_RECOVER_HOLD_S", 5))
+LOAD_SHED_PROCESSING_MS = float(os.environ.get("LOAD_SHED_PROCESSING_MS", 10))
+LOAD_MAX_CALLS = int(os.environ.get("LOAD_MAX_CALLS", 0))  # 0 = no hard cap
+LOAD_SHED_RESPONSE = os.environ.get("LOAD_SHED_RESPONSE", "busy")  # busy | hangup
+# Write each call's media quality summary into calls.call_metadata at call end
+CALL_METRICS_TO_DB = os.environ.get("TELEPHONY_CALL_METRICS_TO_DB", "true").lower() == "true"
 agent_name = "Earkart" #outbound-caller / Mysyara Agent
 
-# Configure detailed logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Queue-backed structured logging shared with the agent (formatting/writes happen off the event loop)
+setup_structured_logging()
 logger = logging.getLogger(__name__)
 
+# Worker identity and call ownership; replaced per process in supervisor mode
+WORKER_ID = 0
+call_registry = InMemoryCallRegistry()
+active_handlers = []
+# Plivo CallUUID / StreamId -> TelephonyWebSocketHandler owned by this worker
+calls_by_id = {}
+teardown_stats = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0}
+# Media quality histograms of this worker's ended calls, for /metrics
+call_metrics_totals = MetricsAggregate()
+# Drain mode: no new calls, existing ones run to completion or the deadline, then the process exits
+drain_state = {"draining": False, "reason": None, "started_at": None, "deadline": None}
+drain_requested = asyncio.Event()
+load_monitor = LoadMonitor(
+    lag_threshold_ms=LOAD_SHED_LAG_MS, recover_lag_ms=LOAD_RECOVER_LAG_MS,
+    processing_threshold_ms=LOAD_SHED_PROCESSING_MS, max_calls=LOAD_MAX_CALLS,
+    recover_hold_s=LOAD_RECOVER_HOLD_S, interval_ms=LOAD_MONITOR_INTERVAL_MS
+)
+# Per-tenant concurrency and call-setup limits (TELEPHONY_TENANTS); enforced per worker
+admission = AdmissionController.from_env()
+
+# One keep-alive LiveKit API client shared by every call in this process
+livekit_service = LiveKitService(
+    LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET,
+    pool_size=LIVEKIT_API_POOL_SIZE
+)
+
+def json_response(data, status=200):
+    """aiohttp JSON response serialised by the configured runtime (orjson in fast mode)"""
+    return web.json_response(data, status=status, dumps=fast_runtime.json_dumps)
+
+def websocket_is_open(websocket):
+    """Open-state check that works for both the new and legacy websockets connection APIs"""
+    state = getattr(websocket, "state", None)
+    if state is not None:
+        return state == websockets.protocol.State.OPEN
+    return getattr(websocket, "open", False)
+
+
 class TelephonyAudioSource(rtc.AudioSource):
     """Audio source for processing telephony μ-law audio"""
     
@@ -41,17 +153,25 @@ class TelephonyAudioSource(rtc.AudioSource):
             num_channels=1
         )
         
+        # Publishing at the telephony rate needs no resampler at all
         self.resampler = rtc.AudioResampler(
             input_rate=TELEPHONY_SAMPLE_RATE,
             output_rate=LIVEKIT_SAMPLE_RATE,
             num_channels=1,
-            quality=rtc.AudioResamplerQuality.HIGH
+            quality=RESAMPLER_QUALITY
+        ) if LIVEKIT_SAMPLE_RATE != TELEPHONY_SAMPLE_RATE else None
+        # Preallocated input frames, decoded into in place
+        self.frame_pool = AudioFramePool(
+            sample_rate=TELEPHONY_SAMPLE_RATE,
+            samples_per_channel=TELEPHONY_PACKET_SAMPLES,
+            size=FRAME_POOL_SIZE
         )
         self.frame_count = 0
         self.total_bytes_processed = 0
         self.last_audio_time = time.time()
         
-        logger.info(f"🎤 Audio Source initialized: {TELEPHONY_SAMPLE_RATE}Hz -> {LIVEKIT_SAMPLE_RATE}Hz")
+        logger.info(f"🎤 Audio Source initialized: {TELEPHONY_SAMPLE_RATE}Hz -> {LIVEKIT_SAMPLE_RATE}Hz"
+                    f"{f' ({RESAMPLER_QUALITY.value} resampler)' if self.resampler else ' (no resampling)'}")
 
     async def push_audio_data(self, mulaw_data):
         """Process μ-law audio data from telephony system"""
@@ -66,53 +186,56 @@ class TelephonyAudioSource(rtc.AudioSource):
             
             # Log audio data info much less frequently
             if self.frame_count % 250 == 0:
-                logger.info(f"🎵 [INCOMING] Frame #{self.frame_count}: {len(mulaw_data)} bytes μ-law, "
-                           f"Total: {self.total_bytes_processed} bytes")
+                logger.info("🎵 [INCOMING] Frame #%d: %d bytes μ-law, Total: %d bytes",
+                            self.frame_count, len(mulaw_data), self.total_bytes_processed)
 
-            # Convert μ-law to 16-bit PCM
+            # Decode μ-law straight into a pooled input frame's int16 buffer
+            input_frame, frame_view = self.frame_pool.acquire(len(mulaw_data))
             try:
-                pcm_data = audioop.ulaw2lin(mulaw_data, 2)  # 2 bytes per sample (16-bit)
+                mulaw_codec.decode_into(mulaw_data, frame_view)
             except Exception as e:
-                logger.error(f"❌ μ-law conversion error: {e}, data size: {len(mulaw_data)}")
-                return
-            
-            # Convert to samples array
-            import array
-            samples = array.array("h")  # signed short (16-bit)
-            samples.frombytes(pcm_data)
-
-            input_samples = len(samples)
-            if input_samples == 0:
-                logger.warning("⚠️ No samples after PCM conversion")
+                logger.error("❌ μ-law conversion error: %s, data size: %d", e, len(mulaw_data),
+                             extra={"sample_key": "mulaw_decode_error"})
                 return
 
             # Log sample info for first few frames only
             if self.frame_count <= 5:
-                logger.info(f"🔍 Frame {self.frame_count}: {input_samples} samples, "
-                           f"first few: {samples[:min(5, len(samples))]}")
-
-            # Create input frame for resampling
-            input_frame = rtc.AudioFrame.create(
-                sample_rate=TELEPHONY_SAMPLE_RATE,
-                num_channels=1,
-                samples_per_channel=input_samples
-            )
-            input_frame.data[:input_samples] = samples
+                logger.info("🔍 Frame %d: %d samples, first few: %s",
+                            self.frame_count, len(frame_view), frame_view[:5].tolist())
 
-            # Resample to LiveKit's sample rate
-            resampled_frames = self.resampler.push(input_frame)
+            await self._capture_input_frame(input_frame)
 
-            # Push each resampled frame to LiveKit
-            for i, resampled_frame in enumerate(resampled_frames):
-                await self.capture_frame(resampled_frame)
-                
-                if self.frame_count <= 5:
-                    logger.info(f"🔍 Pushed resampled frame {i}: {resampled_frame.samples_per_channel} samples")
+        except Exception as e:
+            logger.error("❌ Error processing telephony audio frame %d: %s", self.frame_count, e,
+                         exc_info=True, extra={"sample_key": "inbound_frame_error"})
 
+    async def push_pcm_data(self, samples):
+        """Process already-decoded 16-bit PCM at the telephony rate (e.g. replayed early media)"""
+        try:
+            input_frame, frame_view = self.frame_pool.acquire(len(samples))
+            frame_view[:] = samples
+            self.frame_count += 1
+            await self._capture_input_frame(input_frame)
         except Exception as e:
-            logger.error(f"❌ Error processing telephony audio frame {self.frame_count}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("❌ Error processing PCM frame %d: %s", self.frame_count, e,
+                         extra={"sample_key": "pcm_frame_error"})
+
+    async def _capture_input_frame(self, input_frame):
+        """Resample a telephony-rate frame and push it to LiveKit"""
+        if self.resampler is None:
+            # Native telephony rate: capture copies the frame, so the pooled buffer can be reused
+            await self.capture_frame(input_frame)
+            return
+        
+        # Resample to LiveKit's sample rate
+        resampled_frames = self.resampler.push(input_frame)
+
+        # Push each resampled frame to LiveKit
+        for i, resampled_frame in enumerate(resampled_frames):
+            await self.capture_frame(resampled_frame)
+            
+            if self.frame_count <= 5:
+                logger.info("🔍 Pushed resampled frame %d: %d samples", i, resampled_frame.samples_per_channel)
 
     def get_stats(self):
         """Get audio processing statistics"""
@@ -120,7 +243,8 @@ class TelephonyAudioSource(rtc.AudioSource):
             "frames_processed": self.frame_count,
             "total_bytes": self.total_bytes_processed,
             "last_audio_ago": time.time() - self.last_audio_time,
-            "avg_bytes_per_frame": self.total_bytes_processed / max(1, self.frame_count)
+            "avg_bytes_per_frame": self.total_bytes_processed / max(1, self.frame_count),
+            **self.frame_pool.get_stats()
         }
 
     async def cleanup(self):
@@ -129,7 +253,9 @@ class TelephonyAudioSource(rtc.AudioSource):
             stats = self.get_stats()
             logger.info(f"🧹 Audio source cleanup - Stats: {stats}")
             
-            if hasattr(self.resampler, 'aclose'):
+            if self.resampler is None:
+                pass
+            elif hasattr(self.resampler, 'aclose'):
                 await self.resampler.aclose()
             elif hasattr(self.resampler, 'close'):
                 self.resampler.close()
@@ -141,20 +267,34 @@ class TelephonyAudioSource(rtc.AudioSource):
 class TelephonyWebSocketHandler:
     """WebSocket handler for telephony system integration"""
     
-    def __init__(self, room_name, websocket):
+    def __init__(self, room_name, websocket, protocol=None):
         self.room_name = room_name
         self.websocket = websocket
+        # Provider wire format: parses inbound messages, renders outbound audio/clear messages
+        self.protocol = protocol or get_provider_protocol(DEFAULT_PROVIDER_PROTOCOL, TELEPHONY_SAMPLE_RATE)
         self.room = None
         self.audio_source = None
         self.audio_track = None
         self.connected = False
         self.agent_participant = None
         self.connection_start_time = time.time()
+        # Call setup step latencies (ms)
+        self.setup_timings = {}
         self.messages_received = 0
         self.messages_sent = 0
         self.audio_stream_task = None
+        # Caller audio is only pushed live once early media has been replayed
+        self.media_ready = False
+        self.early_media = EarlyMediaBuffer(
+            sample_rate=TELEPHONY_SAMPLE_RATE,
+            max_ms=EARLY_MEDIA_BUFFER_MS,
+            drop_leading_silence=EARLY_MEDIA_DROP_LEADING_SILENCE,
+            silence_threshold=EARLY_MEDIA_SILENCE_THRESHOLD
+        )
         # WebSocket handler variable to store stream ID for Plivo
         self.stream_sid = None
+        self.call_uuid = None
+        self.call_active = False
         
         # Track participants and their audio tracks
         self.participants = {}
@@ -162,11 +302,41 @@ class TelephonyWebSocketHandler:
         
         # Audio conversion for return path
         self.return_resampler = rtc.AudioResampler(
-            input_rate=LIVEKIT_SAMPLE_RATE,
+            input_rate=AGENT_STREAM_SAMPLE_RATE,
             output_rate=TELEPHONY_SAMPLE_RATE,
             num_channels=1,
-            quality=rtc.AudioResamplerQuality.HIGH
+            quality=RESAMPLER_QUALITY
+        ) if AGENT_STREAM_SAMPLE_RATE != TELEPHONY_SAMPLE_RATE else None
+        # Reusable μ-law output buffer (1s of telephony audio is far above any single frame)
+        self._mulaw_buffer = np.empty(TELEPHONY_SAMPLE_RATE, dtype=np.uint8)
+        
+        # Comfort noise is None when disabled, so the outbound path pays a single check
+        self.comfort_noise = ComfortNoise(
+            level_dbfs=COMFORT_NOISE_LEVEL_DBFS,
+            sample_rate=TELEPHONY_SAMPLE_RATE
+        ) if COMFORT_NOISE_ENABLED else None
+        
+        # Outbound coalescing/pacing of provider audio messages
+        self.packetizer = OutboundPacketizer(
+            self.send_audio_to_telephony,
+            sample_rate=TELEPHONY_SAMPLE_RATE,
+            chunk_ms=OUTBOUND_CHUNK_MS,
+            max_lead_ms=OUTBOUND_MAX_LEAD_MS,
+            max_queue_ms=OUTBOUND_QUEUE_MAX_MS,
+            audio_policy=OUTBOUND_AUDIO_DROP_POLICY,
+            idle_fill=self.comfort_noise.mulaw_chunk if self.comfort_noise and COMFORT_NOISE_IN_SILENCE else None,
+            on_sent=self._record_send
         )
+        self.packetizer_task = None
+        # Plivo -> LiveKit: the socket reader only enqueues; a dedicated task feeds capture
+        self.inbound_queue = BridgeQueue(
+            "inbound",
+            INBOUND_QUEUE_MAX_MS * TELEPHONY_SAMPLE_RATE // 1000 // TELEPHONY_PACKET_SAMPLES,
+            INBOUND_AUDIO_DROP_POLICY
+        )
+        self.inbound_task = None
+        self.teardown_task = None
+        self.teardown_ms = None
         
         # Statistics
         self.stats = {
@@ -176,6 +346,19 @@ class TelephonyWebSocketHandler:
             "bytes_to_telephony": 0,
         }
         
+        # Media quality and timing histograms (jitter, capture/send latency, queue depth)
+        self.metrics = CallMetrics(TELEPHONY_PACKET_SAMPLES * 1000 / TELEPHONY_SAMPLE_RATE)
+        
+        # Barge-in statistics
+        self.barge_in_stats = {
+            "interruptions": 0,
+            "interruptions_nothing_playing": 0,
+            "clear_audio_sent": 0,
+            "audio_dropped_ms": 0.0,
+            "last_interruption_to_silence_ms": None,
+            "max_interruption_to_silence_ms": 0.0,
+        }
+        
         logger.info(f"🆕 Created telephony WebSocket handler for room: {room_name}")
         
     async def connect_to_livekit(self):
@@ -184,23 +367,19 @@ class TelephonyWebSocketHandler:
         
         try:
             logger.info(f"🔗 Connecting to LiveKit room: {self.room_name}")
+            step_start = time.perf_counter()
             
-            # Create room if it doesn't exist
-            lkapi = api.LiveKitAPI(LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
+            # Create room if it doesn't exist (shared keep-alive API client)
             try:
-                await lkapi.room.create_room(api.CreateRoomRequest(name=self.room_name))
+                await livekit_service.create_room(self.room_name)
                 logger.info(f"✅ Created LiveKit room: {self.room_name}")
             except Exception as e:
                 logger.info(f"ℹ️ Room creation result (may already exist): {e}")
+            step_start = self._record_setup_step("create_room", step_start)
             
             # Create access token
-            token = (api.AccessToken(LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
-                    .with_identity(identity)
-                    .with_name(PARTICIPANT_NAME)
-                    .with_grants(api.VideoGrants(
-                        room_join=True,
-                        room=self.room_name,
-                    ))) 
+            token = livekit_service.create_token(identity, PARTICIPANT_NAME, self.room_name)
+            step_start = self._record_setup_step("create_token", step_start)
             
             # Connect to room
             self.room = rtc.Room()
@@ -211,33 +390,23 @@ class TelephonyWebSocketHandler:
             # Connect to room with timeout
             logger.info(f"⏰ Connecting to LiveKit room with 10s timeout...")
             await asyncio.wait_for(
-                self.room.connect(LIVEKIT_URL, token.to_jwt()), 
+                self.room.connect(LIVEKIT_URL, token), 
                 timeout=10.0
             )
+            step_start = self._record_setup_step("room_connect", step_start)
             logger.info(f"✅ LiveKit room connection successful!")
             
             # Mark as connected immediately
             self.connected = True
             
             # Create and publish audio track
-            self.audio_source = TelephonyAudioSource()
-            self.audio_track = rtc.LocalAudioTrack.create_audio_track(
-                "telephony-audio", 
-                self.audio_source
-            )
-            
-            # Publish with microphone source
-            options = rtc.TrackPublishOptions()
-            options.source = rtc.TrackSource.SOURCE_MICROPHONE
-            
-            publication = await self.room.local_participant.publish_track(
-                self.audio_track,
-                options
-            )
+            self.audio_source, self.audio_track, publication = await publish_telephony_track(self.room)
+            self._record_setup_step("publish_track", step_start)
             logger.info(f"✅ Telephony audio track published: {publication.sid}")
-            logger.info(f"🎯 LiveKit connection complete - ready for audio!")
             
-            await lkapi.aclose()
+            # Replay caller audio that arrived while we were connecting
+            await self.replay_early_media()
+            logger.info(f"🎯 LiveKit connection complete - ready for audio! Setup timings (ms): {self.setup_timings}")
             return True
             
         except asyncio.TimeoutError:
@@ -249,6 +418,46 @@ class TelephonyWebSocketHandler:
             traceback.print_exc()
             return False
 
+    async def attach_warm_room(self, warm_room: WarmRoom):
+        """Take over a pre-warmed room whose telephony track is already published"""
+        step_start = time.perf_counter()
+        self.room_name = warm_room.room_name
+        self.room = warm_room.room
+        self.audio_source = warm_room.audio_source
+        self.audio_track = warm_room.audio_track
+        self._setup_room_events()
+        self.connected = True
+        
+        # Events fired before we attached are replayed from current room state
+        for participant in self.room.remote_participants.values():
+            self._handle_participant_joined(participant)
+        
+        self._record_setup_step("attach_warm_room", step_start)
+        await self.replay_early_media()
+        logger.info(f"🔥 Attached to warm room {self.room_name} (warmed in {warm_room.warmup_ms:.0f}ms, "
+                   f"agent {'pre-dispatched' if warm_room.agent_dispatched else 'not dispatched'})")
+        return True
+
+    def _record_setup_step(self, step, step_start):
+        """Record a call setup step's latency and return the start time for the next step"""
+        now = time.perf_counter()
+        self.setup_timings[step] = round((now - step_start) * 1000, 1)
+        return now
+
+    async def replay_early_media(self):
+        """Drain buffered early media into the telephony track, then switch to the live path"""
+        if len(self.early_media):
+            logger.info(f"⏪ Replaying {self.early_media.buffered_ms:.0f}ms of early caller audio")
+        
+        # Packets arriving during replay keep landing in the buffer, so order is preserved.
+        # Pauses inside the backlog are skipped so the caller isn't heard late for the whole call.
+        while len(self.early_media) and self.connected:
+            chunk = self.early_media.pop(TELEPHONY_PACKET_SAMPLES)
+            if chunk is not None:
+                await self.audio_source.push_pcm_data(chunk)
+        
+        self.media_ready = True
+
     def _setup_room_events(self):
         """Setup LiveKit room event handlers"""
         
@@ -323,6 +532,35 @@ class TelephonyWebSocketHandler:
             if participant.identity in self.audio_tracks:
                 if track in self.audio_tracks[participant.identity]:
                     self.audio_tracks[participant.identity].remove(track)
+            
+            # Agent audio went away - stop whatever is still playing on the phone
+            if track.kind == rtc.TrackKind.KIND_AUDIO and self._is_agent_participant(participant):
+                asyncio.create_task(self.clear_telephony_playback("agent track unsubscribed", time.monotonic()))
+
+        @self.room.on("track_unpublished")
+        def on_track_unpublished(publication, participant):
+            logger.info(f"📴 Track UNPUBLISHED by {participant.identity}: {publication.kind}")
+            
+            if publication.kind == rtc.TrackKind.KIND_AUDIO and self._is_agent_participant(participant):
+                asyncio.create_task(self.clear_telephony_playback("agent track unpublished", time.monotonic()))
+
+        @self.room.on("data_received")
+        def on_data_received(packet: rtc.DataPacket):
+            if packet.topic != AGENT_EVENTS_TOPIC:
+                return
+            try:
+                message = fast_runtime.json_loads(packet.data)
+            except (ValueError, TypeError):
+                logger.warning(f"⚠️ Invalid agent event payload on {AGENT_EVENTS_TOPIC}")
+                return
+            
+            if message.get("type") == "agent_interrupted":
+                # Timed from receipt on this host: the agent's own timestamp is on another clock
+                asyncio.create_task(self.clear_telephony_playback(
+                    "agent interrupted",
+                    received_at=time.monotonic(),
+                    barge_in=True
+                ))
 
     def _handle_participant_joined(self, participant):
         """Handle when a participant joins"""
@@ -405,17 +643,18 @@ class TelephonyWebSocketHandler:
         
         try:
             # Create audio stream
-            audio_stream = rtc.AudioStream(audio_track)
+            audio_stream = rtc.AudioStream(audio_track, sample_rate=AGENT_STREAM_SAMPLE_RATE)
             logger.info("✅ AudioStream created successfully")
             
+            # Paced sender for coalesced chunks, shared across agent track restarts
+            if self.packetizer_task is None or self.packetizer_task.done():
+                self.packetizer_task = asyncio.create_task(self.packetizer.run())
+            
             async for audio_frame_event in audio_stream:
                 current_time = time.time()
                 
-                # Check if still connected - fix the websocket check
-                try:
-                    websocket_closed = self.websocket.closed if hasattr(self.websocket, 'closed') else False
-                except:
-                    websocket_closed = False
+                # Check if still connected
+                websocket_closed = not websocket_is_open(self.websocket)
                 
                 if not self.connected or websocket_closed or not self.call_active:
                     logger.warning("❌ Connection lost or call ended, stopping audio stream")
@@ -425,38 +664,38 @@ class TelephonyWebSocketHandler:
                 
                 # Log every second
                 if current_time - last_log_time >= 1.0:
-                    logger.info(f"🔊 [OUTGOING] Agent audio: {frame_count} frames, {bytes_sent} bytes sent")
+                    logger.info("🔊 [OUTGOING] Agent audio: %d frames, %d bytes queued, send queue depth: %d",
+                                frame_count, bytes_sent, self.packetizer.queue_depth)
                     last_log_time = current_time
                 
                 try:
                     # Get the audio frame
                     frame = audio_frame_event.frame
+                    frame_start = time.perf_counter()
                     
-                    # Resample from 48kHz to 8kHz for telephony
-                    resampled_frames = self.return_resampler.push(frame)
+                    # Resample to 8kHz for telephony (already there when subscribed at 8kHz)
+                    resampled_frames = self.return_resampler.push(frame) if self.return_resampler else (frame,)
                     
                     for resampled_frame in resampled_frames:
-                        # Convert to PCM bytes
-                        pcm_bytes = bytes(resampled_frame.data[:resampled_frame.samples_per_channel * 2])
+                        # Zero-copy view over the frame's PCM samples
+                        pcm_array = mulaw_codec.frame_samples(resampled_frame)
                         
-                        # ADD NOISE HERE - before μ-law conversion
-                        pcm_array = np.frombuffer(pcm_bytes, dtype=np.int16)
-                        noise = np.random.normal(0, 0.01, len(pcm_array))
-                        noisy_pcm = (pcm_array + noise * 32767 * 0.1).astype(np.int16)
+                        # Comfort noise before μ-law conversion (precomputed table, saturating mix)
+                        if self.comfort_noise:
+                            pcm_array = self.comfort_noise.mix(pcm_array)
 
-                        # Convert PCM to μ-law for telephony
-                        mulaw_bytes = audioop.lin2ulaw(pcm_bytes, 2)
+                        # Convert PCM to μ-law for telephony into the reusable output buffer
+                        mulaw_bytes = mulaw_codec.encode_into(pcm_array, self._mulaw_buffer)
                         
-                        # Send to telephony
-                        success = await self.send_audio_to_telephony(mulaw_bytes)
-                        
-                        if success:
-                            bytes_sent += len(mulaw_bytes)
-                            self.stats["audio_frames_received_from_agent"] += 1
-                            self.stats["bytes_to_telephony"] += len(mulaw_bytes)
+                        # Queue for coalesced, paced sending to telephony
+                        self.packetizer.push(mulaw_bytes)
+                        bytes_sent += len(mulaw_bytes)
+                        self.stats["audio_frames_received_from_agent"] += 1
+                    load_monitor.record_processing((time.perf_counter() - frame_start) * 1000)
                         
                 except Exception as e:
-                    logger.error(f"❌ Error processing audio frame {frame_count}: {e}")
+                    logger.error("❌ Error processing audio frame %d: %s", frame_count, e,
+                                 extra=self._log_extra("outbound_frame_error"))
                     continue
                     
         except Exception as e:
@@ -464,63 +703,84 @@ class TelephonyWebSocketHandler:
             import traceback
             traceback.print_exc()
         finally:
+            self.packetizer.flush()
             logger.info(f"🔇 Agent audio stream ended. Frames: {frame_count}, Bytes: {bytes_sent}")
 
+    async def clear_telephony_playback(self, reason, received_at=None, barge_in=False):
+        """
+        Drop queued agent audio and tell Plivo to flush its playback buffer.
+        barge_in: the agent reported an interruption; counted even when nothing was playing
+        """
+        received_at = received_at or time.monotonic()
+        dropped_bytes = self.packetizer.clear()
+        
+        # Nothing of the agent's queued or still playing (comfort-noise fill doesn't count)
+        if not dropped_bytes and not self.packetizer.agent_buffered_playout:
+            if barge_in:
+                self.barge_in_stats["interruptions"] += 1
+                self.barge_in_stats["interruptions_nothing_playing"] += 1
+            return False
+        
+        buffered = self.packetizer.reset_playout()
+        self.barge_in_stats["interruptions"] += 1
+        self.barge_in_stats["audio_dropped_ms"] += round(buffered * 1000 + dropped_bytes * 1000 / TELEPHONY_SAMPLE_RATE, 1)
+        
+        sent = False
+        clear_message = self.protocol.render_clear(self.stream_sid)
+        if clear_message and (self.stream_sid or not self.protocol.requires_stream_id):
+            try:
+                await self.websocket.send(clear_message)
+                self.barge_in_stats["clear_audio_sent"] += 1
+                sent = True
+            except Exception as e:
+                logger.error(f"❌ Error sending clearAudio to Plivo: {e}")
+        
+        # Interruption-to-silence: from the bridge receiving the trigger to clearAudio on the wire
+        silence_ms = (time.monotonic() - received_at) * 1000
+        self.barge_in_stats["last_interruption_to_silence_ms"] = round(silence_ms, 1)
+        self.barge_in_stats["max_interruption_to_silence_ms"] = max(
+            self.barge_in_stats["max_interruption_to_silence_ms"], round(silence_ms, 1)
+        )
+        logger.info(f"🛑 Barge-in ({reason}): dropped {dropped_bytes} queued bytes + {buffered * 1000:.0f}ms "
+                   f"buffered on Plivo, interruption-to-silence {silence_ms:.0f}ms")
+        return sent
+
     async def send_audio_to_telephony(self, audio_data):
         """Send audio data back to Plivo via WebSocket"""
         try:
             # Check WebSocket connection status properly
-            try:
-                # For websockets library, check if connection is open
-                websocket_closed = (not hasattr(self.websocket, 'open') or 
-                                  not self.websocket.open if hasattr(self.websocket, 'open') else
-                                  getattr(self.websocket, 'closed', False))
-            except:
-                # If we can't determine status, assume closed
-                websocket_closed = True
-                
-            if websocket_closed:
-                logger.warning("⚠️ WebSocket closed, cannot send audio to Plivo")
+            if not websocket_is_open(self.websocket):
+                logger.warning("⚠️ WebSocket closed, cannot send audio to Plivo",
+                               extra=self._log_extra("send_closed"))
                 return False
                 
-            if not self.stream_sid:
-                logger.error(f"❌ CRITICAL: No stream ID available! Cannot send audio to Plivo")
-                logger.error(f"❌ Audio data size: {len(audio_data)} bytes - DROPPED")
+            if not self.stream_sid and self.protocol.requires_stream_id:
+                logger.error("❌ CRITICAL: No stream ID available! Cannot send audio to Plivo "
+                             "(%d bytes DROPPED)", len(audio_data), extra=self._log_extra("send_no_stream"))
                 return False
                 
-            # Encode audio as base64 for Plivo
-            encoded_audio = base64.b64encode(audio_data).decode('utf-8')
-            
-            # Create Plivo playAudio message format
-            media_message = {
-                "event": "playAudio",
-                "media": {
-                    "contentType": "audio/x-mulaw",
-                    "sampleRate": TELEPHONY_SAMPLE_RATE,
-                    "payload": encoded_audio
-                }
-            }
-            
-            await self.websocket.send(json.dumps(media_message))
+            await self.websocket.send(self.protocol.render_audio(audio_data, self.stream_sid))
             self.messages_sent += 1
+            self.stats["bytes_to_telephony"] += len(audio_data)
             
             # Log success for first few messages
             if self.messages_sent <= 5:
-                logger.info(f"📤 SUCCESS: Sent agent audio #{self.messages_sent} to Plivo ({len(audio_data)} bytes)")
+                logger.info("📤 SUCCESS: Sent agent audio #%d to Plivo (%d bytes)", self.messages_sent, len(audio_data))
             # Log occasionally for subsequent messages
             elif self.messages_sent % 50 == 0:
-                logger.info(f"📤 Sent {self.messages_sent} audio messages to Plivo")
+                logger.info("📤 Sent %d audio messages to Plivo", self.messages_sent)
             
             return True
             
         except Exception as e:
-            logger.error(f"❌ Error sending audio to Plivo: {e}")
+            logger.error("❌ Error sending audio to Plivo: %s", e, extra=self._log_extra("send_error"))
             return False
         
     async def handle_messages(self):
         """Handle incoming WebSocket messages from Plivo"""
         logger.info(f"👂 Starting to listen for Plivo WebSocket messages...")
         last_log_time = time.time()
+        self.inbound_task = asyncio.create_task(self.process_inbound_queue())
         
         try:
             async for message in self.websocket:
@@ -531,31 +791,36 @@ class TelephonyWebSocketHandler:
                 if isinstance(message, str):
                     # Log first 10 messages completely to catch start event
                     if self.messages_received <= 10:  
-                        logger.info(f"📄 FULL MSG #{self.messages_received}: {message}")
+                        logger.debug("📄 FULL MSG #%d: %s", self.messages_received, message)
                     # Then log every 5 seconds
                     elif current_time - last_log_time >= 5.0:
-                        logger.info(f"📥 [MSG #{self.messages_received}] Processing {len(message)} char messages...")
+                        logger.info("📥 [MSG #%d] Processing %d char messages...", self.messages_received, len(message))
                         last_log_time = current_time
                 else:
                     # First few binary messages
                     if self.messages_received <= 10:
-                        logger.info(f"📄 FULL BINARY #{self.messages_received}: {message[:100]}...")
+                        logger.debug("📄 FULL BINARY #%d: %s...", self.messages_received, message[:100])
                     # Then log every 5 seconds  
                     elif current_time - last_log_time >= 5.0:
-                        logger.info(f"📥 [MSG #{self.messages_received}] Processing binary messages...")
+                        logger.info("📥 [MSG #%d] Processing binary messages...", self.messages_received)
                         last_log_time = current_time
                 
                 try:
-                    if isinstance(message, str):
-                        event = json.loads(message)
-                        await self.handle_telephony_event(event)
-                    else:
-                        # Handle binary audio data directly
-                        await self.handle_binary_audio(message)
-                        
-                except json.JSONDecodeError as e:
-                    logger.error(f"❌ Invalid JSON from Plivo: {e}")
-                    logger.error(f"Message content: {message[:100]}...")
+                    parsed = self.protocol.parse(message)
+                except ValueError as e:
+                    # Malformed JSON or base64
+                    logger.error("❌ Invalid %s message: %s (message: %s...)", self.protocol.name, e, message[:100],
+                                 extra=self._log_extra("invalid_message"))
+                    continue
+                
+                if parsed is None:
+                    logger.warning("⚠️ Media event without payload", extra=self._log_extra("media_without_payload"))
+                elif parsed[0] == AUDIO:
+                    self.metrics.record_inbound_packet()
+                    self.inbound_queue.put_audio(parsed[1])
+                else:
+                    # Control events are never dropped
+                    self.inbound_queue.put_control(parsed[1])
                         
         except websockets.ConnectionClosed:
             logger.info("📞 Plivo WebSocket connection closed normally")
@@ -564,7 +829,61 @@ class TelephonyWebSocketHandler:
             import traceback
             traceback.print_exc()
         finally:
+            # Let the inbound task finish what was already received (e.g. the stop event)
+            self.inbound_queue.close()
+            if self.inbound_task and not self.inbound_task.done():
+                try:
+                    await asyncio.wait_for(asyncio.shield(self.inbound_task), timeout=1.0)
+                except (asyncio.CancelledError, asyncio.TimeoutError):
+                    pass
             await self.cleanup()
+    
+    async def process_inbound_queue(self):
+        """Drain the inbound queue into LiveKit, isolated from the socket reader"""
+        try:
+            while (entry := await self.inbound_queue.get()) is not None:
+                kind, item = entry
+                try:
+                    if kind == AUDIO:
+                        live = self.connected and self.media_ready
+                        packet_start = time.perf_counter()
+                        await self.handle_inbound_audio(item)
+                        processing_ms = (time.perf_counter() - packet_start) * 1000
+                        load_monitor.record_processing(processing_ms)
+                        if live:
+                            # Received -> captured: time queued plus decode/resample/capture
+                            self.metrics.record_capture(self.inbound_queue.last_dwell * 1000 + processing_ms)
+                    else:
+                        await self.handle_telephony_event(item)
+                except Exception as e:
+                    logger.error("❌ Error processing inbound %s: %s", kind, e,
+                                 extra=self._log_extra("inbound_error"))
+        except asyncio.CancelledError:
+            pass
+            
+    async def handle_inbound_audio(self, decoded_audio):
+        """Push caller μ-law audio to LiveKit, or hold it as early media until the track is ready"""
+        # Only process live once connected and early media has been replayed
+        if self.connected and self.media_ready:
+            await self.audio_source.push_audio_data(decoded_audio)
+            self.stats["audio_frames_sent_to_livekit"] += 1
+            self.stats["bytes_from_telephony"] += len(decoded_audio)
+            
+            # Log much less frequently
+            if self.stats["audio_frames_sent_to_livekit"] % 250 == 0:
+                logger.info("🎵 Processed %d audio frames from Plivo", self.stats["audio_frames_sent_to_livekit"])
+        elif self.early_media.enabled:
+            # Hold caller audio until the LiveKit track is published
+            if self.early_media.push(decoded_audio):
+                self.stats["bytes_from_telephony"] += len(decoded_audio)
+            if self.messages_received % 250 == 0:  # Much less frequent
+                logger.warning("⚠️ LiveKit not connected yet (msg #%d), buffered %.0fms",
+                               self.messages_received, self.early_media.buffered_ms)
+        else:
+            # Count dropped frames
+            if not hasattr(self, 'dropped_frames'):
+                self.dropped_frames = 0
+            self.dropped_frames += 1
             
     async def handle_telephony_event(self, event):
         """Handle Plivo WebSocket events"""
@@ -574,15 +893,20 @@ class TelephonyWebSocketHandler:
             logger.info("🟢 CALL STARTED")
             logger.info(f"📞 Plivo event: {event_type}")
             self.call_active = True
+            self.metrics.record_start()
             start_data = event.get("start", {})
             self.stream_sid = start_data.get("streamId")
             call_id = start_data.get("callId")
+            self.call_uuid = call_id
+            
+            # Record this worker as the call's owner so Plivo callbacks reach us
+            await self._register_call()
             
             logger.info(f"📊 Stream ID: {self.stream_sid}")
             logger.info(f"📊 Call ID: {call_id}")
             logger.info(f"📊 Account ID: {start_data.get('accountId')}")
             logger.info(f"📊 Media Format: {start_data.get('mediaFormat')}")
-            logger.info(f"📄 Full start event: {json.dumps(event, indent=2)}")
+            logger.info("📄 Full start event: %s", LazyJson(event, indent=2))
             
             # Critical check
             if self.stream_sid:
@@ -591,151 +915,199 @@ class TelephonyWebSocketHandler:
                 logger.error(f"❌ CRITICAL: No stream ID found in start event!")
                 logger.error(f"❌ Start data keys: {list(start_data.keys())}")
                 
-        elif event_type == "media":
-            # Only log Plivo event for first few or every 5 seconds
-            if self.messages_received <= 10:
-                logger.info(f"📞 Plivo event: {event_type}")
-            
-            # Handle base64 encoded audio from Plivo (μ-law format)
-            media_data = event.get("media", {})
-            payload = media_data.get("payload")
-            track = media_data.get("track", "inbound")
-            
-            if payload and self.audio_source:
-                if not self.connected:
-                    # Log connection issue but continue trying to connect
-                    if self.messages_received % 250 == 0:  # Much less frequent
-                        logger.warning(f"⚠️ LiveKit not connected yet (msg #{self.messages_received})")
-                
-                try:
-                    # Decode base64 audio data (μ-law format from Plivo)
-                    decoded_audio = base64.b64decode(payload)
-                    
-                    # Only process if we have a connected audio source
-                    if self.connected:
-                        await self.audio_source.push_audio_data(decoded_audio)
-                        self.stats["audio_frames_sent_to_livekit"] += 1
-                        self.stats["bytes_from_telephony"] += len(decoded_audio)
-                        
-                        # Log much less frequently
-                        if self.stats["audio_frames_sent_to_livekit"] % 250 == 0:
-                            logger.info(f"🎵 Processed {self.stats['audio_frames_sent_to_livekit']} audio frames from Plivo")
-                    else:
-                        # Count dropped frames
-                        if not hasattr(self, 'dropped_frames'):
-                            self.dropped_frames = 0
-                        self.dropped_frames += 1
-                        
-                except Exception as e:
-                    logger.error(f"❌ Error processing Plivo media: {e}")
-            elif not payload:
-                if self.messages_received <= 10:
-                    logger.warning("⚠️ Media event without payload")
-            elif not self.audio_source:
-                if self.messages_received <= 10:
-                    logger.warning("⚠️ Audio source not initialized")
-                    
         elif event_type == "stop":
             logger.info("🔴 CALL ENDED")
             logger.info(f"📞 Plivo event: {event_type}")
             self.call_active = False
-            await self.cleanup()
+            await self.cleanup("stop event")
             
         else:
-            logger.info(f"❓ Unknown Plivo event: {event_type}")
-            logger.info(f"📄 Event data: {json.dumps(event, indent=2)}")
+            logger.info("❓ Unknown Plivo event: %s", event_type)
+            logger.info("📄 Event data: %s", LazyJson(event, indent=2))
 
-    async def handle_binary_audio(self, audio_data):
-        """Handle binary audio data directly"""
-        if self.audio_source and self.connected:
-            try:
-                await self.audio_source.push_audio_data(audio_data)
-                self.stats["audio_frames_sent_to_livekit"] += 1
-                self.stats["bytes_from_telephony"] += len(audio_data)
-            except Exception as e:
-                logger.error(f"❌ Error processing binary audio: {e}")
-            
-    async def cleanup(self):
-        """Clean up resources"""
-        logger.info("🧹 Starting cleanup...")
+    async def _register_call(self):
+        """Index this handler by CallUUID/StreamId and register this worker as the call's owner"""
+        for key in (self.call_uuid, self.stream_sid):
+            if key:
+                calls_by_id[key] = self
+                try:
+                    await call_registry.register(key, WORKER_ID)
+                except Exception as e:
+                    logger.error(f"❌ Failed to register call {key}: {e}")
+
+    async def _unregister_call(self):
+        """Drop this call's keys from the local index and the shared call registry"""
+        for key in (self.call_uuid, self.stream_sid):
+            if key:
+                if calls_by_id.get(key) is self:
+                    del calls_by_id[key]
+                try:
+                    await call_registry.unregister(key)
+                except Exception as e:
+                    logger.error(f"❌ Failed to unregister call {key}: {e}")
+
+    def _record_send(self, latency):
+        """Packetizer callback: an agent audio chunk reached the provider socket"""
+        self.metrics.record_send(latency * 1000, self.packetizer.queue_depth)
+
+    def dropped_counts(self):
+        """Audio lost in each direction (queue overflow, no LiveKit yet, early-media overflow)"""
+        return {
+            "inbound": (self.inbound_queue.audio_dropped + getattr(self, "dropped_frames", 0)
+                        + self.early_media.samples_overwritten // TELEPHONY_PACKET_SAMPLES),
+            "outbound": self.packetizer.queue.audio_dropped,
+        }
+
+    def get_call_stats(self):
+        """Live view of this call for /calls/{room}/stats"""
+        return {
+            "room": self.room_name,
+            "call_uuid": self.call_uuid,
+            "stream_id": self.stream_sid,
+            "protocol": self.protocol.name,
+            "worker_id": WORKER_ID,
+            "duration_s": round(time.time() - self.connection_start_time, 1),
+            "setup_timings_ms": self.setup_timings,
+            "media": self.metrics.snapshot(self.dropped_counts()),
+            "counters": self.stats,
+            "barge_in": self.barge_in_stats,
+            "inbound_queue": self.inbound_queue.get_stats(),
+            "outbound": self.packetizer.get_stats(),
+        }
+
+    def _log_extra(self, sample_key=None):
+        """Per-call structured log fields; a `sample_key` rate-limits that event per call"""
+        extra = {"call": self.room_name}
+        if sample_key:
+            extra["sample_key"] = sample_key
+        return extra
+
+    async def cleanup(self, reason="connection closed"):
+        """Tear the call down once; later callers wait for the teardown already running"""
+        if self.teardown_task is None:
+            self.teardown_task = asyncio.ensure_future(self._teardown(reason))
+        await asyncio.shield(self.teardown_task)
+    
+    async def _teardown(self, reason):
+        """Stop this call's tasks, then release audio, room and socket in parallel"""
+        logger.info(f"🧹 Starting cleanup ({reason})...")
+        teardown_start = time.perf_counter()
         
         self.call_active = False
         
         # Remove from global tracking
-        try:
-            import __main__
-            if hasattr(__main__, 'active_handlers') and self in __main__.active_handlers:
-                __main__.active_handlers.remove(self)
-        except:
-            pass
+        if self in active_handlers:
+            active_handlers.remove(self)
+        await self._unregister_call()
         
-        # Cancel audio streaming task
-        if self.audio_stream_task and not self.audio_stream_task.done():
-            logger.info("🔄 Cancelling audio stream task...")
-            self.audio_stream_task.cancel()
-            try:
-                await asyncio.wait_for(self.audio_stream_task, timeout=2.0)
-            except (asyncio.CancelledError, asyncio.TimeoutError):
-                pass
+        # Stop the per-call tasks (the inbound task may be the one that asked for teardown)
+        self.inbound_queue.close()
+        self.packetizer.close()
+        tasks = [
+            task for task in (self.audio_stream_task, self.packetizer_task, self.inbound_task)
+            if task and not task.done()
+        ]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks, timeout=2.0)
+        
+        # Release everything else concurrently
+        was_connected = self.connected
+        self.connected = False
+        await asyncio.gather(
+            self._cleanup_audio_source(),
+            self._disconnect_room(was_connected),
+            self._close_websocket(),
+            self._release_room(),
+            return_exceptions=True
+        )
+        
+        self.teardown_ms = (time.perf_counter() - teardown_start) * 1000
+        record_teardown(self.teardown_ms)
+        
+        await release_admission(self.room_name)
+        
+        dropped = self.dropped_counts()
+        call_metrics_totals.add_completed(self.metrics, dropped)
+        media_summary = self.metrics.compact_summary(dropped)
+        if CALL_METRICS_TO_DB:
+            asyncio.create_task(store_call_media_summary(self.room_name, media_summary))
         
-        # Cleanup audio source
+        # Log final statistics
+        elapsed = time.time() - self.connection_start_time
+        dropped_frames = getattr(self, 'dropped_frames', 0)
+        
+        logger.info(f"📊 Session Summary:")
+        logger.info(f"   Duration: {elapsed:.1f}s")
+        logger.info(f"   Teardown: {self.teardown_ms:.0f}ms ({reason})")
+        logger.info(f"   Messages: {self.messages_received} received, {self.messages_sent} sent")
+        logger.info(f"   Audio to LiveKit: {self.stats['audio_frames_sent_to_livekit']} frames, {self.stats['bytes_from_telephony']} bytes")
+        logger.info(f"   Audio from Agent: {self.stats['audio_frames_received_from_agent']} frames, {self.stats['bytes_to_telephony']} bytes")
+        logger.info(f"   Inbound queue: {self.inbound_queue.get_stats()}")
+        logger.info(f"   Outbound packetizer: {self.packetizer.get_stats()}")
+        logger.info(f"   Barge-in: {self.barge_in_stats}")
+        logger.info("   Media quality: %s", LazyJson(media_summary))
+        if self.comfort_noise:
+            logger.info(f"   Comfort noise: {self.comfort_noise.get_stats()}")
+        logger.info(f"   Dropped frames (no LiveKit): {dropped_frames}")
+        logger.info(f"   Early media: {self.early_media.get_stats()}")
+        logger.info(f"   Agent: {'Found' if self.agent_participant else 'Not found'}")
+        logger.info("✅ Handler cleanup complete")
+    
+    async def _cleanup_audio_source(self):
         if self.audio_source:
             try:
                 await self.audio_source.cleanup()
             except Exception as e:
                 logger.error(f"❌ Error cleaning up audio source: {e}")
-            
+    
+    async def _disconnect_room(self, was_connected):
         # Disconnect from LiveKit room
-        if self.room and self.connected:
+        if self.room and was_connected:
             try:
-                self.connected = False
                 await asyncio.wait_for(self.room.disconnect(), timeout=3.0)
                 logger.info("✅ Disconnected from LiveKit room")
             except asyncio.TimeoutError:
                 logger.warning("⚠️ LiveKit disconnect timeout")
             except Exception as e:
                 logger.error(f"❌ Error disconnecting from LiveKit: {e}")
-        
-        # Log final statistics
-        elapsed = time.time() - self.connection_start_time
-        dropped_frames = getattr(self, 'dropped_frames', 0)
-        
-        logger.info(f"📊 Session Summary:")
-        logger.info(f"   Duration: {elapsed:.1f}s")
-        logger.info(f"   Messages: {self.messages_received} received, {self.messages_sent} sent")
-        logger.info(f"   Audio to LiveKit: {self.stats['audio_frames_sent_to_livekit']} frames, {self.stats['bytes_from_telephony']} bytes")
-        logger.info(f"   Audio from Agent: {self.stats['audio_frames_received_from_agent']} frames, {self.stats['bytes_to_telephony']} bytes")
-        logger.info(f"   Dropped frames (no LiveKit): {dropped_frames}")
-        logger.info(f"   Agent: {'Found' if self.agent_participant else 'Not found'}")
-        
-        # Clean up room after call ends - try to end the room nicely
-        if self.room_name:
-            logger.info(f"🧹 Notifying room cleanup: {self.room_name}")
+    
+    async def _close_websocket(self):
+        # Hangup-driven teardown: end the Plivo stream so the reader loop exits too
+        if websocket_is_open(self.websocket):
             try:
-                # Create API instance to clean up room
-                lkapi = api.LiveKitAPI(LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
-                
-                # List participants to see if room is empty
-                try:
-                    participants = await lkapi.room.list_participants(api.ListParticipantsRequest(room=self.room_name))
-                    logger.info(f"📊 Room {self.room_name} has {len(participants.participants)} participants remaining")
-                    
-                    # If only the agent is left, we could disconnect it
-                    if len(participants.participants) == 1:
-                        remaining = participants.participants[0]
-                        if self._is_agent_participant_identity(remaining.identity):
-                            logger.info(f"🤖 Only agent left in room, considering cleanup...")
-                            # Let the agent finish gracefully - it should disconnect when it detects no human participants
-                            
-                except Exception as e:
-                    logger.error(f"❌ Error checking room participants: {e}")
-                
-                await lkapi.aclose()
-                
+                await asyncio.wait_for(self.websocket.close(), timeout=2.0)
             except Exception as e:
-                logger.error(f"❌ Error during room cleanup: {e}")
+                logger.warning(f"⚠️ Error closing Plivo WebSocket: {e}")
+    
+    async def _release_room(self):
+        if not self.room_name:
+            return
+        if TEARDOWN_DELETE_ROOM:
+            # Deleting the room disconnects the agent at once, freeing its worker for the next call
+            try:
+                await livekit_service.delete_room(self.room_name)
+                logger.info(f"🗑️ Deleted room {self.room_name}")
+            except Exception as e:
+                logger.error(f"❌ Error deleting room {self.room_name}: {e}")
+            return
+        
+        logger.info(f"🧹 Notifying room cleanup: {self.room_name}")
+        try:
+            # List participants to see if room is empty (shared keep-alive API client)
+            participants = await livekit_service.list_participants(self.room_name)
+            logger.info(f"📊 Room {self.room_name} has {len(participants)} participants remaining")
             
-        logger.info("✅ Handler cleanup complete")
+            # If only the agent is left, we could disconnect it
+            if len(participants) == 1:
+                remaining = participants[0]
+                if self._is_agent_participant_identity(remaining.identity):
+                    logger.info(f"🤖 Only agent left in room, considering cleanup...")
+                    # Let the agent finish gracefully - it should disconnect when it detects no human participants
+                    
+        except Exception as e:
+            logger.error(f"❌ Error checking room participants: {e}")
     
     def _is_agent_participant_identity(self, identity: str) -> bool:
         """Check if identity string belongs to an agent"""
@@ -744,42 +1116,178 @@ class TelephonyWebSocketHandler:
         return any(pattern in identity for pattern in agent_patterns)
 
 
+async def publish_telephony_track(room):
+    """Create the telephony audio source and publish it as a microphone track"""
+    audio_source = TelephonyAudioSource()
+    audio_track = rtc.LocalAudioTrack.create_audio_track(
+        "telephony-audio", 
+        audio_source
+    )
+    
+    # Publish with microphone source
+    options = rtc.TrackPublishOptions()
+    options.source = rtc.TrackSource.SOURCE_MICROPHONE
+    
+    publication = await room.local_participant.publish_track(
+        audio_track,
+        options
+    )
+    return audio_source, audio_track, publication
+
+
+async def prewarm_room(room_name: str) -> WarmRoom:
+    """Create a room with a connected telephony participant and published track"""
+    try:
+        await livekit_service.create_room(room_name)
+    except Exception as e:
+        logger.info(f"ℹ️ Room creation result (may already exist): {e}")
+    
+    token = livekit_service.create_token(f"telephony-{uuid.uuid4()}", PARTICIPANT_NAME, room_name)
+    room = rtc.Room()
+    await asyncio.wait_for(room.connect(LIVEKIT_URL, token), timeout=10.0)
+    audio_source, audio_track, publication = await publish_telephony_track(room)
+    
+    agent_dispatched = False
+    if ROOM_POOL_DISPATCH_AGENT:
+        agent_dispatched = await trigger_agent(room_name)
+    
+    return WarmRoom(
+        room_name=room_name,
+        room=room,
+        audio_source=audio_source,
+        audio_track=audio_track,
+        publication=publication,
+        agent_dispatched=agent_dispatched
+    )
+
+
+async def discard_warm_room(warm_room: WarmRoom):
+    """Tear down an unused warm room"""
+    await warm_room.audio_source.cleanup()
+    await asyncio.wait_for(warm_room.room.disconnect(), timeout=3.0)
+    await livekit_service.delete_room(warm_room.room_name)
+
+
+# Warm rooms live in one process, and with SO_REUSEPORT the Plivo WebSocket
+# may land on a different worker than the XML request, so the pool is single-worker only
+room_pool = RoomPool(
+    prewarm_room, discard_warm_room,
+    min_size=ROOM_POOL_MIN,
+    max_size=ROOM_POOL_MAX,
+    max_idle_s=ROOM_POOL_MAX_IDLE_S
+) if ROOM_POOL_MAX > 0 and BRIDGE_WORKERS <= 1 else None
+
 #New Changes
-async def trigger_agent(room_name: str):
-    """Launch agent in the specified LiveKit room - OPTIMIZED VERSION"""
-    logger.info(f"🚀 Triggering agent for room: {room_name}")
+async def trigger_agent(room_name: str, name: str = None):
+    """Dispatch the agent (the tenant's, else the default) to the specified LiveKit room via the shared API client"""
+    name = name or agent_name
+    logger.info(f"🚀 Triggering agent {name} for room: {room_name}")
     try:
-        # NO DELAY - start agent immediately
-        logger.info(f"�� Dispatching agent to room: {room_name}")
-        
-        # Use Popen for non-blocking execution
-        result = subprocess.Popen([
-            "lk", "dispatch", "create",
-            "--room", room_name,
-            "--agent-name", agent_name
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        
-        logger.info(f"✅ Agent dispatch command executed immediately (PID: {result.pid})")
-        
-        # Optional: Check if command started successfully
-        # Give it a moment to start, but don't wait for completion
-        await asyncio.sleep(0.1)  # Just 100ms to let process start
+        dispatch = await livekit_service.dispatch_agent(room_name, name)
+        dispatch_ms = livekit_service.timings["dispatch_agent"]["last_ms"]
+        logger.info(f"✅ Agent dispatch created: {dispatch.id} ({dispatch_ms:.0f}ms)")
+        return True
         
-        if result.poll() is None:  # Process is still running
-            logger.info(f"✅ Agent process started successfully")
+    except Exception as e:
+        logger.error(f"❌ Error dispatching agent: {e}")
+        return False
+
+def record_teardown(elapsed_ms):
+    """Add one call teardown to the process-wide teardown statistics"""
+    teardown_stats["count"] += 1
+    teardown_stats["total_ms"] += elapsed_ms
+    teardown_stats["max_ms"] = max(teardown_stats["max_ms"], elapsed_ms)
+    teardown_stats["last_ms"] = elapsed_ms
+
+def get_teardown_stats():
+    """Get call teardown latency statistics"""
+    count = teardown_stats["count"]
+    return {
+        "count": count,
+        "avg_ms": round(teardown_stats["total_ms"] / count, 1) if count else None,
+        "max_ms": round(teardown_stats["max_ms"], 1),
+        "last_ms": round(teardown_stats["last_ms"], 1),
+    }
+
+def teardown_call(key, reason):
+    """Start tearing down the call indexed under `key`; returns False if it is not on this worker"""
+    handler = calls_by_id.get(key)
+    if handler is None:
+        return False
+    asyncio.create_task(handler.cleanup(reason))
+    return True
+
+async def store_call_media_summary(room_name, summary):
+    """Merge the bridge's media summary into calls.call_metadata (queued, retried DB write)"""
+    try:
+        from database.db_manager import update_call_metadata_optimized
+        await update_call_metadata_optimized(room_name, {"bridge_media": summary})
+    except Exception as e:
+        logger.error(f"❌ Failed to store media summary for {room_name}: {e}")
+
+def start_drain(reason, deadline_s=None):
+    """Enter drain mode (idempotent); asking again while draining moves the deadline to now"""
+    now = time.time()
+    if drain_state["draining"]:
+        drain_state["deadline"] = now
+        logger.warning(f"⏹️ Drain requested again ({reason}); ending {len(active_handlers)} remaining calls now")
+        return False
+    deadline_s = WORKER_DRAIN_TIMEOUT_S if deadline_s is None else deadline_s
+    drain_state.update(draining=True, reason=reason, started_at=now, deadline=now + deadline_s)
+    logger.info(f"🚰 Draining ({reason}): no new calls, {len(active_handlers)} active calls have up to {deadline_s:.0f}s")
+    drain_requested.set()
+    return True
+
+def drain_status():
+    """Drain progress for /health and the worker health report"""
+    if not drain_state["draining"]:
+        return {"draining": False}
+    now = time.time()
+    return {
+        "draining": True,
+        "reason": drain_state["reason"],
+        "remaining_calls": len(active_handlers),
+        "elapsed_s": round(now - drain_state["started_at"], 1),
+        "deadline_in_s": round(max(0.0, drain_state["deadline"] - now), 1),
+    }
+
+def rejection_reason():
+    """Why a new call would be turned away right now, or None if it would be accepted"""
+    if drain_state["draining"]:
+        return "draining"
+    if not load_monitor.accepting(len(active_handlers)):
+        return "overloaded"
+    return None
+
+async def release_admission(room_name, reservation_only=False):
+    """Free a call's admission slot; a failure reaching the shared controller is logged, not raised"""
+    try:
+        if reservation_only:
+            await admission.release_reservation(room_name)
         else:
-            # Process ended quickly, check for errors
-            stdout, stderr = result.communicate()
-            if result.returncode != 0:
-                logger.error(f"❌ Agent dispatch failed: {stderr.decode()}")
-            else:
-                logger.info(f"✅ Agent dispatch completed: {stdout.decode()}")
-        
+            await admission.release(room_name)
     except Exception as e:
-        logger.error(f"❌ Error launching agent: {e}")
+        logger.error(f"❌ Failed to release admission for room {room_name}: {e}")
+
+def queue_stats():
+    """Current depth, drops and worst dwell time of every active call's bridge queues"""
+    totals = {}
+    for handler in active_handlers:
+        for queue in (handler.inbound_queue, handler.packetizer.queue):
+            stats = queue.get_stats()
+            prefix = queue.name
+            for key in ("queue_depth", "queue_audio_dropped"):
+                name = f"{prefix}_{key}"
+                totals[name] = totals.get(name, 0) + stats[name]
+            name = f"{prefix}_queue_max_dwell_ms"
+            totals[name] = max(totals.get(name, 0.0), stats[name])
+    return totals
 
 async def handle_telephony_websocket(websocket, path):
     """Handle incoming WebSocket connections from Plivo - OPTIMIZED"""
+    room_name = None
+    admitted = False
+    message_task = None
     try:
         logger.info(f"🔗 NEW PLIVO WEBSOCKET CONNECTION")
         logger.info(f"📍 Path: {path}")
@@ -788,36 +1296,77 @@ async def handle_telephony_websocket(websocket, path):
         parsed_url = urlparse(path)
         query = parse_qs(parsed_url.query)
         room_name = query.get("room", [f"plivo-room-{uuid.uuid4()}"])[0]
+        protocol_name = query.get("protocol", [DEFAULT_PROVIDER_PROTOCOL])[0]
+        tenant = admission.resolve_tenant({key: values[0] for key, values in query.items()})
         
-        logger.info(f"📞 Room: {room_name}")
+        logger.info(f"📞 Room: {room_name} ({protocol_name} protocol, tenant {tenant})")
+        
+        # Draining or overloaded: refuse the stream before any per-call work (1013 = try again later)
+        reason = rejection_reason()
+        if reason:
+            if reason == "overloaded":
+                load_monitor.shed(f"stream for room {room_name}")
+            else:
+                logger.info(f"🚰 Refusing stream for room {room_name}: draining")
+            await release_admission(room_name, reservation_only=True)
+            await websocket.close(code=1013, reason=f"bridge {reason}")
+            return
         
         # Create handler for Plivo WebSocket
-        handler = TelephonyWebSocketHandler(room_name, websocket)
+        try:
+            protocol = get_provider_protocol(protocol_name, TELEPHONY_SAMPLE_RATE)
+        except ValueError as e:
+            logger.error(f"❌ {e}")
+            await release_admission(room_name, reservation_only=True)
+            await websocket.close(code=1008, reason="unknown protocol")
+            return
+        
+        # Keep the slot taken when Plivo fetched the XML; streams without one (direct connections,
+        # expired reservations) are admitted here without queueing. A room whose call is already
+        # live is refused, and its slot is left alone.
+        if not await admission.claim(room_name, worker=WORKER_ID):
+            denied = await admission.try_admit(tenant, room_name, worker=WORKER_ID)
+            if denied:
+                logger.warning(f"🚦 Refusing stream for room {room_name}: tenant {tenant} at limit ({denied})")
+                await websocket.close(code=1013, reason=f"tenant limit: {denied}")
+                return
+        admitted = True
+        handler = TelephonyWebSocketHandler(room_name, websocket, protocol)
+        active_handlers.append(handler)
+        warm_room = room_pool.claim(room_name) if room_pool else None
         
         # OPTIMIZATION: Start all tasks concurrently
-        logger.info(f"🚀 Starting concurrent setup...")
+        logger.info(f"🚀 Starting concurrent setup ({'warm' if warm_room else 'cold'} room)...")
         
         # Start all three tasks at the same time
-        livekit_task = asyncio.create_task(handler.connect_to_livekit())
-        agent_task = asyncio.create_task(trigger_agent(room_name))
+        if warm_room:
+            livekit_task = asyncio.create_task(handler.attach_warm_room(warm_room))
+        else:
+            livekit_task = asyncio.create_task(handler.connect_to_livekit())
+        agent_task = None
+        if not (warm_room and warm_room.agent_dispatched):
+            agent_task = asyncio.create_task(trigger_agent(room_name, admission.agent_name(tenant, agent_name)))
         message_task = asyncio.create_task(handler.handle_messages())
         
         # Wait for LiveKit connection with shorter timeout
         try:
             success = await asyncio.wait_for(livekit_task, timeout=8.0)  # Reduced from 15s
             if success:
-                logger.info(f"✅ LiveKit connected for room: {room_name}")
+                handler.setup_timings["total"] = round((time.time() - handler.connection_start_time) * 1000, 1)
+                logger.info(f"✅ LiveKit connected for room: {room_name} "
+                           f"(setup {handler.setup_timings['total']:.0f}ms, {'warm' if warm_room else 'cold'})")
             else:
                 logger.error("❌ LiveKit connection failed")
         except asyncio.TimeoutError:
             logger.error("❌ LiveKit connection timeout (8s)")
         
-        # Agent task should complete quickly (just process start)
-        try:
-            await asyncio.wait_for(agent_task, timeout=2.0)
-            logger.info("✅ Agent dispatch completed")
-        except asyncio.TimeoutError:
-            logger.warning("⚠️ Agent dispatch took longer than expected")
+        # Agent dispatch is a single API call on the shared client
+        if agent_task:
+            try:
+                await asyncio.wait_for(agent_task, timeout=2.0)
+                logger.info("✅ Agent dispatch completed")
+            except asyncio.TimeoutError:
+                logger.warning("⚠️ Agent dispatch took longer than expected")
         
         # Wait for message handling to complete
         await message_task
@@ -827,38 +1376,92 @@ async def handle_telephony_websocket(websocket, path):
         import traceback
         traceback.print_exc()
         try:
-            if not websocket.closed:
+            if websocket_is_open(websocket):
                 await websocket.close(code=1011, reason=str(e))
         except:
             pass
+        # Once the message loop runs, the handler's cleanup releases the slot
+        if admitted and message_task is None:
+            await release_admission(room_name)
+        elif room_name:
+            await release_admission(room_name, reservation_only=True)
 #New Changes
 
-async def start_websocket_server():
+async def start_websocket_server(reuse_port=False):
     """Start the WebSocket server for Plivo connections"""
-    logger.info("🌐 WebSocket server starting on ws://0.0.0.0:8765")
+    logger.info(f"🌐 WebSocket server starting on ws://0.0.0.0:{WEBSOCKET_PORT}")
     
     async def websocket_handler(websocket):
         try:
-            path = websocket.path if hasattr(websocket, 'path') else "/"
+            if hasattr(websocket, 'path'):
+                path = websocket.path
+            elif hasattr(websocket, 'request'):
+                path = websocket.request.path
+            else:
+                path = "/"
             await handle_telephony_websocket(websocket, path)
         except Exception as e:
             logger.error(f"❌ Error in websocket handler: {e}")
     
     # Start the server
-    async with websockets.serve(websocket_handler, "0.0.0.0", 8765):
-        logger.info("✅ WebSocket server listening on ws://0.0.0.0:8765")
-        logger.info("🔧 Ready for Plivo WebSocket connections")
-        logger.info("📋 Plivo should connect to: ws://sbi.vaaniresearch.com:8765/?room=your_room_name")
-        await asyncio.Future()
+    server = await websockets.serve(websocket_handler, "0.0.0.0", WEBSOCKET_PORT, reuse_port=reuse_port)
+    logger.info(f"✅ WebSocket server listening on ws://0.0.0.0:{WEBSOCKET_PORT}")
+    logger.info("🔧 Ready for Plivo WebSocket connections")
+    logger.info(f"📋 Plivo should connect to: ws://sbi.vaaniresearch.com:{WEBSOCKET_PORT}/?room=your_room_name")
+    return server
 
-async def start_http_server():
+def worker_socket_path(worker_id):
+    """Private Unix socket on which a worker serves callbacks forwarded by its peers"""
+    return os.path.join(BRIDGE_RUN_DIR, f"worker-{worker_id}.sock")
+
+async def forward_to_worker(worker_id, request, data):
+    """Relay a Plivo callback to the worker that owns the call"""
+    async with aiohttp.ClientSession(connector=aiohttp.UnixConnector(path=worker_socket_path(worker_id))) as session:
+        async with session.post(
+            f"http://worker{request.path}",
+            json=data,
+            headers={FORWARDED_HEADER: str(WORKER_ID)},
+            timeout=aiohttp.ClientTimeout(total=5)
+        ) as response:
+            return web.Response(text=await response.text(), status=response.status)
+
+async def route_callback(request, data, *keys):
+    """Return a forwarded response if another worker owns the call, else None to handle it here"""
+    if request.headers.get(FORWARDED_HEADER):
+        return None
+    for key in keys:
+        if not key or key == 'unknown':
+            continue
+        owner = await call_registry.lookup(key)
+        if owner is not None and owner != WORKER_ID:
+            logger.info(f"↪️ Forwarding {request.path} for {key} to worker {owner}")
+            return await forward_to_worker(owner, request, data)
+    return None
+
+async def start_http_server(reuse_port=False, unix_path=None):
     """Start HTTP server for API endpoints"""
     
     async def handle_health(request):
         """Health check endpoint"""
-        return web.json_response({
-            "status": "healthy",
+        try:
+            workers = await call_registry.workers()
+        except Exception as e:
+            logger.error(f"❌ Error reading worker health: {e}")
+            workers = {}
+        try:
+            admission_stats = await admission.get_stats()
+        except Exception as e:
+            logger.error(f"❌ Error reading admission stats: {e}")
+            admission_stats = {}
+        
+        capacity = load_monitor.capacity(len(active_handlers))
+        capacity["accepting"] = rejection_reason() is None
+        return json_response({
+            "status": rejection_reason() or "healthy",
             "timestamp": time.time(),
+            "worker_id": WORKER_ID,
+            "active_calls": len(active_handlers),
+            "workers": workers,
             "services": {
                 "websocket": "running",
                 "http": "running",
@@ -867,34 +1470,136 @@ async def start_http_server():
             "config": {
                 "telephony_sample_rate": TELEPHONY_SAMPLE_RATE,
                 "livekit_sample_rate": LIVEKIT_SAMPLE_RATE,
+                "agent_stream_sample_rate": AGENT_STREAM_SAMPLE_RATE,
+                "resampler_quality": RESAMPLER_QUALITY.value,
+                "provider_protocol": DEFAULT_PROVIDER_PROTOCOL,
+                "runtime": fast_runtime.runtime_info(),
                 "websocket_url": CALLBACK_WS_URL
-            }
+            },
+            "livekit_api_latency": livekit_service.get_stats(),
+            "room_pool": room_pool.get_stats() if room_pool else None,
+            "queues": queue_stats(),
+            "teardown": get_teardown_stats(),
+            "capacity": capacity,
+            "admission": admission_stats,
+            "drain": drain_status()
         })
 
+    async def handle_ready(request):
+        """Readiness probe: 503 while draining or shedding load so balancers route new calls elsewhere"""
+        reason = rejection_reason()
+        capacity = load_monitor.capacity(len(active_handlers))
+        capacity["accepting"] = reason is None
+        return json_response({**capacity, "status": reason or "ready", "drain": drain_status()},
+                             status=503 if reason else 200)
+
+    async def handle_drain(request):
+        """
+        Admin: start draining. Optional `scope` and `deadline_s` (JSON body or query).
+        scope=node (default under the supervisor) drains every worker and stops the node;
+        scope=worker drains only the worker that took the request, which the supervisor then replaces.
+        """
+        if BRIDGE_ADMIN_TOKEN and request.headers.get("X-Admin-Token") != BRIDGE_ADMIN_TOKEN:
+            return json_response({"error": "forbidden"}, status=403)
+        try:
+            data = await request.json() if request.can_read_body else {}
+            scope = data.get("scope", request.query.get("scope", "node" if BRIDGE_WORKERS > 1 else "worker"))
+            deadline_s = data.get("deadline_s", request.query.get("deadline_s"))
+            deadline_s = float(deadline_s) if deadline_s is not None else None
+        except (ValueError, TypeError, AttributeError) as e:
+            return json_response({"error": f"invalid drain request: {e}"}, status=400)
+        
+        if scope == "node" and BRIDGE_WORKERS > 1:
+            # The supervisor sends SIGTERM to every worker, so they drain together (deadline WORKER_DRAIN_TIMEOUT_S)
+            logger.info("🚰 Admin drain: signalling the supervisor to drain all workers")
+            os.kill(os.getppid(), signal.SIGTERM)
+            return json_response({"status": "draining", "scope": "node", "worker_id": WORKER_ID})
+        
+        start_drain("admin request", deadline_s)
+        return json_response({"status": "draining", "scope": "worker", "worker_id": WORKER_ID, **drain_status()})
+
+    async def handle_call_stats(request):
+        """Live media quality and timing for one call on this worker"""
+        room = request.match_info["room"]
+        for handler in active_handlers:
+            if handler.room_name == room:
+                return json_response(handler.get_call_stats())
+        return json_response({"error": f"No active call for room {room} on worker {WORKER_ID}"}, status=404)
+
+    async def handle_metrics(request):
+        """Prometheus exposition: cumulative per-worker media histograms plus live gauges"""
+        capacity = load_monitor.capacity(len(active_handlers))
+        text = call_metrics_totals.prometheus(
+            live=[(handler.metrics, handler.dropped_counts()) for handler in active_handlers],
+            gauges={
+                "active_calls": len(active_handlers),
+                "accepting_calls": int(capacity["accepting"]),
+                "event_loop_lag_ms": capacity["loop_lag_ms"],
+                "processing_p95_ms": capacity["processing_p95_ms"],
+            },
+            labels=f'worker="{WORKER_ID}"'
+        )
+        # Admission state is node-wide (held by the supervisor), so it carries no worker label
+        try:
+            text += await admission.prometheus()
+        except Exception as e:
+            logger.error(f"❌ Error reading admission metrics: {e}")
+        return web.Response(text=text, content_type="text/plain", headers={"X-Content-Type-Options": "nosniff"})
+
     async def handle_trigger_room(request):
         """Trigger agent in a specific room"""
         try:
             data = await request.json()
             room = data["room"]
+            name = admission.agent_name(data["tenant"], agent_name) if data.get("tenant") else agent_name
             
             logger.info(f"🎯 Manual agent trigger for room: {room}")
-            asyncio.create_task(trigger_agent(room))
+            asyncio.create_task(trigger_agent(room, name))
             
-            return web.json_response({
+            return json_response({
                 "status": "triggered",
                 "room": room,
                 "message": f"Agent triggered for room {room}"
             })
         except Exception as e:
             logger.error(f"❌ Error triggering agent: {e}")
-            return web.json_response({"error": str(e)}, status=400)
+            return json_response({"error": str(e)}, status=400)
+
+    def busy_response():
+        hangup = '<Hangup reason="busy"/>' if LOAD_SHED_RESPONSE == "busy" else "<Hangup/>"
+        return web.Response(text=f"<?xml version='1.0' encoding='UTF-8'?><Response>{hangup}</Response>",
+                            content_type="text/xml")
 
     async def handle_plivo_xml(request):
         """Return Plivo XML for call flow - /plivo-app/plivo.xml"""
+        held = None
         try:
-            # Get room name from query parameters
-            room = request.query.get("room", f"plivo-room-{uuid.uuid4()}")
-            logger.info(f"📋 Generating Plivo XML for room: {room}")
+            # Draining or overloaded: turn the call away instead of degrading every call in progress
+            reason = rejection_reason()
+            if reason:
+                if reason == "overloaded":
+                    load_monitor.shed("Plivo call")
+                else:
+                    logger.info("🚰 Rejecting Plivo call: draining")
+                return busy_response()
+            
+            # Tenant limits: wait briefly in the tenant's queue for a slot, else turn the call away
+            tenant = admission.resolve_tenant(request.query)
+            room = request.query.get("room")
+            slot = room or f"plivo-room-{uuid.uuid4()}"
+            denied = await admission.admit(tenant, slot, worker=WORKER_ID)
+            if denied:
+                logger.warning(f"🚦 Rejecting Plivo call for tenant {tenant}: {denied}")
+                return busy_response()
+            held = slot
+            
+            # Room name from query parameters, else reserve a pre-warmed room
+            if room is None and room_pool:
+                room = room_pool.reserve()
+                if room:
+                    await admission.rename(slot, room)
+            room = held = room or slot
+            logger.info(f"📋 Generating Plivo XML for room: {room} (tenant {tenant})")
             
             # Plivo XML response for audio streaming
             response_text = f"""<?xml version="1.0" encoding="UTF-8"?>
@@ -905,7 +1610,7 @@ async def start_http_server():
         contentType="audio/x-mulaw;rate=8000"
         streamTimeout="3600"
         statusCallbackUrl="{request.url.scheme}://{request.host}/plivo-app/stream-status"
-    >{CALLBACK_WS_URL}/?room={room}</Stream>
+    >{CALLBACK_WS_URL}/?room={room}&amp;tenant={quote(tenant, safe="")}</Stream>
 </Response>"""
             
             logger.info(f"📋 Returning Plivo XML for room: {room}")
@@ -913,6 +1618,9 @@ async def start_http_server():
             
         except Exception as e:
             logger.error(f"❌ Error generating Plivo XML: {e}")
+            # The call is hung up, so its stream will never claim the slot
+            if held:
+                await release_admission(held)
             return web.Response(text="<?xml version='1.0' encoding='UTF-8'?><Response><Hangup/></Response>", 
                               content_type="text/xml", status=500)
 
@@ -929,6 +1637,12 @@ async def start_http_server():
                 data = dict(request.query)
             
             call_uuid = data.get('CallUUID', data.get('call_uuid', 'unknown'))
+            
+            # Hand the callback to the worker that owns this call
+            forwarded = await route_callback(request, data, call_uuid)
+            if forwarded is not None:
+                return forwarded
+            
             hangup_cause = data.get('HangupCause', data.get('hangup_cause', 'unknown'))
             hangup_source = data.get('HangupSource', data.get('hangup_source', 'unknown'))
             call_duration = data.get('Duration', data.get('duration', '0'))
@@ -939,8 +1653,9 @@ async def start_http_server():
             logger.info(f"   Duration: {call_duration}s")
             logger.info(f"   Full data: {data}")
             
-            # Here you can add custom logic for call cleanup if needed
-            # For example, notify other services, update databases, etc.
+            # Tear the call down now rather than waiting for Plivo to close the stream
+            if teardown_call(call_uuid, f"hangup: {hangup_cause}"):
+                logger.info(f"⚡ Tearing down call {call_uuid} on hangup")
             
             return web.Response(text="OK", status=200)
             
@@ -961,13 +1676,23 @@ async def start_http_server():
             
             stream_id = data.get('StreamId', data.get('stream_id', 'unknown'))
             call_uuid = data.get('CallUUID', data.get('call_uuid', 'unknown'))
-            status = data.get('Status', data.get('status', 'unknown'))
+            
+            # Hand the callback to the worker that owns this stream
+            forwarded = await route_callback(request, data, stream_id, call_uuid)
+            if forwarded is not None:
+                return forwarded
+            
+            status = data.get('Status', data.get('status', data.get('Event', 'unknown')))
             
             logger.info(f"🌊 STREAM STATUS - Stream: {stream_id}")
             logger.info(f"   Call: {call_uuid}")
             logger.info(f"   Status: {status}")
             logger.info(f"   Full data: {data}")
             
+            if str(status).lower() in STREAM_TERMINAL_STATUSES:
+                if teardown_call(stream_id, f"stream {status}") or teardown_call(call_uuid, f"stream {status}"):
+                    logger.info(f"⚡ Tearing down stream {stream_id} on status {status}")
+            
             return web.Response(text="OK", status=200)
             
         except Exception as e:
@@ -987,20 +1712,24 @@ async def start_http_server():
             # This would require Plivo credentials - implement if needed
             # result = initiate_plivo_call(to_number, from_number, room)
             
-            return web.json_response({
+            return json_response({
                 "status": "not_implemented",
                 "room": room,
                 "message": f"Call triggering not implemented - add Plivo credentials and uncomment code"
             })
         except Exception as e:
             logger.error(f"❌ Error triggering call: {e}")
-            return web.json_response({"error": str(e)}, status=400)
+            return json_response({"error": str(e)}, status=400)
 
     # Create web application
     app = web.Application()
     
     # Health and utility endpoints
     app.router.add_get("/health", handle_health)
+    app.router.add_get("/ready", handle_ready)
+    app.router.add_post("/admin/drain", handle_drain)
+    app.router.add_get("/metrics", handle_metrics)
+    app.router.add_get("/calls/{room}/stats", handle_call_stats)
     app.router.add_post("/trigger", handle_trigger_room)
     
     # Plivo-specific endpoints
@@ -1016,15 +1745,71 @@ async def start_http_server():
     # Start server
     runner = web.AppRunner(app)
     await runner.setup()
-    site = web.TCPSite(runner, "0.0.0.0", 8080)
+    site = web.TCPSite(runner, "0.0.0.0", HTTP_PORT, reuse_port=reuse_port)
     await site.start()
-    logger.info("🌐 HTTP server listening on http://0.0.0.0:8080")
-    logger.info("📋 Plivo XML endpoint: http://0.0.0.0:8080/plivo-app/plivo.xml")
-    logger.info("📞 Plivo hangup callback: http://0.0.0.0:8080/plivo-app/hangup")
+    if unix_path:
+        # Private socket for callbacks forwarded by sibling workers
+        if os.path.exists(unix_path):
+            os.unlink(unix_path)
+        await web.UnixSite(runner, unix_path).start()
+    logger.info(f"🌐 HTTP server listening on http://0.0.0.0:{HTTP_PORT}")
+    logger.info(f"📋 Plivo XML endpoint: http://0.0.0.0:{HTTP_PORT}/plivo-app/plivo.xml")
+    logger.info(f"📞 Plivo hangup callback: http://0.0.0.0:{HTTP_PORT}/plivo-app/hangup")
+    return runner
+
+async def cleanup_all_handlers():
+    """Clean up all active handlers"""
+    logger.info(f"🧹 Cleaning up {len(active_handlers)} active handlers...")
+    cleanup_tasks = []
+    for handler in active_handlers.copy():
+        if hasattr(handler, 'cleanup'):
+            cleanup_tasks.append(handler.cleanup())
+    
+    if cleanup_tasks:
+        await asyncio.gather(*cleanup_tasks, return_exceptions=True)
+    active_handlers.clear()
+    logger.info("✅ All handlers cleaned up")
+
+async def report_worker_health():
+    """Periodically publish this worker's load to the call registry"""
+    while True:
+        try:
+            await call_registry.report_health(WORKER_ID, {
+                "pid": os.getpid(),
+                "active_calls": len(active_handlers),
+                "room_pool": room_pool.get_stats() if room_pool else None,
+                "teardown": get_teardown_stats(),
+                "capacity": load_monitor.capacity(len(active_handlers)),
+                "drain": drain_status(),
+            })
+        except Exception as e:
+            logger.error(f"❌ Error reporting worker health: {e}")
+        await asyncio.sleep(2.0)
 
-async def main():
+async def drain_active_calls():
+    """Wait for in-flight calls to finish on their own, up to the drain deadline"""
+    last_log = 0.0
+    while active_handlers and time.time() < drain_state["deadline"]:
+        if time.monotonic() - last_log >= 10.0:
+            logger.info(f"⏳ Draining: {len(active_handlers)} active calls remaining, "
+                        f"{drain_state['deadline'] - time.time():.0f}s to deadline")
+            last_log = time.monotonic()
+        await asyncio.sleep(0.5)
+    if active_handlers:
+        logger.warning(f"⏰ Drain deadline reached with {len(active_handlers)} calls still active; ending them")
+    else:
+        logger.info(f"✅ Drain complete after {time.time() - drain_state['started_at']:.1f}s")
+
+async def main(worker_id=0, registry=None, reuse_port=False, admission_controller=None):
     """Main function to run both servers"""
-    logger.info("🚀 Starting Telephony-LiveKit Bridge...")
+    global WORKER_ID, call_registry, admission
+    WORKER_ID = worker_id
+    if registry is not None:
+        call_registry = registry
+    if admission_controller is not None:
+        admission = admission_controller
+    
+    logger.info(f"🚀 Starting Telephony-LiveKit Bridge (worker {WORKER_ID}, pid {os.getpid()})...")
     logger.info("=" * 60)
     
     # Validate environment variables
@@ -1040,49 +1825,171 @@ async def main():
     logger.info("✅ All environment variables configured")
     logger.info(f"🔗 LiveKit URL: {LIVEKIT_URL}")
     logger.info(f"📞 WebSocket URL: {CALLBACK_WS_URL}")
-    logger.info(f"🎵 Audio Config: Telephony({TELEPHONY_SAMPLE_RATE}Hz) <-> LiveKit({LIVEKIT_SAMPLE_RATE}Hz)")
+    logger.info(f"🎵 Audio Config: Telephony({TELEPHONY_SAMPLE_RATE}Hz) <-> LiveKit({LIVEKIT_SAMPLE_RATE}Hz publish, "
+                f"{AGENT_STREAM_SAMPLE_RATE}Hz agent stream, {RESAMPLER_QUALITY.value} resampler)")
+    runtime = fast_runtime.runtime_info()
+    logger.info(f"⚡ Runtime: {runtime['event_loop']} event loop, {runtime['json']} JSON"
+                f"{' (fast mode)' if runtime['fast_runtime'] else ''}")
     logger.info("=" * 60)
     
-    # Global cleanup tracking
-    active_handlers = []
+    # Keep pre-warmed rooms topped up in the background
+    room_pool_task = asyncio.create_task(room_pool.run()) if room_pool else None
     
-    async def cleanup_all_handlers():
-        """Clean up all active handlers"""
-        logger.info(f"🧹 Cleaning up {len(active_handlers)} active handlers...")
-        cleanup_tasks = []
-        for handler in active_handlers.copy():
-            if hasattr(handler, 'cleanup'):
-                cleanup_tasks.append(handler.cleanup())
-        
-        if cleanup_tasks:
-            await asyncio.gather(*cleanup_tasks, return_exceptions=True)
-        active_handlers.clear()
-        logger.info("✅ All handlers cleaned up")
+    # SIGTERM/SIGINT (or POST /admin/drain) stop accepting new calls and drain the ones in flight;
+    # a second signal ends the remaining calls immediately
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, start_drain, signal.Signals(sig).name)
     
-    # Store cleanup function globally for handlers to register themselves
-    import __main__
-    __main__.active_handlers = active_handlers
-    __main__.cleanup_all_handlers = cleanup_all_handlers
+    health_task = asyncio.create_task(report_worker_health())
+    load_monitor_task = asyncio.create_task(load_monitor.run())
+    websocket_server = None
+    http_runner = None
     
     try:
         # Run both servers concurrently
         logger.info("🚀 Starting servers...")
-        await asyncio.gather(
-            start_websocket_server(),
-            start_http_server()
+        os.makedirs(BRIDGE_RUN_DIR, exist_ok=True)
+        websocket_server, http_runner = await asyncio.gather(
+            start_websocket_server(reuse_port=reuse_port),
+            start_http_server(reuse_port=reuse_port, unix_path=worker_socket_path(WORKER_ID))
         )
-    except KeyboardInterrupt:
-        logger.info("👋 Received shutdown signal")
+        await drain_requested.wait()
+        
+        # Stop taking new calls but keep live streams open (close() would drop them);
+        # the HTTP runner stays up so hangup callbacks and forwarded requests still arrive
+        websocket_server.close(close_connections=False)
+        if room_pool_task:
+            room_pool_task.cancel()
+        await drain_active_calls()
         await cleanup_all_handlers()
     except Exception as e:
         logger.error(f"❌ Server error: {e}")
         import traceback
         traceback.print_exc()
         await cleanup_all_handlers()
+    finally:
+        health_task.cancel()
+        load_monitor_task.cancel()
+        if room_pool_task:
+            room_pool_task.cancel()
+            await room_pool.aclose()
+        if websocket_server:
+            await websocket_server.wait_closed()
+        if http_runner:
+            await http_runner.cleanup()
+        await livekit_service.aclose()
+        await call_registry.aclose()
+        if isinstance(admission, UnixSocketAdmission):
+            await admission.aclose()
+
+def run_worker(worker_id, registry_path, admission_path):
+    """Entry point of a worker process spawned by the supervisor"""
+    try:
+        # The module-level controller only supplies tenant configuration; slots live in the supervisor
+        shared_admission = UnixSocketAdmission(admission_path, config=admission)
+        fast_runtime.run(main(worker_id, UnixSocketCallRegistry(registry_path), reuse_port=True,
+                              admission_controller=shared_admission))
+    except KeyboardInterrupt:
+        pass
+
+async def run_supervisor(num_workers):
+    """
+    Run `num_workers` bridge processes sharing the WebSocket and HTTP ports via
+    SO_REUSEPORT, serve the call registry and admission controller they share, and
+    restart workers that die.
+    """
+    os.makedirs(BRIDGE_RUN_DIR, exist_ok=True)
+    # Spawned workers re-import this module; let them see the real worker count
+    os.environ["BRIDGE_WORKERS"] = str(num_workers)
+    registry_path = os.path.join(BRIDGE_RUN_DIR, "registry.sock")
+    if os.path.exists(registry_path):
+        os.unlink(registry_path)
+    store = InMemoryCallRegistry()
+    registry_server = await serve_registry(registry_path, store)
+    logger.info(f"🗂️ Call registry serving on {registry_path}")
+    
+    # One admission controller for the node: the XML fetch and the stream may hit different workers
+    admission_path = os.path.join(BRIDGE_RUN_DIR, "admission.sock")
+    if os.path.exists(admission_path):
+        os.unlink(admission_path)
+    admission_server = await serve_registry(admission_path, admission)
+    logger.info(f"🚦 Admission control serving on {admission_path}")
+    
+    context = multiprocessing.get_context("spawn")
+    
+    def spawn(worker_id):
+        process = context.Process(target=run_worker, args=(worker_id, registry_path, admission_path), name=f"bridge-worker-{worker_id}")
+        process.start()
+        logger.info(f"👷 Started worker {worker_id} (pid {process.pid})")
+        return process
+    
+    workers = {worker_id: spawn(worker_id) for worker_id in range(num_workers)}
+    
+    shutdown = asyncio.Event()
+    
+    def on_signal():
+        if shutdown.is_set():
+            # Second signal: tell draining workers to end their remaining calls now
+            for process in workers.values():
+                if process.is_alive():
+                    os.kill(process.pid, signal.SIGTERM)
+        shutdown.set()
+    
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, on_signal)
+    
+    try:
+        while not shutdown.is_set():
+            try:
+                await asyncio.wait_for(shutdown.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+            if shutdown.is_set():
+                break
+            for worker_id, process in list(workers.items()):
+                if not process.is_alive():
+                    logger.warning(f"⚠️ Worker {worker_id} exited with code {process.exitcode}, restarting")
+                    await store.remove_worker(worker_id)
+                    await admission.release_worker(worker_id)
+                    workers[worker_id] = spawn(worker_id)
+    finally:
+        logger.info(f"👋 Stopping {len(workers)} workers...")
+        for process in workers.values():
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + WORKER_DRAIN_TIMEOUT_S + 5
+        for worker_id, process in workers.items():
+            await asyncio.to_thread(process.join, max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"⚠️ Worker {worker_id} did not exit in time, killing")
+                process.kill()
+            await store.remove_worker(worker_id)
+            await admission.release_worker(worker_id)
+        registry_server.close()
+        admission_server.close()
+        await registry_server.wait_closed()
+        await admission_server.wait_closed()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plivo <-> LiveKit telephony bridge")
+    parser.add_argument("--workers", type=int, default=BRIDGE_WORKERS,
+                        help="worker processes sharing the ports via SO_REUSEPORT (default: BRIDGE_WORKERS or 1)")
+    parser.add_argument("--fast-runtime", action="store_true", default=fast_runtime.FAST_RUNTIME,
+                        help="run on uvloop with orjson when installed (default: TELEPHONY_FAST_RUNTIME)")
+    args = parser.parse_args()
+    
+    if args.fast_runtime:
+        fast_runtime.enable()
+        # Spawned workers re-import the runtime module and read this
+        os.environ["TELEPHONY_FAST_RUNTIME"] = "true"
+    
     try:
-        asyncio.run(main())
+        if args.workers > 1:
+            fast_runtime.run(run_supervisor(args.workers))
+        else:
+            fast_runtime.run(main())
     except KeyboardInterrupt:
         logger.info("👋 Shutting down...")
     except Exception as e:
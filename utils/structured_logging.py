@@ -0,0 +1,172 @@
+"""
+Non-blocking structured logging shared by the agent and the telephony bridge.
+Records are handed to a QueueHandler on the event loop and formatted and
+written by a QueueListener thread, so neither message formatting nor stream
+I/O runs on the loop. Output uses the classic text format by default
+(LOG_FORMAT=json for JSON lines). High-frequency events can be sampled per call
+by passing `extra={"sample_key": ..., "call": ...}`.
+
+The bridge owns its process and routes the root logger through the queue. In the
+agent, livekit-agents' CLI owns the root logger (and forwards job-process records
+to the main process), so only the agent's own loggers are routed through it.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")  # text | json
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+# Sampled events: at most LOG_SAMPLE_BURST records per call and key every LOG_SAMPLE_INTERVAL_S
+LOG_SAMPLE_INTERVAL_S = float(os.environ.get("LOG_SAMPLE_INTERVAL_S", 5.0))
+LOG_SAMPLE_BURST = int(os.environ.get("LOG_SAMPLE_BURST", 5))
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sample_key"}
+
+_listener = None
+_lock = threading.Lock()
+
+
+class LazyJson:
+    """Defer `json.dumps` of a log argument until the record is actually formatted"""
+
+    __slots__ = ("value", "indent")
+
+    def __init__(self, value, indent=None):
+        self.value = value
+        self.indent = indent
+
+    def __str__(self):
+        return json.dumps(self.value, indent=self.indent, default=str)
+
+
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per record, including any `extra` fields"""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """The classic text format; loggers in `plain_loggers` (e.g. transcripts) print the bare message"""
+
+    def __init__(self, plain_loggers=("transcript",)):
+        super().__init__("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        self.plain_loggers = set(plain_loggers)
+
+    def format(self, record):
+        if record.name in self.plain_loggers:
+            return record.getMessage()
+        message = super().format(record)
+        suppressed = getattr(record, "suppressed", None)
+        return f"{message} (+{suppressed} similar suppressed)" if suppressed else message
+
+
+class CallSampler(logging.Filter):
+    """
+    Rate-limits records carrying a `sample_key` to `burst` per (call, key) per `interval_s`.
+    The next record let through reports how many were suppressed in between.
+    """
+
+    def __init__(self, interval_s: float = LOG_SAMPLE_INTERVAL_S, burst: int = LOG_SAMPLE_BURST):
+        super().__init__()
+        self.interval_s = interval_s
+        self.burst = burst
+        self._windows = {}
+
+    def filter(self, record):
+        key = getattr(record, "sample_key", None)
+        if key is None:
+            return True
+
+        bucket = (getattr(record, "call", None), key)
+        now = time.monotonic()
+        window = self._windows.get(bucket)
+        if window is None or now - window[0] >= self.interval_s:
+            suppressed = window[2] if window else 0
+            window = self._windows[bucket] = [now, 0, 0]
+            if suppressed:
+                record.suppressed = suppressed
+            if len(self._windows) > 10000:
+                self._prune(now)
+
+        if window[1] >= self.burst:
+            window[2] += 1
+            return False
+        window[1] += 1
+        return True
+
+    def _prune(self, now):
+        for bucket in [b for b, w in self._windows.items() if now - w[0] >= self.interval_s]:
+            del self._windows[bucket]
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread (the stdlib one formats on enqueue)"""
+
+    def prepare(self, record):
+        return record
+
+
+def setup_structured_logging(level=LOG_LEVEL, log_format=LOG_FORMAT, stream=None, loggers=None):
+    """
+    Route logging through a queue to a background writer thread (idempotent); returns the QueueListener.
+    loggers: None to replace the root logger's handlers (a process we own, e.g. the bridge), or
+             names of loggers to route on their own, leaving the root handlers to the framework
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(JsonLineFormatter() if log_format == "json" else TextFormatter())
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = _DeferredQueueHandler(log_queue)
+        queue_handler.addFilter(CallSampler())
+
+        if loggers is None:
+            root = logging.getLogger()
+            for handler in root.handlers[:]:
+                root.removeHandler(handler)
+            root.addHandler(queue_handler)
+            root.setLevel(level)
+        else:
+            for name in loggers:
+                owned = logging.getLogger(name)
+                owned.addHandler(queue_handler)
+                # Written by our listener only, not again by the framework's root handler
+                owned.propagate = False
+
+        _listener = QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_structured_logging)
+        return _listener
+
+
+def stop_structured_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
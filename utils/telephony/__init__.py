@@ -0,0 +1,62 @@
+"""
+Telephony bridge support package.
+Contains audio codec and streaming utilities used by the Plivo <-> LiveKit bridge.
+"""
+
+from . import fast_runtime, mulaw_codec
+from .frame_pool import AudioFramePool
+from .packetizer import OutboundPacketizer, PlayAudioEnvelope
+from .backpressure import BridgeQueue
+from .providers import ProviderProtocol, PlivoJsonProtocol, RawBinaryProtocol, get_provider_protocol
+from .early_media import EarlyMediaBuffer
+from .comfort_noise import ComfortNoise
+from .livekit_client import LiveKitService
+from .room_pool import RoomPool, WarmRoom
+from .load_monitor import LoadMonitor
+from .admission import AdmissionController, TenantPolicy, UnixSocketAdmission
+from .call_metrics import CallMetrics, Histogram, MetricsAggregate
+from .call_registry import InMemoryCallRegistry, UnixSocketCallRegistry, UnixSocketClient, serve_registry
+
+__all__ = [
+    # Audio codec
+    'mulaw_codec',
+
+    # Optional uvloop/orjson runtime
+    'fast_runtime',
+
+    # Frame pooling
+    'AudioFramePool',
+
+    # Outbound packetizing
+    'OutboundPacketizer', 'PlayAudioEnvelope',
+
+    # Backpressure queues
+    'BridgeQueue',
+
+    # Provider wire protocols
+    'ProviderProtocol', 'PlivoJsonProtocol', 'RawBinaryProtocol', 'get_provider_protocol',
+
+    # Early media
+    'EarlyMediaBuffer',
+
+    # Comfort noise
+    'ComfortNoise',
+
+    # LiveKit server API
+    'LiveKitService',
+
+    # Pre-warmed rooms
+    'RoomPool', 'WarmRoom',
+
+    # Load shedding
+    'LoadMonitor',
+
+    # Per-tenant admission control
+    'AdmissionController', 'TenantPolicy', 'UnixSocketAdmission',
+
+    # Per-call telemetry
+    'CallMetrics', 'Histogram', 'MetricsAggregate',
+
+    # Multi-process call registry
+    'InMemoryCallRegistry', 'UnixSocketCallRegistry', 'UnixSocketClient', 'serve_registry',
+]
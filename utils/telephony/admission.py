@@ -0,0 +1,417 @@
+"""
+Per-tenant admission control for the telephony bridge.
+Each tenant gets a concurrent-call limit and a call-setup token bucket, and
+a global cap sits on top. Calls that cannot start straight away wait in a
+short per-tenant queue until a slot or token frees up, or until the queue
+timeout passes. One tenant's burst therefore queues or is rejected against
+its own limits and does not take capacity from everyone else. A slot is
+taken when Plivo fetches the answer XML. It is held as a reservation until
+the call's stream connects, and released when the call ends or when the
+reservation expires. With several worker processes, the XML fetch and the
+stream can land on different workers. The supervisor therefore holds the one
+controller and workers reach it through `UnixSocketAdmission`.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+
+from .call_metrics import Histogram
+from .call_registry import UnixSocketClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT = "default"
+QUEUE_WAIT_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2000, 5000, 10000)
+
+# Rejection reasons, also used as metric labels
+REJECT_CONCURRENCY = "tenant_concurrency"
+REJECT_RATE = "tenant_rate"
+REJECT_GLOBAL = "global_cap"
+REJECT_QUEUE_FULL = "queue_full"
+REJECT_DUPLICATE = "duplicate_room"
+
+
+class TenantPolicy:
+    """Limits for one tenant (0 = unlimited)"""
+
+    def __init__(self, name: str, max_concurrent: int = 0, setup_rate: float = 0.0, burst: int = 1,
+                 queue_size: int = 10, agent_name: str = None, numbers=()):
+        """
+        setup_rate: sustained call setups per second; `burst` setups may start back to back
+        queue_size: calls allowed to wait for a slot or token at once
+        agent_name: LiveKit agent dispatched for this tenant's calls (None = the bridge default)
+        numbers: dialled numbers (Plivo `To`) that identify this tenant
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.setup_rate = setup_rate
+        self.burst = max(1, burst)
+        self.queue_size = queue_size
+        self.agent_name = agent_name
+        self.numbers = tuple(numbers)
+
+    @classmethod
+    def from_dict(cls, name: str, config: dict, defaults: "TenantPolicy" = None):
+        base = defaults.__dict__ if defaults else {}
+        fields = ("max_concurrent", "setup_rate", "burst", "queue_size", "agent_name", "numbers")
+        values = {key: config.get(key, base.get(key)) for key in fields}
+        return cls(name, **{key: value for key, value in values.items() if value is not None})
+
+
+class _TenantState:
+    def __init__(self, policy: TenantPolicy):
+        self.policy = policy
+        self.tokens = float(policy.burst)
+        self.refilled_at = time.monotonic()
+        self.active = set()
+        self.waiting = 0
+
+        # Statistics
+        self.admitted = 0
+        self.rejected = {}
+        self.queue_wait_ms = Histogram(QUEUE_WAIT_BUCKETS_MS)
+
+    def refill(self, now):
+        if self.policy.setup_rate:
+            self.tokens = min(self.policy.burst, self.tokens + (now - self.refilled_at) * self.policy.setup_rate)
+        self.refilled_at = now
+
+    def token_wait(self):
+        """Seconds until the next setup token (0 if one is available or there is no rate limit)"""
+        if not self.policy.setup_rate or self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.policy.setup_rate
+
+
+class AdmissionController:
+    """Tenant-aware concurrency, setup-rate and global limits with a short wait queue"""
+
+    def __init__(self, tenants=None, default_policy: TenantPolicy = None, max_calls: int = 0,
+                 queue_timeout_s: float = 2.0, reservation_ttl_s: float = 15.0):
+        """
+        tenants: {name: TenantPolicy}; unknown tenants get a copy of `default_policy`
+        max_calls: cap on calls across all tenants (0 = unlimited)
+        queue_timeout_s: longest a call waits for a slot before it is rejected
+        reservation_ttl_s: how long a slot is held for a call whose stream has not connected yet
+        """
+        self.default_policy = default_policy or TenantPolicy(DEFAULT_TENANT)
+        self.policies = dict(tenants or {})
+        self.max_calls = max_calls
+        self.queue_timeout_s = queue_timeout_s
+        self.reservation_ttl_s = reservation_ttl_s
+
+        self._tenants = {}
+        self._numbers = {number: name for name, policy in self.policies.items() for number in policy.numbers}
+        # room -> (tenant, reserved_at) for slots whose stream has not connected yet
+        self._reservations = {}
+        self._rooms = {}
+        # room -> worker process holding the call, so a dead worker's slots can be freed
+        self._workers = {}
+        self._changed = asyncio.Condition()
+        self.rejected_global = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        Build from TELEPHONY_TENANTS (inline JSON, or a path to a JSON file):
+        {"acme": {"numbers": ["+9180..."], "max_concurrent": 20, "setup_rate": 2, "burst": 5, "agent_name": "..."}}
+        """
+        default_policy = TenantPolicy(
+            DEFAULT_TENANT,
+            max_concurrent=int(os.environ.get("TENANT_DEFAULT_MAX_CONCURRENT", 0)),
+            setup_rate=float(os.environ.get("TENANT_DEFAULT_SETUP_RATE", 0)),
+            burst=int(os.environ.get("TENANT_DEFAULT_SETUP_BURST", 5)),
+            queue_size=int(os.environ.get("TENANT_DEFAULT_QUEUE_SIZE", 10)),
+        )
+        tenants = {}
+        raw = os.environ.get("TELEPHONY_TENANTS", "").strip()
+        if raw:
+            try:
+                if not raw.startswith("{"):
+                    with open(raw) as f:
+                        raw = f.read()
+                tenants = {
+                    name: TenantPolicy.from_dict(name, config, default_policy)
+                    for name, config in json.loads(raw).items()
+                }
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                logger.error(f"❌ Invalid TELEPHONY_TENANTS configuration, using defaults only: {e}")
+        return cls(
+            tenants, default_policy,
+            max_calls=int(os.environ.get("ADMISSION_MAX_CALLS", 0)),
+            queue_timeout_s=float(os.environ.get("ADMISSION_QUEUE_TIMEOUT_S", 2.0)),
+            reservation_ttl_s=float(os.environ.get("ADMISSION_RESERVATION_TTL_S", 15.0)),
+        )
+
+    def resolve_tenant(self, query) -> str:
+        """Tenant for a call: a configured `tenant` parameter, else the dialled number, else the default"""
+        tenant = query.get("tenant")
+        if tenant in self.policies:
+            return tenant
+        for key in ("To", "to"):
+            number = query.get(key)
+            if number and number in self._numbers:
+                return self._numbers[number]
+        return DEFAULT_TENANT
+
+    def policy(self, tenant: str) -> TenantPolicy:
+        return self._state(tenant).policy
+
+    def _state(self, tenant):
+        state = self._tenants.get(tenant)
+        if state is None:
+            policy = self.policies.get(tenant)
+            if policy is None:
+                policy = TenantPolicy.from_dict(tenant, {}, self.default_policy)
+            state = self._tenants[tenant] = _TenantState(policy)
+        return state
+
+    @property
+    def active_calls(self) -> int:
+        return len(self._rooms)
+
+    def _expire_reservations(self, now):
+        for room, (_, reserved_at) in list(self._reservations.items()):
+            if now - reserved_at > self.reservation_ttl_s:
+                logger.info(f"⌛ Admission reservation for room {room} expired (stream never connected)")
+                self._release(room)
+
+    def _blocked_by(self, state, now):
+        """Why a call for this tenant cannot start right now, or None"""
+        if self.max_calls and len(self._rooms) >= self.max_calls:
+            return REJECT_GLOBAL
+        policy = state.policy
+        if policy.max_concurrent and len(state.active) >= policy.max_concurrent:
+            return REJECT_CONCURRENCY
+        state.refill(now)
+        if policy.setup_rate and state.tokens < 1:
+            return REJECT_RATE
+        return None
+
+    def _take(self, state, tenant, room, now, reserve, worker):
+        if state.policy.setup_rate:
+            state.tokens -= 1
+        state.active.add(room)
+        state.admitted += 1
+        self._rooms[room] = tenant
+        self._workers[room] = worker
+        if reserve:
+            self._reservations[room] = (tenant, now)
+
+    def _reject(self, state, reason):
+        state.rejected[reason] = state.rejected.get(reason, 0) + 1
+        if reason == REJECT_GLOBAL:
+            self.rejected_global += 1
+        return reason
+
+    def _try_take(self, tenant, room, reserve, worker):
+        # A room that already holds a slot is another call's; only `claim` may pick up its reservation
+        if room in self._rooms:
+            return REJECT_DUPLICATE
+        now = time.monotonic()
+        self._expire_reservations(now)
+        state = self._state(tenant)
+        reason = self._blocked_by(state, now)
+        if reason is None:
+            self._take(state, tenant, room, now, reserve, worker)
+        return reason
+
+    async def try_admit(self, tenant: str, room: str, reserve: bool = False, worker: int = None):
+        """Take a slot without waiting; returns None if admitted, else the rejection reason"""
+        reason = self._try_take(tenant, room, reserve, worker)
+        return self._reject(self._state(tenant), reason) if reason else None
+
+    async def admit(self, tenant: str, room: str, reserve: bool = True, worker: int = None):
+        """
+        Take a slot for a new call, waiting up to `queue_timeout_s` behind this tenant's limits.
+        Returns None if admitted, else the rejection reason. With `reserve` the slot is held for
+        `reservation_ttl_s` until `claim` is called for the room.
+        """
+        reason = self._try_take(tenant, room, reserve, worker)
+        if reason is None:
+            self._state(tenant).queue_wait_ms.observe(0.0)
+            return None
+
+        state = self._state(tenant)
+        if reason == REJECT_DUPLICATE:
+            return self._reject(state, reason)
+        if state.waiting >= state.policy.queue_size:
+            return self._reject(state, REJECT_QUEUE_FULL)
+
+        state.waiting += 1
+        started = time.monotonic()
+        deadline = started + self.queue_timeout_s
+        try:
+            async with self._changed:
+                while True:
+                    now = time.monotonic()
+                    self._expire_reservations(now)
+                    reason = REJECT_DUPLICATE if room in self._rooms else self._blocked_by(state, now)
+                    if reason is None:
+                        self._take(state, tenant, room, now, reserve, worker)
+                        state.queue_wait_ms.observe((now - started) * 1000)
+                        return None
+                    if now >= deadline or reason == REJECT_DUPLICATE:
+                        state.queue_wait_ms.observe((now - started) * 1000)
+                        return self._reject(state, reason)
+                    # Wake on a released slot, or when the next setup token is due
+                    timeout = deadline - now
+                    if reason == REJECT_RATE:
+                        timeout = min(timeout, state.token_wait())
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            state.waiting -= 1
+
+    async def claim(self, room: str, worker: int = None) -> bool:
+        """
+        The call's stream connected: keep the slot reserved for it at XML time until `release`.
+        False if the room has no unclaimed reservation (including a room whose call is already live).
+        """
+        if self._reservations.pop(room, None) is None:
+            return False
+        self._workers[room] = worker
+        return True
+
+    async def rename(self, room: str, new_room: str):
+        """Move a slot to the room name the call ended up with (e.g. a pre-warmed room)"""
+        tenant = self._rooms.pop(room, None)
+        if tenant is None:
+            return
+        self._rooms[new_room] = tenant
+        self._workers[new_room] = self._workers.pop(room, None)
+        state = self._tenants[tenant]
+        state.active.discard(room)
+        state.active.add(new_room)
+        if room in self._reservations:
+            self._reservations[new_room] = self._reservations.pop(room)
+
+    def _release(self, room):
+        tenant = self._rooms.pop(room, None)
+        self._reservations.pop(room, None)
+        self._workers.pop(room, None)
+        if tenant is not None:
+            self._tenants[tenant].active.discard(room)
+        return tenant is not None
+
+    async def release(self, room: str):
+        """The call ended: free its slot and wake queued calls"""
+        if self._release(room):
+            async with self._changed:
+                self._changed.notify_all()
+
+    async def release_reservation(self, room: str):
+        """A stream gave up before claiming its slot: free it only if it is still an unclaimed reservation"""
+        if room in self._reservations:
+            await self.release(room)
+
+    async def release_worker(self, worker: int):
+        """A worker process exited: free every slot it held or had reserved"""
+        rooms = [room for room, owner in self._workers.items() if owner == worker]
+        for room in rooms:
+            self._release(room)
+        if rooms:
+            logger.warning(f"🧹 Released {len(rooms)} admission slots held by worker {worker}")
+            async with self._changed:
+                self._changed.notify_all()
+
+    def agent_name(self, tenant: str, default: str) -> str:
+        return self.policy(tenant).agent_name or default
+
+    async def get_stats(self):
+        """Per-tenant admissions, rejections, queue waits and active calls"""
+        return {
+            "active_calls": len(self._rooms),
+            "max_calls": self.max_calls or None,
+            "reserved": len(self._reservations),
+            "rejected_global": self.rejected_global,
+            "tenants": {
+                tenant: {
+                    "active": len(state.active),
+                    "waiting": state.waiting,
+                    "max_concurrent": state.policy.max_concurrent or None,
+                    "setup_rate": state.policy.setup_rate or None,
+                    "admitted": state.admitted,
+                    "rejected": state.rejected,
+                    "queue_wait_ms": state.queue_wait_ms.summary(),
+                }
+                for tenant, state in self._tenants.items()
+            },
+        }
+
+    async def prometheus(self, prefix: str = "telephony_bridge", labels: str = ""):
+        """Prometheus text for per-tenant admission metrics"""
+        label_prefix = f"{labels}," if labels else ""
+        lines = [f"# TYPE {prefix}_admission_active_calls gauge",
+                 f"# TYPE {prefix}_admission_waiting_calls gauge",
+                 f"# TYPE {prefix}_admission_admitted_total counter",
+                 f"# TYPE {prefix}_admission_rejected_total counter",
+                 f"# TYPE {prefix}_admission_queue_wait_ms histogram"]
+        for tenant, state in self._tenants.items():
+            tenant_labels = f'{label_prefix}tenant="{tenant}"'
+            lines.append(f"{prefix}_admission_active_calls{{{tenant_labels}}} {len(state.active)}")
+            lines.append(f"{prefix}_admission_waiting_calls{{{tenant_labels}}} {state.waiting}")
+            lines.append(f"{prefix}_admission_admitted_total{{{tenant_labels}}} {state.admitted}")
+            for reason, count in state.rejected.items():
+                lines.append(f'{prefix}_admission_rejected_total{{{tenant_labels},reason="{reason}"}} {count}')
+            histogram = state.queue_wait_ms
+            cumulative = 0
+            for bound, count in zip(histogram.bounds, histogram.counts):
+                cumulative += count
+                lines.append(f'{prefix}_admission_queue_wait_ms_bucket{{{tenant_labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_admission_queue_wait_ms_bucket{{{tenant_labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{prefix}_admission_queue_wait_ms_sum{{{tenant_labels}}} {histogram.total}")
+            lines.append(f"{prefix}_admission_queue_wait_ms_count{{{tenant_labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+class UnixSocketAdmission(UnixSocketClient):
+    """
+    Client for the admission controller served by the supervisor. Tenant lookup and
+    agent names come from this worker's own copy of the configuration.
+    """
+
+    name = "Admission"
+
+    def __init__(self, path: str, config: AdmissionController = None):
+        super().__init__(path)
+        self.config = config or AdmissionController.from_env()
+
+    def resolve_tenant(self, query) -> str:
+        return self.config.resolve_tenant(query)
+
+    def agent_name(self, tenant: str, default: str) -> str:
+        return self.config.agent_name(tenant, default)
+
+    async def try_admit(self, tenant: str, room: str, reserve: bool = False, worker: int = None):
+        return await self._request("try_admit", tenant=tenant, room=room, reserve=reserve, worker=worker)
+
+    async def admit(self, tenant: str, room: str, reserve: bool = True, worker: int = None):
+        # May wait in the tenant's queue, so it gets its own connection
+        return await self._request_once("admit", tenant=tenant, room=room, reserve=reserve, worker=worker)
+
+    async def claim(self, room: str, worker: int = None) -> bool:
+        return await self._request("claim", room=room, worker=worker)
+
+    async def rename(self, room: str, new_room: str):
+        await self._request("rename", room=room, new_room=new_room)
+
+    async def release(self, room: str):
+        await self._request("release", room=room)
+
+    async def release_reservation(self, room: str):
+        await self._request("release_reservation", room=room)
+
+    async def release_worker(self, worker: int):
+        await self._request("release_worker", worker=worker)
+
+    async def get_stats(self):
+        return await self._request("get_stats")
+
+    async def prometheus(self, prefix: str = "telephony_bridge", labels: str = ""):
+        return await self._request("prometheus", prefix=prefix, labels=labels)
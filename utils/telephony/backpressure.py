@@ -0,0 +1,134 @@
+"""
+Bounded queues between the Plivo socket and LiveKit.
+Each direction gets a queue drained by its own task, so a stall on one side
+(a slow capture_frame, a slow socket send) fills that queue instead of
+blocking the reader on the other side. Audio is shed according to a drop
+policy once the queue is full; control events are never dropped.
+"""
+
+import asyncio
+import time
+from collections import deque
+
+AUDIO = "audio"
+CONTROL = "control"
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+DROP_POLICIES = (DROP_OLDEST, DROP_NEWEST)
+
+
+class BridgeQueue:
+    """FIFO of audio and control items with a bounded audio depth and dwell-time tracking"""
+
+    def __init__(self, name: str, max_audio_items: int, audio_policy: str = DROP_OLDEST):
+        """
+        name: prefix for exported statistics (e.g. "inbound", "outbound")
+        max_audio_items: audio items held before the drop policy applies
+        audio_policy: "drop_oldest" keeps the freshest audio, "drop_newest" keeps what is queued
+        """
+        if audio_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown audio drop policy {audio_policy!r}, expected one of {DROP_POLICIES}")
+        self.name = name
+        self.max_audio_items = max(1, max_audio_items)
+        self.audio_policy = audio_policy
+
+        # (kind, item, enqueued_at); control and audio share one queue to keep their order
+        self._items = deque()
+        self._audio_items = 0
+        self._available = asyncio.Event()
+        self._closed = False
+
+        # Statistics
+        self.audio_enqueued = 0
+        self.audio_dropped = 0
+        self.control_enqueued = 0
+        self.max_depth = 0
+        self.max_dwell = 0.0
+        # Dwell of the most recently popped item, in seconds
+        self.last_dwell = 0.0
+        self._total_dwell = 0.0
+        self._dequeued = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _append(self, kind, item):
+        self._items.append((kind, item, time.monotonic()))
+        if len(self._items) > self.max_depth:
+            self.max_depth = len(self._items)
+        self._available.set()
+
+    def put_audio(self, item) -> bool:
+        """Queue an audio item; returns False if it was the one dropped"""
+        if self._audio_items >= self.max_audio_items:
+            self.audio_dropped += 1
+            if self.audio_policy == DROP_NEWEST:
+                return False
+            # Control items are rare, so the oldest audio item is almost always at the head
+            for index, (kind, _, _) in enumerate(self._items):
+                if kind == AUDIO:
+                    del self._items[index]
+                    self._audio_items -= 1
+                    break
+
+        self._audio_items += 1
+        self.audio_enqueued += 1
+        self._append(AUDIO, item)
+        return True
+
+    def put_control(self, item):
+        """Queue a control event; never dropped and not counted against the audio bound"""
+        self.control_enqueued += 1
+        self._append(CONTROL, item)
+
+    def pop(self):
+        """Return the oldest (kind, item) without waiting; raises IndexError if empty"""
+        kind, item, enqueued_at = self._items.popleft()
+        if kind == AUDIO:
+            self._audio_items -= 1
+        dwell = self.last_dwell = time.monotonic() - enqueued_at
+        self._total_dwell += dwell
+        self._dequeued += 1
+        if dwell > self.max_dwell:
+            self.max_dwell = dwell
+        return kind, item
+
+    async def get(self):
+        """Wait for the next (kind, item); returns None once closed and drained"""
+        while not self._items:
+            if self._closed:
+                return None
+            self._available.clear()
+            await self._available.wait()
+        return self.pop()
+
+    def clear_audio(self) -> list:
+        """Drop every queued audio item (control events stay), returning the removed items"""
+        removed = [item for kind, item, _ in self._items if kind == AUDIO]
+        if removed:
+            self._items = deque(entry for entry in self._items if entry[0] != AUDIO)
+            self._audio_items = 0
+        return removed
+
+    def close(self):
+        """Let `get` return None once the remaining items are drained"""
+        self._closed = True
+        self._available.set()
+
+    def get_stats(self):
+        """Get queue statistics"""
+        prefix = self.name
+        return {
+            f"{prefix}_queue_depth": len(self._items),
+            f"{prefix}_queue_max_depth": self.max_depth,
+            f"{prefix}_queue_audio_enqueued": self.audio_enqueued,
+            f"{prefix}_queue_audio_dropped": self.audio_dropped,
+            f"{prefix}_queue_control_enqueued": self.control_enqueued,
+            f"{prefix}_queue_avg_dwell_ms": round(self._total_dwell / self._dequeued * 1000, 2) if self._dequeued else 0.0,
+            f"{prefix}_queue_max_dwell_ms": round(self.max_dwell * 1000, 2),
+        }
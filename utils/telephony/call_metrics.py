@@ -0,0 +1,221 @@
+"""
+Per-call media quality and timing telemetry for the telephony bridge.
+Every metric is a fixed-bucket histogram, so an observation costs one
+bisect. Histograms from different calls, and from calls that have already
+ended, merge by adding bucket counts. That gives live per-call percentiles,
+a compact end-of-call summary, and process-wide cumulative series for
+Prometheus.
+"""
+
+import bisect
+import time
+
+# Upper bucket bounds; an implicit +Inf bucket follows
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 30, 40, 60, 80, 100, 150, 200, 300, 500, 1000, 2000, 5000)
+DEPTH_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+PACKET_MS = 20.0  # Plivo packetization
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum and max"""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram"):
+        """Add another histogram with the same buckets into this one"""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> float:
+        """Estimate a percentile by linear interpolation inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = self.count * pct / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                return min(estimate, self.max)
+            seen += count
+        return self.max
+
+    def summary(self):
+        """Count, mean, p50/p95/p99 and max, rounded for logs and JSON"""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2),
+            "p50": round(self.percentile(50), 2),
+            "p95": round(self.percentile(95), 2),
+            "p99": round(self.percentile(99), 2),
+            "max": round(self.max, 2),
+        }
+
+
+class CallMetrics:
+    """Media quality and timing for one call"""
+
+    HISTOGRAMS = {
+        # |inter-arrival time - packet interval| of provider media
+        "inbound_jitter_ms": LATENCY_BUCKETS_MS,
+        # provider packet received -> captured into LiveKit
+        "capture_latency_ms": LATENCY_BUCKETS_MS,
+        # agent audio chunked -> sent to the provider (includes playout pacing)
+        "send_latency_ms": LATENCY_BUCKETS_MS,
+        # outbound chunks waiting, sampled at every send
+        "outbound_queue_depth": DEPTH_BUCKETS,
+    }
+
+    def __init__(self, packet_ms: float = PACKET_MS):
+        self.packet_ms = packet_ms
+        self.histograms = {name: Histogram(bounds) for name, bounds in self.HISTOGRAMS.items()}
+        self.started_at = None
+        self.time_to_first_agent_audio_ms = None
+        self._last_arrival = None
+
+        # RFC 3550-style smoothed interarrival jitter
+        self.jitter_ms = 0.0
+        self.inbound_packets = 0
+        self.outbound_chunks = 0
+        # Gaps of two or more packet intervals between provider packets
+        self.late_packets = 0
+
+    def record_start(self):
+        """The provider's start event: reference point for time-to-first-agent-audio"""
+        self.started_at = time.monotonic()
+
+    def record_inbound_packet(self, now: float = None):
+        """A provider media packet arrived"""
+        now = time.monotonic() if now is None else now
+        self.inbound_packets += 1
+        if self._last_arrival is not None:
+            deviation = abs((now - self._last_arrival) * 1000 - self.packet_ms)
+            self.histograms["inbound_jitter_ms"].observe(deviation)
+            self.jitter_ms += (deviation - self.jitter_ms) / 16
+            if deviation >= self.packet_ms:
+                self.late_packets += 1
+        self._last_arrival = now
+
+    def record_capture(self, latency_ms: float):
+        self.histograms["capture_latency_ms"].observe(latency_ms)
+
+    def record_send(self, latency_ms: float, queue_depth: int):
+        """An agent audio chunk went out to the provider"""
+        self.outbound_chunks += 1
+        if self.time_to_first_agent_audio_ms is None and self.started_at is not None:
+            self.time_to_first_agent_audio_ms = round((time.monotonic() - self.started_at) * 1000, 1)
+        self.histograms["send_latency_ms"].observe(latency_ms)
+        self.histograms["outbound_queue_depth"].observe(queue_depth)
+
+    def snapshot(self, dropped=None):
+        """
+        Live (or final) view of this call.
+        dropped: drop counters kept elsewhere (queues, early media), reported alongside loss
+        """
+        dropped = dropped or {}
+        inbound_dropped = dropped.get("inbound", 0)
+        return {
+            "inbound_packets": self.inbound_packets,
+            "outbound_chunks": self.outbound_chunks,
+            "jitter_ms": round(self.jitter_ms, 2),
+            "late_packets": self.late_packets,
+            "dropped": dropped,
+            "inbound_loss_pct": round(inbound_dropped * 100 / self.inbound_packets, 2) if self.inbound_packets else 0.0,
+            "time_to_first_agent_audio_ms": self.time_to_first_agent_audio_ms,
+            **{name: histogram.summary() for name, histogram in self.histograms.items()},
+        }
+
+    def compact_summary(self, dropped=None):
+        """Small end-of-call record (p50/p95/max only) for storing with the call"""
+        snapshot = self.snapshot(dropped)
+        for name in self.HISTOGRAMS:
+            summary = snapshot[name]
+            snapshot[name] = [summary.get("p50"), summary.get("p95"), summary.get("max")] if summary["count"] else None
+        return snapshot
+
+
+class MetricsAggregate:
+    """Process-wide cumulative histograms: ended calls plus whatever live calls have observed so far"""
+
+    def __init__(self):
+        self.completed = {name: Histogram(bounds) for name, bounds in CallMetrics.HISTOGRAMS.items()}
+        self.counters = {"calls_completed": 0}
+        self.first_agent_audio = Histogram(LATENCY_BUCKETS_MS)
+
+    @staticmethod
+    def _add_counters(counters, metrics: CallMetrics, dropped):
+        for name in ("inbound_packets", "outbound_chunks", "late_packets"):
+            counters[name] = counters.get(name, 0) + getattr(metrics, name)
+        for direction, count in (dropped or {}).items():
+            name = f"{direction}_dropped"
+            counters[name] = counters.get(name, 0) + count
+
+    def add_completed(self, metrics: CallMetrics, dropped=None):
+        """Fold an ended call (and its drop counters) into the cumulative totals"""
+        for name, histogram in metrics.histograms.items():
+            self.completed[name].merge(histogram)
+        self.counters["calls_completed"] += 1
+        self._add_counters(self.counters, metrics, dropped)
+        if metrics.time_to_first_agent_audio_ms is not None:
+            self.first_agent_audio.observe(metrics.time_to_first_agent_audio_ms)
+
+    def prometheus(self, live=(), gauges=None, prefix: str = "telephony_bridge", labels: str = ""):
+        """
+        Prometheus text exposition of the cumulative histograms and counters.
+        live: (CallMetrics, dropped) for calls still in progress
+        gauges: point-in-time values such as active calls
+        """
+        histograms = {}
+        counters = dict(self.counters)
+        for name, completed in self.completed.items():
+            merged = Histogram(completed.bounds)
+            merged.merge(completed)
+            histograms[name] = merged
+        for metrics, dropped in live:
+            for name, histogram in metrics.histograms.items():
+                histograms[name].merge(histogram)
+            self._add_counters(counters, metrics, dropped)
+        histograms["time_to_first_agent_audio_ms"] = self.first_agent_audio
+
+        label_prefix = f"{labels}," if labels else ""
+        lines = []
+        for name, histogram in histograms.items():
+            metric = f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in zip(histogram.bounds, histogram.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{label_prefix}le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{label_prefix}le="+Inf"}} {histogram.count}')
+            lines.append(f"{metric}_sum{{{labels}}} {histogram.total}")
+            lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        for name, value in counters.items():
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{{{labels}}} {value}")
+        for name, value in (gauges or {}).items():
+            metric = f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric}{{{labels}}} {value}")
+        return "\n".join(lines) + "\n"
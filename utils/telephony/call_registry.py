@@ -0,0 +1,166 @@
+"""
+Shared call registry for a multi-process bridge.
+Maps Plivo CallUUID / StreamId to the worker process that owns the call, and
+holds per-worker health so any worker can answer `/health` for the whole node.
+
+`InMemoryCallRegistry` is the single-process stand-in; in supervisor mode the
+supervisor serves one over a local Unix socket (`serve_registry`) and workers
+talk to it with `UnixSocketCallRegistry`. Other node-wide state (admission
+control) is shared the same way through `UnixSocketClient`.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Workers that have not reported for this long are shown as stale
+HEALTH_STALE_AFTER_S = 10.0
+
+
+class InMemoryCallRegistry:
+    """Call ownership and worker health held in this process"""
+
+    def __init__(self):
+        self._owners = {}
+        self._health = {}
+
+    async def register(self, key: str, worker_id: int):
+        self._owners[key] = worker_id
+
+    async def unregister(self, key: str):
+        self._owners.pop(key, None)
+
+    async def lookup(self, key: str) -> Optional[int]:
+        return self._owners.get(key)
+
+    async def report_health(self, worker_id: int, health: dict):
+        self._health[str(worker_id)] = {**health, "reported_at": time.time()}
+
+    async def workers(self) -> dict:
+        now = time.time()
+        return {
+            worker_id: {**health, "stale": now - health["reported_at"] > HEALTH_STALE_AFTER_S}
+            for worker_id, health in self._health.items()
+        }
+
+    async def remove_worker(self, worker_id: int):
+        """Forget a worker and every call it owned (e.g. after it exited)"""
+        self._health.pop(str(worker_id), None)
+        for key in [key for key, owner in self._owners.items() if owner == worker_id]:
+            del self._owners[key]
+
+    async def aclose(self):
+        pass
+
+
+async def serve_registry(path: str, store) -> asyncio.AbstractServer:
+    """
+    Serve `store`'s async methods over a Unix socket using one JSON object per line.
+    Requests on one connection run in order; connections are served concurrently.
+    """
+
+    async def handle_client(reader, writer):
+        try:
+            while line := await reader.readline():
+                request = json.loads(line)
+                op = request.pop("op")
+                try:
+                    result = await getattr(store, op)(**request)
+                    response = {"ok": True, "result": result}
+                except Exception as e:
+                    response = {"ok": False, "error": str(e)}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_unix_server(handle_client, path=path)
+
+
+class UnixSocketClient:
+    """Base client for a store served by the supervisor with `serve_registry`"""
+
+    name = "Registry"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+
+    async def _request(self, op: str, **kwargs):
+        async with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._writer is None:
+                        self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+                    self._writer.write(json.dumps({"op": op, **kwargs}).encode() + b"\n")
+                    await self._writer.drain()
+                    response = json.loads(await self._reader.readline())
+                    break
+                except (ConnectionError, json.JSONDecodeError, OSError):
+                    # Supervisor restarted or connection dropped: reconnect once
+                    self._disconnect()
+                    if attempt:
+                        raise
+                except BaseException:
+                    # Cancelled (e.g. call teardown) or failed between write and read: the reply may
+                    # still arrive, so drop the connection rather than let the next request read it
+                    self._disconnect()
+                    raise
+        return self._result(op, response)
+
+    async def _request_once(self, op: str, **kwargs):
+        """Send one request on its own connection, for calls that may block (e.g. a queued admission)"""
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        try:
+            writer.write(json.dumps({"op": op, **kwargs}).encode() + b"\n")
+            await writer.drain()
+            line = await reader.readline()
+        finally:
+            writer.close()
+        if not line:
+            raise ConnectionError(f"{self.name} closed the connection during {op}")
+        return self._result(op, json.loads(line))
+
+    def _result(self, op, response):
+        if not response["ok"]:
+            raise RuntimeError(f"{self.name} {op} failed: {response['error']}")
+        return response["result"]
+
+    def _disconnect(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+
+    async def aclose(self):
+        self._disconnect()
+
+
+class UnixSocketCallRegistry(UnixSocketClient):
+    """Client for a registry served by the supervisor over a Unix socket"""
+
+    async def register(self, key: str, worker_id: int):
+        await self._request("register", key=key, worker_id=worker_id)
+
+    async def unregister(self, key: str):
+        await self._request("unregister", key=key)
+
+    async def lookup(self, key: str) -> Optional[int]:
+        return await self._request("lookup", key=key)
+
+    async def report_health(self, worker_id: int, health: dict):
+        await self._request("report_health", worker_id=worker_id, health=health)
+
+    async def workers(self) -> dict:
+        return await self._request("workers")
+
+    async def remove_worker(self, worker_id: int):
+        await self._request("remove_worker", worker_id=worker_id)
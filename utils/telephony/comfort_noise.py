@@ -0,0 +1,88 @@
+"""
+Comfort noise for outbound telephony audio.
+A short noise table is generated once per call and looped, so per-frame
+work is a slice and an int16 saturating add, with no random number generation.
+The same table is pre-encoded to μ-law for filling agent silence, which
+costs nothing beyond slicing bytes.
+"""
+
+import numpy as np
+
+from . import mulaw_codec
+
+
+class ComfortNoise:
+    """Looping precomputed noise mixed into (or substituted for) outbound PCM"""
+
+    def __init__(self, level_dbfs: float = -60.0, sample_rate: int = 8000,
+                 table_seconds: float = 1.0, max_frame_samples: int = None, seed: int = None):
+        """
+        level_dbfs: RMS level of the noise relative to int16 full scale
+        table_seconds: length of the looped table; long enough that the loop is inaudible
+        max_frame_samples: largest frame mixed at once (defaults to one second)
+        """
+        self.level_dbfs = level_dbfs
+        self.sample_rate = sample_rate
+
+        rms = 32767 * 10 ** (level_dbfs / 20)
+        size = max(1, int(sample_rate * table_seconds))
+        noise = np.random.default_rng(seed).normal(0.0, rms, size)
+        self.table = np.clip(np.round(noise), -32768, 32767).astype(np.int16)
+        self.mulaw_table = mulaw_codec.lin2ulaw(self.table.tobytes())
+        # Wrapped copy so any frame up to the table length is one contiguous slice
+        self._table32 = np.concatenate([self.table, self.table]).astype(np.int32)
+
+        scratch = max_frame_samples or sample_rate
+        self._mix = np.empty(scratch, dtype=np.int32)
+        self._out = np.empty(scratch, dtype=np.int16)
+        self._position = 0
+        self._mulaw_position = 0
+
+        # Statistics
+        self.samples_mixed = 0
+        self.silence_bytes_filled = 0
+
+    def _next_slice(self, n):
+        start = self._position
+        self._position = (start + n) % len(self.table)
+        return self._table32[start:start + n]
+
+    def mix(self, pcm: np.ndarray) -> np.ndarray:
+        """Return `pcm` plus noise, saturated to int16, as a view into an internal buffer"""
+        n = len(pcm)
+        if n > len(self._out) or n > len(self.table):
+            # Oversized frame: mix it in table-sized pieces into a one-off buffer
+            out = np.empty(n, dtype=np.int16)
+            step = min(len(self._out), len(self.table))
+            for start in range(0, n, step):
+                out[start:start + step] = self.mix(pcm[start:start + step])
+            return out
+
+        mixed = self._mix[:n]
+        np.add(pcm, self._next_slice(n), out=mixed)
+        np.clip(mixed, -32768, 32767, out=mixed)
+        out = self._out[:n]
+        out[:] = mixed
+        self.samples_mixed += n
+        return out
+
+    def mulaw_chunk(self, nbytes: int) -> bytes:
+        """Next `nbytes` of pre-encoded μ-law noise, for filling agent silence"""
+        table = self.mulaw_table
+        start = self._mulaw_position
+        end = start + nbytes
+        if end <= len(table):
+            chunk = table[start:end]
+        else:
+            chunk = (table[start:] + table * (nbytes // len(table) + 1))[:nbytes]
+        self._mulaw_position = end % len(table)
+        self.silence_bytes_filled += nbytes
+        return chunk
+
+    def get_stats(self):
+        """Get comfort noise statistics"""
+        return {
+            "comfort_noise_level_dbfs": self.level_dbfs,
+            "comfort_noise_ms_mixed": round(self.samples_mixed * 1000 / self.sample_rate, 1),
+            "comfort_noise_ms_silence_filled": round(self.silence_bytes_filled * 1000 / self.sample_rate, 1),
+        }
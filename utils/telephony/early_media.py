@@ -0,0 +1,105 @@
+"""
+Early-media buffer for caller audio that arrives before LiveKit is connected.
+Holds decoded PCM in a bounded ring so it can be replayed into the telephony
+track once it is published, instead of dropping the caller's first words.
+"""
+
+import numpy as np
+
+from . import mulaw_codec
+
+
+class EarlyMediaBuffer:
+    """Bounded int16 PCM ring; the oldest audio is overwritten when full"""
+
+    def __init__(self, sample_rate: int = 8000, max_ms: int = 3000,
+                 drop_leading_silence: bool = True, silence_threshold: int = 300):
+        self.sample_rate = sample_rate
+        self.capacity = sample_rate * max_ms // 1000
+        self.drop_leading_silence = drop_leading_silence
+        self.silence_threshold = silence_threshold
+
+        self._ring = np.zeros(max(1, self.capacity), dtype=np.int16)
+        self._decode_buffer = np.empty(sample_rate, dtype=np.int16)
+        self._read = 0
+        self._count = 0
+        self._speech_seen = False
+
+        # Statistics
+        self.packets_buffered = 0
+        self.silence_packets_dropped = 0
+        self.samples_overwritten = 0
+        self.samples_replayed = 0
+        self.silence_samples_skipped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def buffered_ms(self) -> float:
+        return self._count * 1000 / self.sample_rate
+
+    def is_silent(self, samples: np.ndarray) -> bool:
+        """True if the chunk's peak level is below the silence threshold"""
+        return not samples.size or int(np.abs(samples).max()) < self.silence_threshold
+
+    def push(self, mulaw_data) -> bool:
+        """Decode and buffer a μ-law packet; returns False if it was discarded as leading silence"""
+        if not self.enabled:
+            return False
+
+        samples = mulaw_codec.decode_into(mulaw_data, self._decode_buffer)
+        if self.drop_leading_silence and not self._speech_seen:
+            if self.is_silent(samples):
+                self.silence_packets_dropped += 1
+                return False
+            self._speech_seen = True
+
+        # Keep only the newest `capacity` samples of an oversized packet
+        if samples.size > self.capacity:
+            self.samples_overwritten += samples.size - self.capacity
+            samples = samples[-self.capacity:]
+
+        overflow = self._count + samples.size - self.capacity
+        if overflow > 0:
+            self._read = (self._read + overflow) % self.capacity
+            self._count -= overflow
+            self.samples_overwritten += overflow
+
+        write = (self._read + self._count) % self.capacity
+        first = min(samples.size, self.capacity - write)
+        self._ring[write:write + first] = samples[:first]
+        self._ring[:samples.size - first] = samples[first:]
+        self._count += samples.size
+        self.packets_buffered += 1
+        return True
+
+    def pop(self, max_samples: int):
+        """
+        Return up to `max_samples` of the oldest audio as a view into the ring (valid until the
+        next push), or None if the chunk was silence skipped to shorten the replayed backlog.
+        """
+        n = min(max_samples, self._count, self.capacity - self._read)
+        chunk = self._ring[self._read:self._read + n]
+        self._read = (self._read + n) % self.capacity
+        self._count -= n
+
+        if self.drop_leading_silence and self.is_silent(chunk):
+            self.silence_samples_skipped += n
+            return None
+        self.samples_replayed += n
+        return chunk
+
+    def get_stats(self):
+        """Get early-media statistics"""
+        return {
+            "early_media_packets_buffered": self.packets_buffered,
+            "early_media_silence_packets_dropped": self.silence_packets_dropped,
+            "early_media_samples_overwritten": self.samples_overwritten,
+            "early_media_ms_replayed": round(self.samples_replayed * 1000 / self.sample_rate, 1),
+            "early_media_silence_ms_skipped": round(self.silence_samples_skipped * 1000 / self.sample_rate, 1),
+        }
@@ -0,0 +1,82 @@
+"""
+Opt-in high-performance runtime for the telephony bridge.
+With TELEPHONY_FAST_RUNTIME=true the bridge runs on uvloop and parses and
+serialises JSON with orjson. Either library is used only when installed.
+Without them, or with the option off, the stdlib asyncio loop and json
+module are used and output is byte-identical to plain `json.dumps`. orjson
+produces the same JSON values without whitespace. Callers go
+through `json_loads`/`json_dumps` on this module (not imported by name),
+so `enable()` can switch implementations at startup.
+"""
+
+import asyncio
+import json
+import logging
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
+FAST_RUNTIME = os.environ.get("TELEPHONY_FAST_RUNTIME", "false").lower() == "true"
+
+_enabled = False
+
+
+def _orjson_dumps(value) -> str:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+# Both raise a ValueError subclass on malformed input (orjson.JSONDecodeError subclasses json's)
+json_loads = json.loads
+json_dumps = json.dumps
+
+
+def enable(fast: bool = True):
+    """Switch JSON to orjson (when installed) and make `run` use uvloop (when installed)"""
+    global json_loads, json_dumps, _enabled
+    _enabled = fast
+    if fast and orjson is not None:
+        json_loads, json_dumps = orjson.loads, _orjson_dumps
+    else:
+        json_loads, json_dumps = json.loads, json.dumps
+    if fast and (orjson is None or uvloop is None):
+        missing = [name for name, module in (("orjson", orjson), ("uvloop", uvloop)) if module is None]
+        logger.warning(f"⚠️ Fast runtime requested but {', '.join(missing)} not installed; using stdlib fallback")
+    return runtime_info()
+
+
+def run(coro):
+    """`asyncio.run` on uvloop when the fast runtime is enabled and available"""
+    if _enabled and uvloop is not None:
+        if hasattr(asyncio, "Runner"):
+            with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                return runner.run(coro)
+        # Python < 3.11 has no Runner: install uvloop's policy for asyncio.run
+        uvloop.install()
+    return asyncio.run(coro)
+
+
+def runtime_info():
+    """Which event loop and JSON implementation are in use, for logs and /health"""
+    try:
+        loop = type(asyncio.get_running_loop()).__module__.split(".")[0]
+    except RuntimeError:
+        loop = "uvloop" if _enabled and uvloop is not None else "asyncio"
+    return {
+        "fast_runtime": _enabled,
+        "event_loop": loop,
+        "json": "orjson" if json_loads is not json.loads else "json",
+    }
+
+
+if FAST_RUNTIME:
+    enable()
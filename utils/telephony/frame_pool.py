@@ -0,0 +1,76 @@
+"""
+Reusable AudioFrame rings for the telephony bridge.
+Frames and their int16 NumPy views are allocated once per call and packet size
+and handed out round-robin, so the inbound hot path writes decoded audio in place.
+A call usually sees a few sizes (live packets, replayed early-media chunks), so
+each size keeps its own ring instead of reallocating one ring on every switch.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+from livekit import rtc
+
+
+class AudioFramePool:
+    """Preallocated AudioFrames with cached sample views, one fixed-size ring per packet size"""
+
+    def __init__(self, sample_rate: int, samples_per_channel: int, size: int = 4, num_channels: int = 1,
+                 max_rings: int = 4):
+        """max_rings: packet sizes kept at once; the least recently used ring is dropped beyond that"""
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        self.size = size
+        self.max_rings = max_rings
+        # samples_per_channel -> [frames, views, next index], most recently used last
+        self._rings = OrderedDict()
+
+        # Allocation counters
+        self.frames_allocated = 0
+        self.frames_reused = 0
+        self.rings_allocated = 0
+        self.ring_evictions = 0
+
+        self._allocate(samples_per_channel)
+
+    def _allocate(self, samples_per_channel: int):
+        """Build the ring for a new packet size"""
+        frames = [
+            rtc.AudioFrame.create(self.sample_rate, self.num_channels, samples_per_channel)
+            for _ in range(self.size)
+        ]
+        views = [
+            np.frombuffer(frame.data, dtype=np.int16, count=samples_per_channel * self.num_channels)
+            for frame in frames
+        ]
+        ring = self._rings[samples_per_channel] = [frames, views, 0]
+        self.frames_allocated += self.size
+        self.rings_allocated += 1
+        while len(self._rings) > self.max_rings:
+            self._rings.popitem(last=False)
+            self.ring_evictions += 1
+        return ring
+
+    def acquire(self, samples_per_channel: int):
+        """Return the next (frame, view) pair sized for `samples_per_channel`"""
+        ring = self._rings.get(samples_per_channel)
+        if ring is None:
+            ring = self._allocate(samples_per_channel)
+        else:
+            self._rings.move_to_end(samples_per_channel)
+            self.frames_reused += 1
+
+        frames, views, index = ring
+        ring[2] = (index + 1) % self.size
+        return frames[index], views[index]
+
+    def get_stats(self):
+        """Get allocation statistics"""
+        return {
+            "pool_size": self.size,
+            "pool_packet_sizes": list(self._rings),
+            "frames_allocated": self.frames_allocated,
+            "frames_reused": self.frames_reused,
+            "rings_allocated": self.rings_allocated,
+            "ring_evictions": self.ring_evictions,
+        }
@@ -0,0 +1,109 @@
+"""
+Process-wide LiveKit server API client for the telephony bridge.
+One `api.LiveKitAPI` on a keep-alive aiohttp connection pool is shared by every
+call for agent dispatch, room creation and participant listing, instead of a
+new HTTP session (and TLS handshake) or an `lk` CLI process per call.
+"""
+
+import logging
+import time
+from contextlib import asynccontextmanager
+
+import aiohttp
+from livekit import api
+
+logger = logging.getLogger(__name__)
+
+
+class LiveKitService:
+    """Shared LiveKit API client with per-operation latency tracking"""
+
+    def __init__(self, url: str, api_key: str, api_secret: str,
+                 pool_size: int = 100, keepalive_timeout: float = 60.0, request_timeout: float = 10.0):
+        self.url = url
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+        self._session = None
+        self._lkapi = None
+        self.timings = {}
+
+    @property
+    def lkapi(self) -> api.LiveKitAPI:
+        """Lazily create the client (needs a running event loop)"""
+        if self._lkapi is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            )
+            self._lkapi = api.LiveKitAPI(self.url, self.api_key, self.api_secret, session=self._session)
+            logger.info(f"🔌 LiveKit API client pool created (limit={self.pool_size})")
+        return self._lkapi
+
+    @asynccontextmanager
+    async def timed(self, operation: str):
+        """Record the latency of an operation under `operation`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            entry = self.timings.setdefault(operation, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["last_ms"] = elapsed_ms
+
+    async def create_room(self, room_name: str, **kwargs):
+        async with self.timed("create_room"):
+            return await self.lkapi.room.create_room(api.CreateRoomRequest(name=room_name, **kwargs))
+
+    async def delete_room(self, room_name: str):
+        async with self.timed("delete_room"):
+            return await self.lkapi.room.delete_room(api.DeleteRoomRequest(room=room_name))
+
+    async def list_participants(self, room_name: str):
+        async with self.timed("list_participants"):
+            response = await self.lkapi.room.list_participants(api.ListParticipantsRequest(room=room_name))
+            return response.participants
+
+    async def dispatch_agent(self, room_name: str, agent_name: str, metadata: str = ""):
+        async with self.timed("dispatch_agent"):
+            return await self.lkapi.agent_dispatch.create_dispatch(
+                api.CreateAgentDispatchRequest(agent_name=agent_name, room=room_name, metadata=metadata)
+            )
+
+    def create_token(self, identity: str, name: str, room_name: str) -> str:
+        """Mint a room-join token for a participant"""
+        return (api.AccessToken(self.api_key, self.api_secret)
+                .with_identity(identity)
+                .with_name(name)
+                .with_grants(api.VideoGrants(room_join=True, room=room_name))
+                .to_jwt())
+
+    def get_stats(self):
+        """Get per-operation latency statistics"""
+        return {
+            operation: {
+                "count": entry["count"],
+                "avg_ms": round(entry["total_ms"] / entry["count"], 1),
+                "max_ms": round(entry["max_ms"], 1),
+                "last_ms": round(entry["last_ms"], 1),
+            }
+            for operation, entry in self.timings.items()
+        }
+
+    async def aclose(self):
+        """Close the shared client and its connection pool"""
+        if self._lkapi is not None:
+            await self._lkapi.aclose()
+            await self._session.close()
+            self._lkapi = None
+            self._session = None
@@ -0,0 +1,143 @@
+"""
+Event-loop lag monitor and load-shedding gate for the telephony bridge.
+Samples how late the event loop wakes a timer (scheduling lag) and collects
+per-packet processing times from the calls. Above the configured thresholds
+the bridge stops accepting new calls, and it resumes only after lag has stayed
+below the recovery threshold for a hold period (hysteresis), so one overloaded
+process degrades by rejecting new calls instead of every call jittering together.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class LoadMonitor:
+    """Tracks event-loop lag and per-packet processing time, and decides whether to accept calls"""
+
+    def __init__(self, lag_threshold_ms: float = 150.0, recover_lag_ms: float = 50.0,
+                 processing_threshold_ms: float = 10.0, max_calls: int = 0,
+                 recover_hold_s: float = 5.0, interval_ms: float = 100.0, window_s: float = 2.0):
+        """
+        lag_threshold_ms: worst lag in the window above which new calls are shed
+        recover_lag_ms: worst lag in the window that must hold for `recover_hold_s` before accepting again
+        processing_threshold_ms: p95 per-packet processing time above which new calls are shed
+                                 (a 20 ms packet must be handled well within its own duration)
+        max_calls: hard cap on concurrent calls (0 = no cap)
+        """
+        self.lag_threshold_ms = lag_threshold_ms
+        self.recover_lag_ms = recover_lag_ms
+        self.processing_threshold_ms = processing_threshold_ms
+        self.max_calls = max_calls
+        self.recover_hold_s = recover_hold_s
+        self.interval = interval_ms / 1000
+
+        samples = max(1, int(window_s / self.interval))
+        self._lags = deque(maxlen=samples)
+        self._processing = deque(maxlen=500)
+        self._calm_since = None
+        self.overloaded = False
+        self.overloaded_since = None
+
+        # Statistics
+        self.lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.processing_p95_ms = 0.0
+        self.shed_count = 0
+        self.overload_episodes = 0
+
+    def record_processing(self, elapsed_ms: float):
+        """Record how long one packet/frame took to process"""
+        self._processing.append(elapsed_ms)
+
+    def accepting(self, active_calls: int = 0) -> bool:
+        """Whether a new call may be admitted right now"""
+        if self.max_calls and active_calls >= self.max_calls:
+            return False
+        return not self.overloaded
+
+    def shed(self, what: str):
+        """Count (and log) a rejected call"""
+        self.shed_count += 1
+        logger.warning(f"🚦 Shedding {what}: lag {self.lag_ms:.0f}ms, "
+                       f"processing p95 {self.processing_p95_ms:.1f}ms")
+
+    def _update_state(self):
+        now = time.monotonic()
+        window_lag = max(self._lags) if self._lags else 0.0
+        self.processing_p95_ms = _percentile(self._processing, 95)
+        hot = window_lag > self.lag_threshold_ms or self.processing_p95_ms > self.processing_threshold_ms
+
+        if not self.overloaded:
+            if hot:
+                self.overloaded = True
+                self.overloaded_since = now
+                self.overload_episodes += 1
+                self._calm_since = None
+                logger.warning(f"🔥 Bridge overloaded (lag {window_lag:.0f}ms, processing p95 "
+                               f"{self.processing_p95_ms:.1f}ms) - rejecting new calls")
+            return
+
+        calm = window_lag < self.recover_lag_ms and self.processing_p95_ms < self.processing_threshold_ms / 2
+        if not calm:
+            self._calm_since = None
+        elif self._calm_since is None:
+            self._calm_since = now
+        elif now - self._calm_since >= self.recover_hold_s:
+            logger.info(f"✅ Bridge load recovered after {now - self.overloaded_since:.1f}s - accepting calls")
+            self.overloaded = False
+            self.overloaded_since = None
+            self._calm_since = None
+
+    async def run(self):
+        """Sample event-loop lag every `interval` and update the shedding state"""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag_ms = max(0.0, loop.time() - expected) * 1000
+            self.max_lag_ms = max(self.max_lag_ms, self.lag_ms)
+            self._lags.append(self.lag_ms)
+            self._update_state()
+
+    def capacity(self, active_calls: int = 0):
+        """Current load and headroom, for /health and load balancers"""
+        load = max(
+            (max(self._lags) if self._lags else 0.0) / self.lag_threshold_ms,
+            self.processing_p95_ms / self.processing_threshold_ms,
+            active_calls / self.max_calls if self.max_calls else 0.0,
+        )
+        if self.max_calls:
+            available = max(0, self.max_calls - active_calls)
+        elif load > 0 and active_calls:
+            # Calls scale roughly linearly with load until the first threshold is reached
+            available = max(0, int(active_calls / load) - active_calls)
+        else:
+            available = None
+        if not self.accepting(active_calls):
+            available = 0
+
+        return {
+            "accepting": self.accepting(active_calls),
+            "active_calls": active_calls,
+            "max_calls": self.max_calls or None,
+            "estimated_available_calls": available,
+            "load_factor": round(load, 3),
+            "loop_lag_ms": round(self.lag_ms, 1),
+            "loop_lag_window_max_ms": round(max(self._lags) if self._lags else 0.0, 1),
+            "loop_lag_max_ms": round(self.max_lag_ms, 1),
+            "processing_p95_ms": round(self.processing_p95_ms, 2),
+            "overloaded_for_s": round(time.monotonic() - self.overloaded_since, 1) if self.overloaded_since else 0.0,
+            "overload_episodes": self.overload_episodes,
+            "shed_count": self.shed_count,
+        }
@@ -0,0 +1,187 @@
+"""
+Outbound packetizer for agent audio sent to Plivo.
+Coalesces μ-law audio into fixed-size chunks and sends them on a clock paced
+to the caller's playout time, using a pre-rendered playAudio JSON envelope.
+"""
+
+import asyncio
+import binascii
+import json
+import logging
+import time
+
+from .backpressure import BridgeQueue, DROP_OLDEST
+
+logger = logging.getLogger(__name__)
+
+
+class PlayAudioEnvelope:
+    """Pre-rendered Plivo playAudio message; only the base64 payload is spliced in per send"""
+
+    def __init__(self, sample_rate: int, content_type: str = "audio/x-mulaw"):
+        marker = "__PAYLOAD__"
+        template = json.dumps({
+            "event": "playAudio",
+            "media": {
+                "contentType": content_type,
+                "sampleRate": sample_rate,
+                "payload": marker,
+            }
+        })
+        self.prefix, self.suffix = template.split(marker)
+
+    def render(self, audio_data) -> str:
+        """Build the playAudio message for a μ-law chunk"""
+        return self.prefix + binascii.b2a_base64(audio_data, newline=False).decode("ascii") + self.suffix
+
+
+class OutboundPacketizer:
+    """Coalesces agent audio into fixed-duration chunks and paces them to playout time"""
+
+    def __init__(self, send, sample_rate: int = 8000, chunk_ms: int = 20, max_lead_ms: int = 60,
+                 max_queue_ms: int = 2000, audio_policy: str = DROP_OLDEST, idle_fill=None, on_sent=None):
+        """
+        send: coroutine taking a μ-law chunk and returning True if it was delivered
+        chunk_ms: duration of each outbound chunk (e.g. 20/40/100 ms)
+        max_lead_ms: how far ahead of the caller's playout position we may send
+        max_queue_ms: agent audio held while the socket is slow before `audio_policy` sheds it
+        idle_fill: optional callable taking a byte count and returning μ-law audio (e.g. comfort
+                   noise) sent while there is no agent audio, so the caller never hears dead air
+        on_sent: optional callback taking the seconds an agent chunk spent between chunking and
+                 delivery, called after each successful send (not for idle fill)
+        """
+        self._send = send
+        self._on_sent = on_sent
+        self._idle_fill = idle_fill
+        self.sample_rate = sample_rate
+        self.chunk_ms = chunk_ms
+        self.chunk_bytes = sample_rate * chunk_ms // 1000  # 1 byte per μ-law sample
+        self.chunk_duration = chunk_ms / 1000.0
+        self.max_lead = max_lead_ms / 1000.0
+
+        self._pending = bytearray()
+        self._queue = BridgeQueue("outbound", max_queue_ms // chunk_ms, audio_policy)
+        self._wakeup = asyncio.Event()
+        self._last_push_time = 0.0
+        self._closed = False
+
+        # Monotonic time at which the caller finishes playing everything sent so far,
+        # and the part of that which is agent audio (idle fill excluded)
+        self.playout_end = 0.0
+        self.agent_playout_end = 0.0
+
+        # Statistics
+        self.chunks_sent = 0
+        self.bytes_sent = 0
+        self.send_failures = 0
+        self.idle_chunks_sent = 0
+
+    @property
+    def queue(self) -> BridgeQueue:
+        """The bounded chunk queue between the agent audio reader and the send loop"""
+        return self._queue
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of full chunks waiting to be sent"""
+        return len(self._queue)
+
+    @property
+    def buffered_playout(self) -> float:
+        """Seconds of already-sent audio the caller has not heard yet"""
+        return max(0.0, self.playout_end - time.monotonic())
+
+    @property
+    def agent_buffered_playout(self) -> float:
+        """Seconds of already-sent agent audio the caller has not heard yet (idle fill not counted)"""
+        return max(0.0, self.agent_playout_end - time.monotonic())
+
+    def push(self, mulaw_data):
+        """Append encoded agent audio; full chunks are queued for sending"""
+        # memoryview keeps `+=` a byte append for numpy buffers (ndarray would broadcast instead)
+        self._pending += memoryview(mulaw_data)
+        self._last_push_time = time.monotonic()
+
+        while len(self._pending) >= self.chunk_bytes:
+            self._queue.put_audio(bytes(self._pending[:self.chunk_bytes]))
+            del self._pending[:self.chunk_bytes]
+
+        self._wakeup.set()
+
+    def flush(self):
+        """Queue any partial chunk (end of agent speech)"""
+        if self._pending:
+            self._queue.put_audio(bytes(self._pending))
+            self._pending.clear()
+            self._wakeup.set()
+
+    def clear(self) -> int:
+        """Drop all queued and pending audio, returning the number of bytes discarded"""
+        dropped = sum(len(chunk) for chunk in self._queue.clear_audio()) + len(self._pending)
+        self._pending.clear()
+        return dropped
+
+    def reset_playout(self) -> float:
+        """Forget the caller-side playout clock (after clearAudio), returning the seconds of agent audio dropped"""
+        buffered = self.agent_buffered_playout
+        self.playout_end = 0.0
+        self.agent_playout_end = 0.0
+        return buffered
+
+    def close(self):
+        """Stop the send loop after the current iteration"""
+        self._closed = True
+        self._wakeup.set()
+
+    async def run(self):
+        """Send queued chunks, never running more than `max_lead` ahead of playout"""
+        while not self._closed:
+            if not self._queue:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.chunk_duration)
+                except asyncio.TimeoutError:
+                    # No new audio for a chunk's duration: the tail of an utterance
+                    if self._pending and time.monotonic() - self._last_push_time >= self.chunk_duration:
+                        self.flush()
+                if self._idle_fill and not self._pending:
+                    await self._send_idle_fill()
+                continue
+
+            now = time.monotonic()
+            lead = self.playout_end - now
+            if lead > self.max_lead:
+                await asyncio.sleep(lead - self.max_lead)
+                continue
+
+            _, chunk = self._queue.pop()
+            if await self._send(chunk):
+                self.playout_end = max(self.playout_end, now) + len(chunk) / self.sample_rate
+                self.agent_playout_end = self.playout_end
+                self.chunks_sent += 1
+                self.bytes_sent += len(chunk)
+                if self._on_sent:
+                    self._on_sent(self._queue.last_dwell + time.monotonic() - now)
+            else:
+                self.send_failures += 1
+
+    async def _send_idle_fill(self):
+        """Top the caller's playout back up to `max_lead` with filler while no agent audio is queued"""
+        while not self._queue and not self._closed and self.buffered_playout < self.max_lead - self.chunk_duration:
+            if not await self._send(self._idle_fill(self.chunk_bytes)):
+                self.send_failures += 1
+                return
+            self.playout_end = max(self.playout_end, time.monotonic()) + self.chunk_duration
+            self.idle_chunks_sent += 1
+
+    def get_stats(self):
+        """Get packetizer statistics"""
+        return {
+            "outbound_chunk_ms": self.chunk_ms,
+            **self._queue.get_stats(),
+            "outbound_chunks_sent": self.chunks_sent,
+            "outbound_bytes_sent": self.bytes_sent,
+            "outbound_send_failures": self.send_failures,
+            "outbound_idle_chunks_sent": self.idle_chunks_sent,
+            "outbound_buffered_playout_ms": round(self.buffered_playout * 1000, 1),
+        }
@@ -0,0 +1,119 @@
+"""
+Provider wire protocols for the telephony bridge.
+An adapter turns each inbound websocket message into an (AUDIO, μ-law bytes)
+or (CONTROL, event dict) item for the bridge's inbound queue and renders
+outbound audio and playback-clear messages. Every provider feeds the same
+decode/resample/capture pipeline. Plivo wraps each 20 ms packet in
+base64-encoded JSON. Raw-binary providers send the μ-law bytes as the frame
+itself, so their audio skips parsing entirely.
+"""
+
+import binascii
+from abc import ABC, abstractmethod
+
+from . import fast_runtime
+from .backpressure import AUDIO, CONTROL
+from .packetizer import PlayAudioEnvelope
+
+
+class ProviderProtocol(ABC):
+    """Base adapter between a provider's websocket messages and the bridge"""
+
+    name = None
+    # Whether outbound audio can only be sent once the start event has named the stream
+    requires_stream_id = False
+
+    @abstractmethod
+    def parse(self, message):
+        """
+        Return (AUDIO, μ-law bytes), (CONTROL, event dict), or None for a message carrying nothing.
+        Raises ValueError for malformed messages.
+        """
+
+    @abstractmethod
+    def render_audio(self, audio_data, stream_id=None):
+        """Outbound message carrying a μ-law chunk"""
+
+    def render_clear(self, stream_id=None):
+        """Outbound message that flushes the provider's playback buffer, or None if unsupported"""
+        return None
+
+    def _parse_control(self, message):
+        event = fast_runtime.json_loads(message)
+        if not isinstance(event, dict):
+            raise ValueError(f"expected a JSON object, got {type(event).__name__}")
+        return CONTROL, event
+
+
+class PlivoJsonProtocol(ProviderProtocol):
+    """Plivo audio streams: JSON events with base64 μ-law `media` payloads"""
+
+    name = "plivo"
+    requires_stream_id = True
+
+    def __init__(self, sample_rate: int = 8000):
+        self.play_audio_envelope = PlayAudioEnvelope(sample_rate)
+
+    def parse(self, message):
+        if not isinstance(message, str):
+            # Binary frames are raw μ-law audio
+            return AUDIO, message
+        kind, event = self._parse_control(message)
+        if event.get("event") != "media":
+            return kind, event
+        media = event.get("media", {})
+        if not isinstance(media, dict):
+            raise ValueError(f"media event without a media object (got {type(media).__name__})")
+        payload = media.get("payload")
+        if not payload:
+            return None
+        if not isinstance(payload, str):
+            raise ValueError(f"media payload must be a base64 string, got {type(payload).__name__}")
+        # binascii accepts the str payload directly, skipping b64decode's ASCII re-encode copy
+        return AUDIO, binascii.a2b_base64(payload)
+
+    def render_audio(self, audio_data, stream_id=None):
+        # Splice base64 payload into the pre-rendered playAudio envelope
+        return self.play_audio_envelope.render(audio_data)
+
+    def render_clear(self, stream_id=None):
+        return fast_runtime.json_dumps({"event": "clearAudio", "streamId": stream_id})
+
+
+class RawBinaryProtocol(ProviderProtocol):
+    """
+    Raw audio gateways (custom SIP gateways, Twilio-style media bridges): binary frames
+    are 8 kHz μ-law audio in both directions; text frames are optional JSON control
+    events using the Plivo schema (`start`, `stop`, ...).
+    """
+
+    name = "binary"
+
+    def __init__(self, sample_rate: int = 8000):
+        self.sample_rate = sample_rate
+
+    def parse(self, message):
+        if isinstance(message, str):
+            return self._parse_control(message)
+        return AUDIO, message
+
+    def render_audio(self, audio_data, stream_id=None):
+        return audio_data
+
+    def render_clear(self, stream_id=None):
+        return fast_runtime.json_dumps({"event": "clearAudio", "streamId": stream_id})
+
+
+PROVIDER_PROTOCOLS = {
+    PlivoJsonProtocol.name: PlivoJsonProtocol,
+    RawBinaryProtocol.name: RawBinaryProtocol,
+}
+
+
+def get_provider_protocol(name: str, sample_rate: int = 8000) -> ProviderProtocol:
+    """Instantiate the adapter registered under `name`"""
+    try:
+        protocol_class = PROVIDER_PROTOCOLS[name]
+    except KeyError:
+        raise ValueError(f"Unknown provider protocol {name!r}; expected one of {sorted(PROVIDER_PROTOCOLS)}")
+    return protocol_class(sample_rate)
@@ -0,0 +1,177 @@
+"""
+Pre-warmed LiveKit room pool for the telephony bridge.
+Keeps a small, auto-sized set of rooms whose telephony participant is already
+connected with its audio track published, so a new call can attach to one
+instead of paying room creation, connect and publish on the call's critical path.
+"""
+
+import asyncio
+import logging
+import math
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmRoom:
+    """A connected room with a published telephony track, waiting for a call"""
+    room_name: str
+    room: Any
+    audio_source: Any
+    audio_track: Any
+    publication: Any
+    agent_dispatched: bool = False
+    warmup_ms: float = 0.0
+    created_at: float = field(default_factory=time.monotonic)
+    reserved_at: Optional[float] = None
+
+    def is_usable(self) -> bool:
+        return self.room is not None and self.room.isconnected()
+
+
+class RoomPool:
+    """Auto-sized pool of WarmRooms with background refill and idle expiry"""
+
+    def __init__(self, create_entry, discard_entry, min_size: int = 1, max_size: int = 4,
+                 max_idle_s: float = 300.0, reserve_timeout_s: float = 30.0,
+                 name_prefix: str = "plivo-room-", refill_interval_s: float = 1.0):
+        """
+        create_entry: coroutine taking a room name and returning a WarmRoom
+        discard_entry: coroutine taking a WarmRoom and tearing it down
+        """
+        self._create_entry = create_entry
+        self._discard_entry = discard_entry
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle_s = max_idle_s
+        self.reserve_timeout_s = reserve_timeout_s
+        self.name_prefix = name_prefix
+        self.refill_interval_s = refill_interval_s
+
+        self._available = OrderedDict()
+        self._reserved = {}
+        self._warming = 0
+        self._arrivals = deque()
+        self._warmup_times = deque(maxlen=20)
+        self._closed = False
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.failed_warmups = 0
+
+    @property
+    def available(self) -> int:
+        return len(self._available)
+
+    def target_size(self) -> int:
+        """Rooms to keep warm: enough to cover arrivals during one warm-up, within [min, max]"""
+        now = time.monotonic()
+        while self._arrivals and now - self._arrivals[0] > 60.0:
+            self._arrivals.popleft()
+        arrival_rate = len(self._arrivals) / 60.0
+        avg_warmup_s = (sum(self._warmup_times) / len(self._warmup_times) / 1000) if self._warmup_times else 1.0
+        wanted = math.ceil(arrival_rate * avg_warmup_s * 2) + self.min_size
+        return max(self.min_size, min(self.max_size, wanted))
+
+    def reserve(self) -> Optional[str]:
+        """Reserve the oldest warm room for an upcoming call and return its name (e.g. for the Plivo XML)"""
+        self._arrivals.append(time.monotonic())
+        while self._available:
+            room_name, entry = self._available.popitem(last=False)
+            if entry.is_usable():
+                entry.reserved_at = time.monotonic()
+                self._reserved[room_name] = entry
+                return room_name
+            asyncio.create_task(self._discard(entry))
+        self.misses += 1
+        return None
+
+    def claim(self, room_name: str) -> Optional[WarmRoom]:
+        """Hand over the warm room for `room_name` if it is reserved or available"""
+        entry = self._reserved.pop(room_name, None) or self._available.pop(room_name, None)
+        if entry is None:
+            return None
+        if not entry.is_usable():
+            asyncio.create_task(self._discard(entry))
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    async def _warm_one(self):
+        room_name = f"{self.name_prefix}{uuid.uuid4()}"
+        self._warming += 1
+        start = time.perf_counter()
+        try:
+            entry = await self._create_entry(room_name)
+            entry.warmup_ms = (time.perf_counter() - start) * 1000
+            self._warmup_times.append(entry.warmup_ms)
+            if self._closed:
+                await self._discard(entry)
+            else:
+                self._available[room_name] = entry
+                logger.info(f"🔥 Warm room ready: {room_name} ({entry.warmup_ms:.0f}ms)")
+        except Exception as e:
+            self.failed_warmups += 1
+            logger.error(f"❌ Failed to warm room {room_name}: {e}")
+        finally:
+            self._warming -= 1
+
+    async def _discard(self, entry: WarmRoom):
+        try:
+            await self._discard_entry(entry)
+        except Exception as e:
+            logger.warning(f"⚠️ Error discarding warm room {entry.room_name}: {e}")
+
+    def _expire(self):
+        """Drop idle rooms and reservations that were never claimed"""
+        now = time.monotonic()
+        for room_name, entry in list(self._available.items()):
+            if now - entry.created_at > self.max_idle_s or not entry.is_usable():
+                del self._available[room_name]
+                self.expired += 1
+                asyncio.create_task(self._discard(entry))
+        for room_name, entry in list(self._reserved.items()):
+            if now - entry.reserved_at > self.reserve_timeout_s:
+                del self._reserved[room_name]
+                self.expired += 1
+                asyncio.create_task(self._discard(entry))
+
+    async def run(self):
+        """Background loop: expire idle entries and refill to the target size"""
+        logger.info(f"🔥 Room pool started (min={self.min_size}, max={self.max_size})")
+        while not self._closed:
+            self._expire()
+            deficit = self.target_size() - len(self._available) - self._warming
+            for _ in range(max(0, deficit)):
+                asyncio.create_task(self._warm_one())
+            await asyncio.sleep(self.refill_interval_s)
+
+    async def aclose(self):
+        """Stop refilling and tear down every unclaimed room"""
+        self._closed = True
+        entries = list(self._available.values()) + list(self._reserved.values())
+        self._available.clear()
+        self._reserved.clear()
+        await asyncio.gather(*(self._discard(entry) for entry in entries), return_exceptions=True)
+
+    def get_stats(self):
+        """Get pool statistics"""
+        return {
+            "available": len(self._available),
+            "reserved": len(self._reserved),
+            "warming": self._warming,
+            "target_size": self.target_size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "failed_warmups": self.failed_warmups,
+            "avg_warmup_ms": round(sum(self._warmup_times) / len(self._warmup_times), 1) if self._warmup_times else None,
+        }